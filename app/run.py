@@ -35,13 +35,12 @@ def run(trace: dict, app_dict: dict | UltraDict, app_dict_n_shared: dict) -> dic
     ProgressTrackerTk.run(trace, app_dict)
 
     # --- DEMO ---
-    # Multiprocessing with task shelving. Lots of tiny tasks.
+    # Multiprocessing with task shelving. Lots of tiny tasks, enqueued in one batch.
     # Configure processes in config.py
     from demo import tiny_benchmark as bench
     task: list = [bench.run, trace, app_dict, {"stages": 2, "total_rep": 10**2}]
 
-    for _ in range(0, 250):
-        morPy.process_q(trace, app_dict, task)
+    morPy.process_q_many(trace, app_dict, [task for _ in range(0, 250)])
 
     return{
         'app_dict_n_shared' : app_dict_n_shared
@@ -56,6 +56,18 @@ def settings():
     # Called by: msg.log(~)
     log_db_enable: bool = True
 
+    # Number of log rows buffered at most, before they are inserted into the logging database in a
+    # single transaction. Rows left are inserted on exit. Set to 1 to insert every log right away.
+    # Called by: msg.log_db_sink(~)
+    # Default: 256
+    log_db_batch_rows: int = 256
+
+    # Time in seconds a log row is buffered at most, before it is inserted into the logging database.
+    # Logs raising an interrupt (see log_lvl_interrupts) are inserted right away.
+    # Called by: msg.log_db_sink(~)
+    # Default: 1.0
+    log_db_batch_interval: float = 1.0
+
     # Enable logging to a textfile.
     # Called by: msg.log(~)
     log_txt_enable: bool = False
@@ -100,6 +112,19 @@ def settings():
     # Default: ["denied","error","critical"]
     log_lvl_interrupts: list = ["denied","error","critical"]
 
+    # Number of slots of the lock-free ring buffer carrying logs from child processes to the log
+    # writer of the orchestrator. If the ring buffer is full, logs are written by the orchestrator
+    # itself instead. Only used in multiprocessing mode.
+    # Called by: mp.log_ring_init(~)
+    # Default: 1024
+    log_ring_slots: int = 1024
+
+    # Size of a single slot of the log ring buffer in bytes. Logs exceeding this size once serialized
+    # are written by the orchestrator itself instead.
+    # Called by: mp.log_ring_init(~)
+    # Default: 4096
+    log_ring_slot_size: int = 4096
+
     r"""
 >>> METRICS <<<
     """
@@ -112,6 +137,11 @@ def settings():
     # Data collected: function name, trace, runtime
     metrics_perf_mode: bool = False
 
+    # Maximum amount of counters the app may register with morPy.counter_register(). Counters are
+    # shared by all processes and updated without a lock (see lib.counters).
+    # Default: 64
+    counters_max: int = 64
+
     r"""
 >>> MEMORY <<<
     These settings only take effect in a multiprocessing context. With these settings
@@ -175,6 +205,246 @@ def settings():
     # a process was terminated unexpectedly. Logs will still be written. Default is "True".
     processes_are_critical: bool | None = False
 
+    # Backend running parallel tasks. Allowed are "process" and "thread". With "process", tasks are
+    # run in child processes sharing app_dict in shared memory. With "thread", tasks are run by a pool
+    # of threads within a single process, sharing a plain nested app_dict without any serialization.
+    # The thread count is determined like the process count. Threads are an option for I/O-bound tasks
+    # and for free-threaded builds of Python (3.13+), where they run truly in parallel.
+    # Default: "process"
+    processes_backend: str = "process"
+
+    # Start method of child processes. Allowed are "spawn", "fork" and "forkserver". With "fork" and
+    # "forkserver" (POSIX only), a child process starts without importing morPy and the app again,
+    # which saves a lot of time per process. If None, the default of the platform is used ("fork" on
+    # Linux, "spawn" on Windows and macOS).
+    # Default: None
+    processes_start_method: str | None = None
+
+    # If processes_start_method is "forkserver", modules to be preloaded by the fork server, so that
+    # child processes do not import them again. The morPy core is always preloaded.
+    # Default: ["app.init", "app.run", "app.exit"]
+    processes_forkserver_preload: list = ["app.init", "app.run", "app.exit"]
+
+    # Keep child processes alive as a pool of persistent workers. Instead of terminating once
+    # all processes are joined, workers keep pulling tasks until the app exits. This omits the
+    # cost of spawning a process and re-importing morPy for every task.
+    # Default: False
+    processes_pool: bool = False
+
+    # In pool mode, spawn all workers right after the orchestrator started instead of
+    # spawning them on demand.
+    # Default: True
+    processes_pool_prespawn: bool = True
+
+    # In pool mode, recycle a worker after it executed this amount of tasks. If None,
+    # workers are not recycled by task count.
+    # Default: None
+    processes_pool_max_tasks: int | None = None
+
+    # In pool mode, recycle a worker once its resident memory (RSS) exceeds this amount
+    # in MB. If None, workers are not recycled by memory usage.
+    # Default: None
+    processes_pool_max_rss_mb: int | None = None
+
+    # In pool mode, modules to be imported once when a worker starts, so that tasks do
+    # not pay for the import (i.e. ["app.run", "demo.tiny_benchmark"]).
+    # Default: []
+    processes_pool_warm_imports: list = []
+
+    # Idle processes block until they are notified of a new task, a join or an exit. As a
+    # fallback, they re-check the shared state after this amount of seconds anyway.
+    # Default: 1.0
+    processes_wakeup_timeout: float = 1.0
+
+    # If all child processes are busy, the orchestrator queues up to this amount of tasks to every
+    # busy process instead of holding them back. A process running out of tasks takes them from the
+    # queue of the busiest sibling (work-stealing), without a round-trip through the orchestrator.
+    # If 0, tasks are only handed to idle processes.
+    # Default: 4
+    processes_deque_max: int = 4
+
+    # Coalesce tiny tasks. Tasks of the same function and priority, which are queued one after another,
+    # are grouped into a chunk run by a single process, so the overhead of dispatching a task is paid
+    # once per chunk. The chunk size adapts to the average duration measured per function. An exception
+    # raised by a task of a chunk is logged, the other tasks of the chunk are run anyway.
+    # Default: False
+    processes_coalesce: bool = False
+
+    # Targeted duration of a chunk of coalesced tasks in seconds.
+    # Default: 0.05
+    processes_coalesce_target: float = 0.05
+
+    # Maximum amount of tasks in a chunk of coalesced tasks.
+    # Default: 64
+    processes_coalesce_max: int = 64
+
+    # Priority classes of the orchestrator. A task belongs to the first class, whose "max_priority" is
+    # equal to or greater than its priority. The classes share the dispatches in proportion to their
+    # "weight" (weighted fair queuing), so tasks of a class are never starved by another one. The last
+    # class catches all remaining priorities ("max_priority": None).
+    # Default: {"core": {"max_priority": -1, "weight": 16}, "high": {"max_priority": 49, "weight": 4},
+    #           "normal": {"max_priority": 149, "weight": 2}, "low": {"max_priority": None, "weight": 1}}
+    processes_sched_classes: dict = {
+        "core": {"max_priority": -1, "weight": 16},
+        "high": {"max_priority": 49, "weight": 4},
+        "normal": {"max_priority": 149, "weight": 2},
+        "low": {"max_priority": None, "weight": 1},
+    }
+
+    # Priority steps a queued task gains per second it waits (aging). Within a priority class, a task of
+    # priority 100 is dispatched ahead of fresh tasks of priority 10 after waiting 90 seconds. If 0,
+    # tasks do not age.
+    # Default: 1.0
+    processes_sched_aging: float = 1.0
+
+    # Weights of the priority classes per app phase ("init", "run" or "exit"), overriding the weights of
+    # processes_sched_classes, i.e. {"init": {"low": 0.1}} to hold back tasks of low priority while the
+    # app initializes.
+    # Default: {}
+    processes_sched_phase_weights: dict = {}
+
+    # High-water mark of the process queue (backpressure). A child process enqueueing tasks with
+    # process_q() or process_q_many() is held back, while this amount of tasks waits for a process.
+    # Meanwhile, it runs queued tasks itself. Tasks of the morPy core are never held back. If None,
+    # the process queue is unbounded.
+    # Default: None
+    processes_queue_max: int | None = None
+
+    # Seconds to wait at most for the process queue to drop below processes_queue_max. Then,
+    # queue.Full is raised. If 0, queue.Full is raised right away. If None, the process waits
+    # until the tasks were taken on.
+    # Default: None
+    processes_queue_timeout: float | None = None
+
+    # Autoscaling. The orchestrator adjusts the number of processes run at once between
+    # processes_autoscale_min and the maximum processes determined at startup (see processes_absolute
+    # and processes_relative). It scales up, while tasks queue up and would take longer than an
+    # interval to be worked off, and scales down, while processes are idle. In pool mode, idle workers
+    # are retired. If system memory runs low, it backs off by one process per interval.
+    # Default: False
+    processes_autoscale: bool = False
+
+    # Minimum processes run at once when autoscaling, including the app process. At least 2, so that a
+    # worker runs the tasks the app process waits on.
+    # Default: 2
+    processes_autoscale_min: int = 2
+
+    # Seconds between two decisions of the autoscaler.
+    # Default: 1.0
+    processes_autoscale_interval: float = 1.0
+
+    # Seconds processes have to be idle before the autoscaler scales down.
+    # Default: 5.0
+    processes_autoscale_idle: float = 5.0
+
+    # System-wide CPU utilization in percent, above which the autoscaler does not scale up.
+    # Default: 90.0
+    processes_autoscale_cpu_max: float = 90.0
+
+    # System memory used in percent, above which the autoscaler scales down.
+    # Default: 90.0
+    processes_autoscale_mem_max: float = 90.0
+
+    # Number of slots of the lock-free ring buffer carrying tasks from child processes to the
+    # orchestrator. If the ring buffer is full, tasks are put on the heap shelf instead.
+    # Default: 1024
+    processes_ring_slots: int = 1024
+
+    # Size of a single slot of the ring buffer in bytes. Tasks exceeding this size once serialized
+    # are put on the heap shelf instead.
+    # Default: 4096
+    processes_ring_slot_size: int = 4096
+
+    # Number of slots of the result inbox of every child process (ring buffer), receiving the results
+    # of morPy.pmap() and morPy.imap_unordered(). Senders wait, while an inbox is full.
+    # Default: 256
+    processes_inbox_slots: int = 256
+
+    # Size of a single slot of a result inbox in bytes. Larger results are split into fragments.
+    # Default: 4096
+    processes_inbox_slot_size: int = 4096
+
+    # Maximum amount of async tasks (functions defined with 'async def') run at once by the event loop
+    # of a single process. A process takes on further tasks while its async tasks await, until this
+    # amount is reached.
+    # Default: 100
+    processes_async_max: int = 100
+
+    # Buffers handed to child processes as task arguments (bytes, bytearray, memoryview, array.array
+    # and numpy arrays), which are at least this size in bytes, are moved to shared memory instead of
+    # being pickled. The child process receives a read-only view of the same memory (bytes-like
+    # buffers as memoryview). If None, arguments are always pickled.
+    # Default: 1048576 (1 MB)
+    processes_zero_copy_min: int | None = 1024 * 1024
+
+    # CPU affinity of child processes. Every process ID is pinned to CPUs by a placement policy:
+    #   "compact"   - One logical CPU per process, filling up the NUMA nodes one after another.
+    #   "scatter"   - One logical CPU per process, spread round-robin over the NUMA nodes.
+    #   "numa"      - All CPUs of a NUMA node per process, spread round-robin over the nodes.
+    # The result inbox of a process is allocated on its NUMA node. NUMA nodes are detected on Linux,
+    # otherwise all CPUs count as a single node. Not supported on macOS. If None, processes are not
+    # pinned and the operating system places them.
+    # Default: None
+    processes_affinity: str | None = None
+
+    # Number of shards of a sharded store shared by processes (see lib.store and morPy.shared_store()).
+    # Every shard has a lock of its own, so processes working on keys of different shards do not wait
+    # for each other. app_dict["morpy"]["tasks_cancelled"] is sharded as well.
+    # Default: 16
+    processes_store_shards: int = 16
+
+    # Timeout in seconds for a single task run by a child process. A process exceeding it is
+    # terminated by the orchestrator and the task is retried (see processes_task_retries). Only
+    # synchronous tasks are covered, async tasks are not timed once scheduled. May be overridden
+    # per task by process_q(). If None, tasks are not timed.
+    # Default: None
+    processes_task_timeout: float | None = None
+
+    # Retries of a task, which timed out or whose process terminated unexpectedly. A task retried is
+    # queued again with the same task ID. May be overridden per task by process_q(). Exceptions raised
+    # by a task are not retried. Arguments of tasks with a timeout or retries are always pickled, see
+    # processes_zero_copy_min.
+    # Default: 0
+    processes_task_retries: int = 0
+
+    # Delay in seconds before the first retry of a task. The delay doubles with every further retry.
+    # Default: 1.0
+    processes_task_backoff: float = 1.0
+
+    r"""
+>>> CACHE <<<
+    Results of functions decorated with @morpy_cached (see lib.cache) are kept in memory shared by
+    all processes and optionally in a SQLite database on disk.
+    """
+
+    # Turn on the result cache. If False, decorated functions are always called.
+    # Default: True
+    cache_enable: bool = True
+
+    # Maximum size of the results cached in memory in MB. The least recently used results are evicted
+    # first. In a multiprocessing context, this much shared memory is reserved at initialization.
+    # Default: 16
+    cache_memory_mb: int = 16
+
+    # Maximum amount of results cached in memory.
+    # Default: 1024
+    cache_memory_max: int = 1024
+
+    # Time to live of a cached result in seconds, if not given to the decorator. If None, results
+    # are kept until evicted.
+    # Default: None
+    cache_ttl: float | None = None
+
+    # Turn on the on-disk cache in addition to the memory. Results survive the app and are reused
+    # by later runs.
+    # Default: False
+    cache_db_enable: bool = False
+
+    # Maximum size of the results cached on disk in MB. The least recently used results are evicted
+    # first. If None, the on-disk cache is not limited.
+    # Default: 256
+    cache_db_max_mb: int | None = 256
+
     r"""
 >>> PATHS <<<
     """
@@ -201,6 +471,9 @@ def settings():
     # Path to the main database of the app
     main_db_path = pathlib.Path(os.path.join(f'{main_path}', 'db', 'main.db'))
 
+    # Path to the database of the on-disk result cache
+    cache_db_path = pathlib.Path(os.path.join(f'{main_path}', 'db', 'cache.db'))
+
     # Path to the developed app
     app_path = pathlib.Path(os.path.join(f'{main_path}', 'app'))
     # Create the path, if not existing.
@@ -219,6 +492,8 @@ def settings():
         'log_enable' : log_enable,
         'ref_create' : ref_create,
         'log_db_enable' : log_db_enable,
+        'log_db_batch_rows' : log_db_batch_rows,
+        'log_db_batch_interval' : log_db_batch_interval,
         'log_txt_enable' : log_txt_enable,
         'log_txt_header_enable' : log_txt_header_enable,
         'msg_print' : msg_print,
@@ -227,8 +502,11 @@ def settings():
         'log_lvl_nolog' : log_lvl_nolog,
         'log_lvl_noprint' : log_lvl_noprint,
         'log_lvl_interrupts' : log_lvl_interrupts,
+        'log_ring_slots' : log_ring_slots,
+        'log_ring_slot_size' : log_ring_slot_size,
         'metrics_enable' : metrics_enable,
         'metrics_perf_mode' : metrics_perf_mode,
+        'counters_max' : counters_max,
         'memory_use_absolute' : memory_use_absolute,
         'memory_relative' : memory_relative,
         'memory_absolute' : memory_absolute_mb,
@@ -238,12 +516,54 @@ def settings():
         'processes_relative' : processes_relative,
         'processes_relative_math' : processes_relative_math,
         'processes_are_critical' : processes_are_critical,
+        'processes_backend' : processes_backend,
+        'processes_start_method' : processes_start_method,
+        'processes_forkserver_preload' : processes_forkserver_preload,
+        'processes_pool' : processes_pool,
+        'processes_pool_prespawn' : processes_pool_prespawn,
+        'processes_pool_max_tasks' : processes_pool_max_tasks,
+        'processes_pool_max_rss_mb' : processes_pool_max_rss_mb,
+        'processes_pool_warm_imports' : processes_pool_warm_imports,
+        'processes_wakeup_timeout' : processes_wakeup_timeout,
+        'processes_deque_max' : processes_deque_max,
+        'processes_coalesce' : processes_coalesce,
+        'processes_coalesce_target' : processes_coalesce_target,
+        'processes_coalesce_max' : processes_coalesce_max,
+        'processes_sched_classes' : processes_sched_classes,
+        'processes_sched_aging' : processes_sched_aging,
+        'processes_sched_phase_weights' : processes_sched_phase_weights,
+        'processes_queue_max' : processes_queue_max,
+        'processes_queue_timeout' : processes_queue_timeout,
+        'processes_autoscale' : processes_autoscale,
+        'processes_autoscale_min' : processes_autoscale_min,
+        'processes_autoscale_interval' : processes_autoscale_interval,
+        'processes_autoscale_idle' : processes_autoscale_idle,
+        'processes_autoscale_cpu_max' : processes_autoscale_cpu_max,
+        'processes_autoscale_mem_max' : processes_autoscale_mem_max,
+        'processes_ring_slots' : processes_ring_slots,
+        'processes_ring_slot_size' : processes_ring_slot_size,
+        'processes_inbox_slots' : processes_inbox_slots,
+        'processes_inbox_slot_size' : processes_inbox_slot_size,
+        'processes_async_max' : processes_async_max,
+        'processes_zero_copy_min' : processes_zero_copy_min,
+        'processes_affinity' : processes_affinity,
+        'processes_store_shards' : processes_store_shards,
+        'processes_task_timeout' : processes_task_timeout,
+        'processes_task_retries' : processes_task_retries,
+        'processes_task_backoff' : processes_task_backoff,
+        'cache_enable' : cache_enable,
+        'cache_memory_mb' : cache_memory_mb,
+        'cache_memory_max' : cache_memory_max,
+        'cache_ttl' : cache_ttl,
+        'cache_db_enable' : cache_db_enable,
+        'cache_db_max_mb' : cache_db_max_mb,
         'main_path' : main_path,
         'log_path' : log_path,
         'log_db_path' : log_db_path,
         'log_txt_path' : log_txt_path,
         'data_path' : data_path,
         'main_db_path' : main_db_path,
+        'cache_db_path' : cache_db_path,
         'app_path' : app_path,
         'app_icon' : app_icon,
         'app_banner' : app_banner,
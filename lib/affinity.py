@@ -0,0 +1,189 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     CPU affinity of child processes. Process IDs are pinned to CPUs by a placement policy,
+            which takes the NUMA nodes of the machine into account.
+"""
+
+from morPy import log
+from lib.decorators import core_wrap
+
+import os
+import glob
+from contextlib import contextmanager
+
+
+def numa_nodes() -> list:
+    r"""
+    Returns the CPUs of the NUMA nodes of the machine, limited to the CPUs the calling process may
+    run on. Nodes without such CPUs are left out. If the NUMA topology is unknown (i.e. on Windows),
+    all CPUs are treated as a single node.
+
+    :return: List of nodes, each a sorted list of logical CPU numbers.
+    """
+
+    import psutil
+
+    cpus_allowed: set = set(psutil.Process().cpu_affinity())
+    nodes: list = []
+
+    for node_path in sorted(glob.glob("/sys/devices/system/node/node[0-9]*"),
+                            key=lambda path: int(path.rsplit("node", 1)[1])):
+        try:
+            with open(os.path.join(node_path, "cpulist")) as cpulist_file:
+                cpulist = cpulist_file.read().strip()
+        except OSError:
+            continue
+
+        # Format of a cpulist: "0-15,32-47"
+        node_cpus: set = set()
+        for cpu_range in filter(None, cpulist.split(",")):
+            first, _sep, last = cpu_range.partition("-")
+            node_cpus.update(range(int(first), int(last or first) + 1))
+
+        node_cpus &= cpus_allowed
+        if node_cpus:
+            nodes.append(sorted(node_cpus))
+
+    if not nodes:
+        nodes = [sorted(cpus_allowed)]
+
+    return nodes
+
+
+def affinity_plan(policy: str, processes_max: int, nodes: list) -> dict:
+    r"""
+    Assigns CPUs to the process IDs 1 to processes_max by a placement policy.
+
+    :param policy: Placement policy
+        "compact": One logical CPU per process, filling up the NUMA nodes one after another. Keeps
+            processes working on the same data close to each other.
+        "scatter": One logical CPU per process, spread round-robin over the NUMA nodes. Makes the
+            most of the memory bandwidth and caches of all nodes.
+        "numa": All CPUs of a NUMA node per process, spread round-robin over the nodes. Processes
+            stay local to their memory, but the operating system balances them within the node.
+    :param processes_max: Maximum processes leveraged during runtime.
+    :param nodes: CPUs of the NUMA nodes, see numa_nodes()
+
+    :return: Dictionary {process_id : [cpu, ...]} or an empty dictionary, if the policy is unknown.
+
+    :example:
+        plan = affinity_plan("scatter", 4, [[0, 1, 2, 3], [4, 5, 6, 7]])
+        # {1: [0], 2: [4], 3: [1], 4: [5]}
+    """
+
+    plan: dict = {}
+    cpus_all: list = [cpu for node in nodes for cpu in node]
+
+    for process_id in range(1, processes_max + 1):
+        index = process_id - 1
+        match policy:
+            case "compact":
+                plan[process_id] = [cpus_all[index % len(cpus_all)]]
+            case "scatter":
+                node = nodes[index % len(nodes)]
+                plan[process_id] = [node[(index // len(nodes)) % len(node)]]
+            case "numa":
+                plan[process_id] = list(nodes[index % len(nodes)])
+            case _:
+                return {}
+
+    return plan
+
+
+@core_wrap
+def affinity_init(trace: dict, app_dict: dict) -> None:
+    r"""
+    Determines the CPUs of every child process by the policy "processes_affinity" (see config.py) and
+    publishes them in app_dict["morpy"]["proc_affinity"]. Only to be called by the orchestrator in
+    multiprocessing mode, before child processes are spawned.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    policy: str | None = app_dict["morpy"]["conf"]["processes_affinity"]
+    plan: dict = {}
+
+    if policy:
+        try:
+            nodes = numa_nodes()
+        except AttributeError:
+            # CPU affinity is not supported on this platform. Processes are not pinned.
+            log(trace, app_dict, "warning",
+                lambda: f'{app_dict["loc"]["morpy"]["affinity_init_unsupported"]}')
+            nodes = []
+
+        if nodes:
+            plan = affinity_plan(policy, app_dict["morpy"]["processes_max"], nodes)
+
+            if plan:
+                # CPUs of the child processes determined.
+                log(trace, app_dict, "debug",
+                    lambda: f'{app_dict["loc"]["morpy"]["affinity_init_done"]}\n'
+                            f'{app_dict["loc"]["morpy"]["affinity_init_policy"]}: {policy}\n'
+                            f'{app_dict["loc"]["morpy"]["affinity_init_nodes"]}: {len(nodes)}\n'
+                            + "\n".join(f'{process_id}: {cpus}' for process_id, cpus in plan.items()))
+            else:
+                # Invalid placement policy. Processes are not pinned.
+                log(trace, app_dict, "warning",
+                    lambda: f'{app_dict["loc"]["morpy"]["affinity_init_invalid"]}\n'
+                            f'{app_dict["loc"]["morpy"]["affinity_init_policy"]}: {policy}')
+
+    with app_dict["morpy"].lock:
+        app_dict["morpy"]["proc_affinity"] = plan
+
+
+@core_wrap
+def affinity_apply(trace: dict, app_dict: dict) -> None:
+    r"""
+    Pins the calling child process to the CPUs determined for its process ID by affinity_init(). To
+    be called right after the process started.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    cpus: list | None = app_dict["morpy"].get("proc_affinity", {}).get(trace["process_id"], None)
+
+    if cpus:
+        import psutil
+        psutil.Process().cpu_affinity(cpus)
+
+        # Process pinned to CPUs.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["affinity_apply_done"]}\n'
+                    f'{app_dict["loc"]["morpy"]["affinity_apply_cpus"]}: {cpus}')
+
+
+@contextmanager
+def affinity_local(app_dict: dict, process_id: int):
+    r"""
+    Pins the calling process to the CPUs of a child process for the duration of the context. Memory
+    first written to within the context is allocated on the NUMA node of the child process, as the
+    operating system allocates pages on the node of the CPU touching them first.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param process_id: morPy process ID of the child process
+
+    :example:
+        with affinity_local(app_dict, process_id):
+            inbox_ring = SharedRingBuffer(create=True)
+    """
+
+    cpus: list | None = app_dict["morpy"].get("proc_affinity", {}).get(process_id, None)
+
+    if not cpus:
+        yield
+        return
+
+    import psutil
+    process = psutil.Process()
+    cpus_before: list = process.cpu_affinity()
+    process.cpu_affinity(cpus)
+    try:
+        yield
+    finally:
+        process.cpu_affinity(cpus_before)
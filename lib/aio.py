@@ -0,0 +1,226 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Asyncio integration of morPy. Tasks defined with 'async def' are run by an event loop of the
+            process, so the process takes on further tasks while they await I/O.
+"""
+
+from morPy import log
+from lib.mp import is_udict, core_add, notify_orchestrator, notify_process
+
+import os
+import asyncio
+import inspect
+import threading
+from collections import deque
+from concurrent.futures import Future, wait
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+# Event loop of the process, running in its own thread. Created once per process.
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+
+# Limits the coroutines run at once by the process, see "processes_async_max" in config.py.
+_slots: threading.BoundedSemaphore | None = None
+
+# Coroutines scheduled and not completed yet {future : (trace, app_dict, on_done)}
+_pending: dict = {}
+_pending_lock = threading.Lock()
+
+# Coroutines done, to be completed by the main thread of a child process (see collect()).
+_done: deque = deque()
+
+# Event loops of threads running coroutines to completion, see run_blocking().
+_local = threading.local()
+
+
+def event_loop(app_dict: dict) -> asyncio.AbstractEventLoop:
+    r"""
+    Returns the event loop of the calling process and starts it, if it is not running yet.
+
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: Event loop of the process
+    """
+
+    global _loop, _loop_pid, _slots, _pending_lock
+
+    if _loop is None or _loop_pid != os.getpid():
+        # A forked process inherits the references, but not the thread running the loop.
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        _slots = threading.BoundedSemaphore(app_dict["morpy"]["conf"]["processes_async_max"])
+        _pending_lock = threading.Lock()
+        _pending.clear()
+        _done.clear()
+
+        threading.Thread(target=_loop.run_forever, name='morPy_event_loop', daemon=True).start()
+
+    return _loop
+
+
+def run_task(trace: dict, app_dict: dict, call: Callable) -> Any:
+    r"""
+    Calls a task. If it returns an awaitable, i.e. the function of the task is defined with 'async def',
+    the awaitable is scheduled on the event loop of the process instead of awaiting it. The caller moves
+    on right away.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param call: Task as a callable without arguments, see lib.mp.task_to_partial()
+
+    :return: Return value of the task or a concurrent.futures.Future of the coroutine scheduled.
+    """
+
+    retval = call()
+
+    if inspect.isawaitable(retval):
+        return schedule(trace, app_dict, retval)
+
+    return retval
+
+
+def schedule(trace: dict, app_dict: dict, awaitable: Awaitable, on_done: Callable=None) -> Future:
+    r"""
+    Schedules an awaitable on the event loop of the process. If the maximum of coroutines run at once is
+    reached, blocks until another one is done.
+
+    In child processes, coroutines done are completed by the main thread of the process (see collect()),
+    as UltraDict locks must not be acquired by other threads of the same process. Until then, they count
+    in app_dict["morpy"]["tasks_async"], so that the orchestrator does not join the processes. Otherwise,
+    they are completed by the thread of the event loop right away.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param awaitable: Coroutine or any other awaitable
+    :param on_done: Called with the future of the coroutine, once it is done. If None, an exception
+        raised by the coroutine is logged.
+
+    :return: concurrent.futures.Future of the coroutine
+    """
+
+    loop = event_loop(app_dict)
+    deferred: bool = is_udict(app_dict["morpy"]) and trace["process_id"] != app_dict["morpy"]["proc_master"]
+
+    _slots.acquire()
+
+    if deferred:
+        core_add(app_dict, "tasks_async", 1)
+
+    future = asyncio.run_coroutine_threadsafe(_await(awaitable), loop)
+
+    with _pending_lock:
+        _pending[future] = (trace, app_dict, on_done)
+
+    future.add_done_callback(partial(_done_callback, trace["process_id"], deferred))
+
+    return future
+
+
+async def _await(awaitable: Awaitable) -> Any:
+    r"""
+    Wraps any awaitable in a coroutine, as required by asyncio.run_coroutine_threadsafe().
+    """
+
+    return await awaitable
+
+
+def _done_callback(process_id: int, deferred: bool, future: Future) -> None:
+    r"""
+    Called by the thread of the event loop, once a coroutine is done.
+
+    :param process_id: morPy process ID of the process scheduling the coroutine
+    :param deferred: If True, the coroutine is completed by the main thread of the process.
+    :param future: Future of the coroutine
+    """
+
+    _slots.release()
+
+    if deferred:
+        _done.append(future)
+        notify_process(process_id)
+    else:
+        _complete(future)
+
+
+def _complete(future: Future) -> None:
+    r"""
+    Completes a coroutine done by calling its on_done callable or logging the exception it raised.
+
+    :param future: Future of the coroutine
+    """
+
+    with _pending_lock:
+        trace, app_dict, on_done = _pending.pop(future)
+
+    if on_done:
+        on_done(future)
+    elif not future.cancelled() and future.exception() is not None:
+        # An async task raised an exception.
+        log(trace, app_dict, "error",
+            lambda: f'{app_dict["loc"]["morpy"]["aio_task_failed"]}\n'
+                    f'{type(future.exception()).__name__}: {future.exception()}')
+
+
+def collect(trace: dict, app_dict: dict) -> int:
+    r"""
+    Completes the coroutines done of a child process. To be called by the main thread of the process
+    in between tasks and while it waits.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: Number of coroutines completed
+    """
+
+    completed: int = 0
+
+    while _done:
+        _complete(_done.popleft())
+        completed += 1
+
+    if completed:
+        core_add(app_dict, "tasks_async", -completed)
+
+        # The orchestrator may join the processes now.
+        notify_orchestrator()
+
+    return completed
+
+
+def drain(trace: dict, app_dict: dict) -> None:
+    r"""
+    Blocks until all coroutines scheduled by the process are done and completed.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    while True:
+        with _pending_lock:
+            futures = list(_pending)
+        if not futures:
+            return
+
+        wait(futures, timeout=app_dict["morpy"]["conf"]["processes_wakeup_timeout"])
+        collect(trace, app_dict)
+
+
+def run_blocking(awaitable: Awaitable) -> Any:
+    r"""
+    Runs an awaitable to completion on an event loop of the calling thread. Used by the threads of the
+    thread backend, which run async tasks one after another.
+
+    :param awaitable: Coroutine or any other awaitable
+
+    :return: Return value of the awaitable
+    """
+
+    loop = getattr(_local, "loop", None)
+    if loop is None:
+        loop = _local.loop = asyncio.new_event_loop()
+
+    return loop.run_until_complete(_await(awaitable))
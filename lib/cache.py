@@ -0,0 +1,389 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Result cache for deterministic functions. Results are keyed by the hash of the callable and
+            its arguments and kept in memory shared by all processes (least recently used first out)
+            and optionally in a SQLite database on disk.
+"""
+
+import lib.fct as morpy_fct
+from morPy import log, conditional_lock
+from lib.decorators import core_wrap, evaluate_trace, evaluate_app_dict
+
+import os
+import time
+import pickle
+import inspect
+import sqlite3
+import threading
+from functools import wraps
+
+# Protocol of the pickles hashed for cache keys. Fixed, so that keys stay the same across Python
+# versions writing to the on-disk cache.
+_KEY_PROTOCOL: int = 4
+
+# Connection to the on-disk cache. Opened once per process.
+_db_conn: sqlite3.Connection | None = None
+_db_pid: int | None = None
+_db_lock = threading.Lock()
+
+
+def morpy_cached(func=None, *, ttl: float=None, disk: bool=None):
+    r"""
+    Decorator caching the return value of a deterministic function, so that calls with the same
+    arguments return the cached result instead of running the function again. The cache key is the
+    hash of the module and qualified name of the function and its arguments bound to its parameters,
+    excluding trace and app_dict (see cache_key()). Hence, an argument passed by position or by keyword
+    leads to the same key. Calls with arguments, that can not be pickled, are not cached.
+
+    Results are kept in app_dict["morpy"]["cache"], which is shared by all processes, and optionally
+    in a SQLite database (see "cache_db_enable" in config.py). A result found on disk only is copied to
+    memory. Cached results are returned as a copy, so mutating them does not alter the cache. Calls
+    with the same arguments running at once may all miss the cache and run the function.
+
+    Stack it above @morpy_wrap, so that a cache hit skips the wrapper, too.
+
+    :param func: morPy compatible function. Needs to at least carry trace and app_dict in its signature.
+    :param ttl: Time to live of a result in seconds. If None, "cache_ttl" of config.py applies.
+    :param disk: If True, results are cached on disk as well. If None, "cache_db_enable" of config.py
+        applies.
+
+    :return: Decorated function
+
+    :example:
+        from lib.cache import morpy_cached
+        from lib.decorators import morpy_wrap
+
+        @morpy_cached(ttl=3600)
+        @morpy_wrap
+        def parse(trace, app_dict, path):
+            ...
+    """
+
+    def decorator(func_cached):
+        func_name: str = f'{func_cached.__module__}.{func_cached.__qualname__}'
+        signature = inspect.signature(func_cached)
+
+        @wraps(func_cached)
+        def wrapper(*args, **kwargs):
+            trace: dict | None = None
+            app_dict: dict | None = None
+
+            # Search for 'trace' and 'app_dict' in the signature.
+            for arg in args:
+                if trace is None and evaluate_trace(arg):
+                    trace = arg
+                elif app_dict is None and evaluate_app_dict(arg):
+                    app_dict = arg
+                    break
+
+            if app_dict is None or not app_dict["morpy"]["conf"]["cache_enable"]:
+                return func_cached(*args, **kwargs)
+
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                # Invalid arguments, raised by the function itself.
+                return func_cached(*args, **kwargs)
+            bound.apply_defaults()
+
+            # Neither 'trace' nor 'app_dict' are part of the key.
+            arguments: dict = {name: value for name, value in bound.arguments.items()
+                               if value is not trace and value is not app_dict}
+
+            key = cache_key(func_name, arguments)
+            if key is None:
+                return func_cached(*args, **kwargs)
+
+            conf = app_dict["morpy"]["conf"]
+            use_disk: bool = conf["cache_db_enable"] if disk is None else disk
+
+            data = _memory_get(app_dict, key)
+            if data is None and use_disk:
+                entry = _disk_get(trace, app_dict, key)
+                if entry is not None:
+                    expires, data = entry
+                    _memory_set(app_dict, key, func_name, expires, data)
+
+            if data is not None:
+                return pickle.loads(data)
+
+            retval = func_cached(*args, **kwargs)
+
+            try:
+                data = pickle.dumps(retval, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # The result can not be pickled and is not cached.
+                return retval
+
+            ttl_key = conf["cache_ttl"] if ttl is None else ttl
+            expires = time.time() + ttl_key if ttl_key is not None else None
+
+            _memory_set(app_dict, key, func_name, expires, data)
+            if use_disk:
+                _disk_set(trace, app_dict, key, func_name, expires, data)
+
+            return retval
+
+        return wrapper
+
+    # Decorator used with or without arguments
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def cache_key(func_name: str, arguments: dict) -> str | None:
+    r"""
+    Determines the cache key of a call as the SHA-256 hash of the function name and its pickled
+    arguments. Equal arguments in a different order (i.e. keys of a dictionary argument) lead to a
+    different key and only cause a cache miss.
+
+    :param func_name: Module and qualified name of the function
+    :param arguments: Arguments by parameter name, excluding trace and app_dict
+
+    :return: Cache key or None, if the arguments can not be pickled.
+
+    :example:
+        key = cache_key("app.run.parse", {"path" : "data.csv", "delimiter" : ";"})
+    """
+
+    try:
+        pickled = pickle.dumps((func_name, sorted(arguments.items())), protocol=_KEY_PROTOCOL)
+    except Exception:
+        return None
+
+    return morpy_fct.hashify(pickled)
+
+
+def _memory_get(app_dict: dict, key: str) -> bytes | None:
+    r"""
+    Returns a pickled result cached in memory and marks it as the most recently used. Expired results
+    are removed.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param key: Cache key, see cache_key()
+
+    :return: Pickled result or None, if not cached.
+    """
+
+    cache = app_dict["morpy"]["cache"]
+
+    with conditional_lock(cache):
+        entry = cache.pop(key, None)
+        if entry is None:
+            return None
+
+        expires, _func_name, data = entry
+        if expires is not None and expires <= time.time():
+            return None
+
+        cache[key] = entry
+
+    return data
+
+
+def _memory_set(app_dict: dict, key: str, func_name: str, expires: float | None, data: bytes) -> None:
+    r"""
+    Caches a pickled result in memory. Expired results are removed, then the least recently used ones
+    until the cache fits "cache_memory_mb" and "cache_memory_max" (see config.py).
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param key: Cache key, see cache_key()
+    :param func_name: Module and qualified name of the function cached
+    :param expires: Time (as in time.time()) the result expires or None.
+    :param data: Pickled result
+    """
+
+    conf = app_dict["morpy"]["conf"]
+    size_max: int = conf["cache_memory_mb"] * 1024 * 1024
+    entries_max: int = conf["cache_memory_max"]
+
+    # A single result larger than a quarter of the cache would evict most of it.
+    if len(data) > size_max // 4 or entries_max < 1:
+        return
+
+    cache = app_dict["morpy"]["cache"]
+    now: float = time.time()
+
+    with conditional_lock(cache):
+        cache.pop(key, None)
+
+        for key_expired in [key_cached for key_cached, entry in cache.items()
+                            if entry[0] is not None and entry[0] <= now]:
+            del cache[key_expired]
+
+        size: int = len(data) + sum(len(entry[2]) for entry in cache.values())
+        keys_lru = iter(list(cache.keys()))
+        while (len(cache) >= entries_max or size > size_max) and cache:
+            size -= len(cache.pop(next(keys_lru))[2])
+
+        cache[key] = (expires, func_name, data)
+
+
+def _disk_connect(trace: dict, app_dict: dict) -> sqlite3.Connection | None:
+    r"""
+    Returns the connection to the on-disk cache of the calling process. The database is created, if
+    not existing. Connections opened by a parent process are not reused.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: Connection or None, if the database can not be opened.
+    """
+
+    global _db_conn, _db_pid
+
+    if _db_conn is not None and _db_pid == os.getpid():
+        return _db_conn
+
+    db_path = app_dict["morpy"]["conf"]["cache_db_path"]
+
+    try:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute('CREATE TABLE IF NOT EXISTS cache ('
+                     'key TEXT PRIMARY KEY, func TEXT, expires REAL, accessed REAL, size INTEGER, value BLOB)')
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+    except sqlite3.Error as e:
+        # The on-disk cache could not be opened. Continuing without it.
+        log(trace, app_dict, "warning",
+            lambda: f'{app_dict["loc"]["morpy"]["cache_disk_fail"]}\n'
+                    f'{app_dict["loc"]["morpy"]["cache_disk_path"]}: {db_path}\n'
+                    f'{type(e).__name__}: {e}')
+        return None
+
+    _db_conn, _db_pid = conn, os.getpid()
+    return conn
+
+
+def _disk_get(trace: dict, app_dict: dict, key: str) -> tuple | None:
+    r"""
+    Returns a pickled result cached on disk and marks it as the most recently used. Expired results
+    are removed.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param key: Cache key, see cache_key()
+
+    :return: Tuple (expires, pickled result) or None, if not cached.
+    """
+
+    with _db_lock:
+        conn = _disk_connect(trace, app_dict)
+        if conn is None:
+            return None
+
+        now: float = time.time()
+        try:
+            row = conn.execute("SELECT expires, value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            if row[0] is not None and row[0] <= now:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+
+            conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            # The on-disk cache could not be read. Continuing without it.
+            log(trace, app_dict, "warning",
+                lambda: f'{app_dict["loc"]["morpy"]["cache_disk_fail"]}\n{type(e).__name__}: {e}')
+            return None
+
+    return row[0], row[1]
+
+
+def _disk_set(trace: dict, app_dict: dict, key: str, func_name: str, expires: float | None,
+              data: bytes) -> None:
+    r"""
+    Caches a pickled result on disk. Expired results are removed, then the least recently used ones
+    until the cache fits "cache_db_max_mb" (see config.py).
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param key: Cache key, see cache_key()
+    :param func_name: Module and qualified name of the function cached
+    :param expires: Time (as in time.time()) the result expires or None.
+    :param data: Pickled result
+    """
+
+    size_max: int | None = app_dict["morpy"]["conf"]["cache_db_max_mb"]
+
+    with _db_lock:
+        conn = _disk_connect(trace, app_dict)
+        if conn is None:
+            return
+
+        now: float = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                         (key, func_name, expires, now, len(data), data))
+            conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (now,))
+
+            if size_max is not None:
+                excess = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0] - size_max * 1024 * 1024
+                if excess > 0:
+                    keys_evicted: list = []
+                    for key_lru, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed"):
+                        if excess <= 0:
+                            break
+                        keys_evicted.append((key_lru,))
+                        excess -= size
+                    conn.executemany("DELETE FROM cache WHERE key = ?", keys_evicted)
+
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # The on-disk cache could not be written. Continuing without it.
+            log(trace, app_dict, "warning",
+                lambda: f'{app_dict["loc"]["morpy"]["cache_disk_fail"]}\n{type(e).__name__}: {e}')
+
+
+@core_wrap
+def cache_clear(trace: dict, app_dict: dict, func=None, disk: bool=True) -> dict:
+    r"""
+    Removes cached results from memory and, if enabled, from disk.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param func: Function decorated with @morpy_cached, whose results are removed. If None, all
+        results are removed.
+    :param disk: If True, results are removed from disk as well, if "cache_db_enable" is set in config.py.
+
+    :return: dict
+        cleared: Results removed from memory
+    """
+
+    cache = app_dict["morpy"]["cache"]
+    func_name: str | None = f'{func.__module__}.{func.__qualname__}' if func is not None else None
+
+    with conditional_lock(cache):
+        keys_cleared: list = [key for key, entry in cache.items() if func_name in (None, entry[1])]
+        for key in keys_cleared:
+            del cache[key]
+    cleared: int = len(keys_cleared)
+
+    if disk and app_dict["morpy"]["conf"]["cache_db_enable"]:
+        with _db_lock:
+            conn = _disk_connect(trace, app_dict)
+            if conn is not None:
+                if func_name is None:
+                    conn.execute("DELETE FROM cache")
+                else:
+                    conn.execute("DELETE FROM cache WHERE func = ?", (func_name,))
+
+    # Cached results removed.
+    log(trace, app_dict, "debug",
+        lambda: f'{app_dict["loc"]["morpy"]["cache_clear_done"]}\n'
+                f'{app_dict["loc"]["morpy"]["cache_clear_cnt"]}: {cleared}')
+
+    return {
+        "cleared" : cleared,
+    }
@@ -0,0 +1,186 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Counters of the app shared by all processes. Counters are registered by name and kept as
+            atomics in a block of shared memory, so they are updated without taking any lock.
+"""
+
+from morPy import log, conditional_lock
+from lib.decorators import core_wrap
+from lib.shm import SharedAtomics
+
+import atexit
+
+
+# Block of atomics holding the counters of the app. Attached once per process.
+_counters: SharedAtomics | None = None
+
+# Slots of the counters registered {name : index}, cached by the calling process.
+_slots: dict = {}
+
+
+def counters_init(app_dict: dict) -> None:
+    r"""
+    Creates the block of atomics holding the counters of the app and publishes its name in
+    app_dict["morpy"]["counters_block"]. The slots of the counters registered are kept in
+    app_dict["morpy"]["counters"] as {name : index}. Only to be called at initialization.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    from lib.init import obscure_shared_name
+
+    global _counters
+    _counters = SharedAtomics(tuple(range(0, app_dict["morpy"]["conf"]["counters_max"])),
+                              name=obscure_shared_name(), create=True)
+    atexit.register(_counters.close)
+
+    with conditional_lock(app_dict["morpy"]):
+        app_dict["morpy"]["counters_block"] = _counters.name
+        app_dict["morpy"]["counters"] = {}
+
+
+def counters_block(app_dict: dict) -> SharedAtomics:
+    r"""
+    Returns the block of atomics holding the counters of the app, attaching to it on first use in the
+    calling process. A process forked from the orchestrator keeps the mapping of its parent.
+
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: SharedAtomics instance
+    """
+
+    global _counters
+    if _counters is None:
+        _counters = SharedAtomics(tuple(range(0, app_dict["morpy"]["conf"]["counters_max"])),
+                                  name=app_dict["morpy"]["counters_block"])
+        atexit.register(_counters.close)
+    return _counters
+
+
+def counters_unlink() -> None:
+    r"""
+    Requests the block of counters to be destroyed, once all child processes exited. The calling
+    process stays attached, so the counters remain readable until the app ends. Only to be used by
+    the orchestrator.
+    """
+
+    if _counters:
+        _counters.unlink()
+
+
+def counter_slot(app_dict: dict, name: str) -> int:
+    r"""
+    Returns the slot of a counter in the block of atomics. Slots are looked up in app_dict once per
+    process and counter.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param name: Name of the counter
+
+    :return: Index of the slot
+
+    :raises KeyError: The counter was not registered, see counter_register().
+    """
+
+    index = _slots.get(name, None)
+    if index is None:
+        with conditional_lock(app_dict["morpy"]):
+            registered = app_dict["morpy"]["counters"]
+        _slots.update(registered)
+        index = registered[name]
+    return index
+
+
+@core_wrap
+def counter_register(trace: dict, app_dict: dict, name: str=None, value: int=0) -> dict:
+    r"""
+    Registers a counter shared by all processes. Registering a counter twice keeps its value. Up to
+    "counters_max" counters may be registered (see config.py).
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param name: Name of the counter
+    :param value: Initial value of the counter
+
+    :return: dict
+        registered: False, if the counter was registered already.
+
+    :example:
+        counter_register(trace, app_dict, name="rows_parsed")
+    """
+
+    registered: bool = False
+
+    with conditional_lock(app_dict["morpy"]):
+        counters = app_dict["morpy"]["counters"]
+
+        if name not in counters:
+            if len(counters) >= app_dict["morpy"]["conf"]["counters_max"]:
+                raise IndexError(f'{app_dict["loc"]["morpy"]["counter_register_full"]}\n'
+                                 f'{app_dict["loc"]["morpy"]["counter_register_max"]}: '
+                                 f'{app_dict["morpy"]["conf"]["counters_max"]}')
+
+            index = len(counters)
+            counters_block(app_dict).store(index, value)
+            counters[name] = index
+            app_dict["morpy"]["counters"] = counters
+            registered = True
+
+    _slots.update(counters)
+
+    if registered:
+        # Counter registered.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["counter_register_done"]}: {name}')
+
+    return {
+        "registered" : registered
+    }
+
+
+def counter_add(app_dict: dict, name: str, delta: int=1) -> int:
+    r"""
+    Adds to a counter without losing concurrent additions of other processes. No lock is taken.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param name: Name of the counter, see counter_register()
+    :param delta: Value to be added, may be negative.
+
+    :return: Value of the counter after the addition
+
+    :example:
+        counter_add(app_dict, "rows_parsed", len(rows))
+    """
+
+    return counters_block(app_dict).fetch_add(counter_slot(app_dict, name), delta) + delta
+
+
+def counter_value(app_dict: dict, name: str) -> int:
+    r"""
+    Reads a counter.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param name: Name of the counter, see counter_register()
+
+    :return: Value of the counter
+    """
+
+    return counters_block(app_dict).load(counter_slot(app_dict, name))
+
+
+def counters_snapshot(app_dict: dict) -> dict:
+    r"""
+    Reads all counters registered by the app. The counters are read one after another, not all at once.
+
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: Dictionary {name : value}
+    """
+
+    with conditional_lock(app_dict["morpy"]):
+        registered = app_dict["morpy"]["counters"]
+
+    block = counters_block(app_dict)
+    return {name: block.load(index) for name, index in registered.items()}
@@ -0,0 +1,221 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Task dependency graphs, run in parallel as soon as the dependencies of a task are met.
+"""
+
+from morPy import log
+from lib.decorators import morpy_wrap
+from lib.mp import normalize_task, deque_blocked
+from lib.results import submit, wait_check
+
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import Callable
+
+
+class TaskGraph:
+    r"""
+    Directed acyclic graph of morPy tasks. Every node is a task with declared upstream dependencies.
+    When the graph is run, a node is queued as soon as all of its upstream nodes are done, so
+    independent branches do not wait for each other. The results of the upstream nodes may be handed
+    to a node as a keyword argument.
+
+    Nodes on the critical path are queued with a higher priority. The critical path is determined by
+    the cost of the nodes, that is the longest chain of costs from a node to the end of the graph.
+    """
+
+
+    @morpy_wrap
+    def __init__(self, trace: dict, app_dict: dict, name: str=None) -> None:
+        r"""
+        Creates an empty task graph.
+
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param name: Name or description of the instance
+        """
+
+        self.name = name if name else 'task_graph'
+        self.nodes = {}         # {node : task}
+        self.upstream = {}      # {node : tuple of upstream nodes}
+        self.downstream = {}    # {node : list of downstream nodes}
+        self.costs = {}         # {node : cost}
+        self.upstream_kwargs = {}   # {node : keyword argument receiving upstream results}
+
+
+    @morpy_wrap
+    def add(self, trace: dict, app_dict: dict, node: str=None, task: Callable | list | tuple=None,
+            depends_on: list | tuple=None, cost: float=1.0, upstream_kwarg: str=None) -> None:
+        r"""
+        Adds a task to the graph. Upstream nodes have to be added first, which rules out cycles.
+
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param node: Unique name of the node
+        :param task: Callable, list or tuple packing the task, see morPy.process_q()
+        :param depends_on: Names of the upstream nodes, that have to be done before the task starts.
+        :param cost: Estimated relative duration of the task. Used to determine the critical path.
+        :param upstream_kwarg: If not None, the results of the upstream nodes are handed to the task
+            as a dictionary {node : result} with this keyword.
+
+        :example:
+            graph.add(trace, app_dict, node="load", task=[load, trace, app_dict])
+            graph.add(trace, app_dict, node="clean", task=[clean, trace, app_dict],
+                      depends_on=["load"], upstream_kwarg="inputs")
+        """
+
+        depends_on = tuple(depends_on) if depends_on else ()
+
+        if node in self.nodes:
+            raise ValueError(f'{app_dict["loc"]["morpy"]["TaskGraph_node_dup"]}: {node}')
+        if not task:
+            raise ValueError(f'{app_dict["loc"]["morpy"]["TaskGraph_task_none"]}: {node}')
+
+        for upstream_node in depends_on:
+            if upstream_node not in self.nodes:
+                raise ValueError(f'{app_dict["loc"]["morpy"]["TaskGraph_node_unknown"]}: {upstream_node}')
+
+        self.nodes[node] = task
+        self.upstream[node] = depends_on
+        self.downstream[node] = []
+        self.costs[node] = cost
+        self.upstream_kwargs[node] = upstream_kwarg
+
+        for upstream_node in depends_on:
+            self.downstream[upstream_node].append(node)
+
+
+    def _priorities(self, priority: int, max_priority: int | None=None) -> dict:
+        r"""
+        Derives the priority of every node from the critical path. The node with the longest chain of
+        costs to the end of the graph gets the given priority, nodes with shorter chains get
+        increasing values. If there are more chain costs than priorities up to max_priority, the
+        values are compressed into that range, so no node drops into a lower priority class.
+
+        :param priority: Priority of the most critical nodes
+        :param max_priority: Highest value a node may get, i.e. the upper bound of the priority class
+            of priority. If None, the values are not bounded.
+
+        :return: {node : priority}
+        """
+
+        chain_costs: dict = {}
+
+        # Downstream nodes were added later, so walk the nodes in reverse order of insertion.
+        for node in reversed(self.nodes):
+            chain_costs[node] = self.costs[node] + max(
+                (chain_costs[downstream_node] for downstream_node in self.downstream[node]), default=0
+            )
+
+        levels = {chain_cost: n for n, chain_cost in enumerate(sorted(set(chain_costs.values()), reverse=True))}
+
+        level_max = len(levels) - 1
+        if max_priority is not None and priority + level_max > max_priority:
+            room = max(max_priority - priority, 0)
+            levels = {chain_cost: level * room // level_max for chain_cost, level in levels.items()}
+
+        return {node: priority + levels[chain_cost] for node, chain_cost in chain_costs.items()}
+
+
+    def _task(self, node: str, results: dict) -> list:
+        r"""
+        Packs the task of a node and hands the results of its upstream nodes to it, if requested.
+
+        :param node: Name of the node
+        :param results: Results of all nodes done so far
+
+        :return: Task packed as a list
+        """
+
+        task = normalize_task(self.nodes[node])
+        upstream_kwarg = self.upstream_kwargs[node]
+
+        if upstream_kwarg:
+            upstream_results = {upstream_node: results[upstream_node] for upstream_node in self.upstream[node]}
+            task = list(task)
+            if len(task) > 3 and isinstance(task[-1], dict):
+                task[-1] = {**task[-1], upstream_kwarg: upstream_results}
+            else:
+                task.append({upstream_kwarg: upstream_results})
+
+        return task
+
+
+    @morpy_wrap
+    def run(self, trace: dict, app_dict: dict, priority: int=100) -> dict:
+        r"""
+        Runs the graph and blocks until all nodes are done. Nodes are queued as soon as their upstream
+        nodes are done. If a task raises an exception, queued nodes are cancelled and the exception is
+        raised.
+
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param priority: Priority of the nodes on the critical path (lower is higher priority)
+
+        :return: dict
+            {node : result} of all nodes
+
+        :example:
+            results = graph.run(trace, app_dict)
+        """
+
+        # Keep the nodes within the priority class of the given priority.
+        sched_classes = app_dict["morpy"]["conf"]["processes_sched_classes"]
+        max_priority = min((spec["max_priority"] for spec in sched_classes.values()
+                            if spec.get("max_priority", None) is not None and spec["max_priority"] >= priority),
+                           default=None)
+
+        priorities: dict = self._priorities(priority, max_priority=max_priority)
+        upstream_open: dict = {node: len(upstream) for node, upstream in self.upstream.items()}
+        futures: dict = {}  # {future : node}
+        results: dict = {}
+
+        def release(nodes: list) -> None:
+            # Queue the most critical nodes first.
+            for node_ready in sorted(nodes, key=lambda n: priorities[n]):
+                future = submit(trace, app_dict, task=self._task(node_ready, results),
+                                priority=priorities[node_ready])
+                futures[future] = node_ready
+
+        # Running task graph.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["TaskGraph_run_start"]} {self.name}\n'
+                    f'{app_dict["loc"]["morpy"]["TaskGraph_nodes"]}: {len(self.nodes)}')
+
+        release([node for node, count in upstream_open.items() if count == 0])
+
+        try:
+            # No tasks are queued to the process while it waits for the nodes.
+            with deque_blocked(trace, app_dict):
+                while futures:
+                    done, _pending = wait(futures, timeout=app_dict["morpy"]["conf"]["processes_wakeup_timeout"],
+                                          return_when=FIRST_COMPLETED)
+
+                    if not done:
+                        wait_check(trace, app_dict)
+                        continue
+
+                    nodes_ready: list = []
+                    for future in done:
+                        node = futures.pop(future)
+                        results[node] = future.result()
+
+                        for downstream_node in self.downstream[node]:
+                            upstream_open[downstream_node] -= 1
+                            if upstream_open[downstream_node] == 0:
+                                nodes_ready.append(downstream_node)
+
+                    release(nodes_ready)
+
+        finally:
+            # Do not leave queued nodes behind, if a node failed.
+            for future in futures:
+                future.cancel()
+
+        # Task graph done.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["TaskGraph_run_done"]} {self.name}')
+
+        return results
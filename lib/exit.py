@@ -9,6 +9,7 @@ Descr.:     This module delivers functions to handle exiting the app.
 import lib.fct as morpy_fct
 from morPy import log
 from lib.decorators import core_wrap
+from lib.mp import core_add, core_load
 
 import sys
 
@@ -17,7 +18,8 @@ import sys
 def end_runtime(trace: dict, app_dict: dict) -> None:
     r"""
     Finalizes the morPy runtime by retrieving the exit timestamp, calculating the total runtime,
-    logging event counters and exit details, and then calling sys.exit() to terminate the application.
+    logging event counters and exit details, writing the logs buffered for the logging database and then
+    calling sys.exit() to terminate the application.
 
     :param trace: operation credentials and tracing
     :param app_dict: The mpy-specific global dictionary
@@ -34,8 +36,12 @@ def end_runtime(trace: dict, app_dict: dict) -> None:
     temp_duration = morpy_fct.runtime(app_dict["morpy"]["init_datetime_value"])
 
     # Correction of the exit occurrence counter for the very last message
-    app_dict["morpy"]["events_EXIT"] += 1
-    app_dict["morpy"]["events_total"] += 1
+    core_add(app_dict, "events_EXIT", 1)
+    core_add(app_dict, "events_total", 1)
+
+    # Read all event counters at once
+    events = {level: core_load(app_dict, f'events_{level}') for level in
+              ("INIT", "DEBUG", "INFO", "WARNING", "DENIED", "ERROR", "CRITICAL", "EXIT", "UNDEFINED", "total")}
 
     # Determine leading spaces before app_dict["exit_msg_total"] so the colons
     # of the exit message fall in one vertcal line.
@@ -48,16 +54,20 @@ def end_runtime(trace: dict, app_dict: dict) -> None:
                 f'{app_dict["loc"]["morpy"]["exit_msg_exited"]}: {datetime_exit["date"]} {app_dict["loc"]["morpy"]["exit_msg_at"]} {datetime_exit["time"]}\n'
                 f'{app_dict["loc"]["morpy"]["exit_msg_duration"]}: {temp_duration["rnt_delta"]}\n\n'
                 f'{5 * "-"} {app_dict["loc"]["morpy"]["exit_msg_events"]} {5 * "-"}\n'
-                f'     INIT: {app_dict["morpy"]["events_INIT"]}\n'
-                f'    DEBUG: {app_dict["morpy"]["events_DEBUG"]}\n'
-                f'     INFO: {app_dict["morpy"]["events_INFO"]}\n'
-                f'  WARNING: {app_dict["morpy"]["events_WARNING"]}\n'
-                f'   DENIED: {app_dict["morpy"]["events_DENIED"]}\n'
-                f'    ERROR: {app_dict["morpy"]["events_ERROR"]}\n'
-                f' CRITICAL: {app_dict["morpy"]["events_CRITICAL"]}\n'
-                f'     EXIT: {app_dict["morpy"]["events_EXIT"]}\n'
-                f'UNDEFINED: {app_dict["morpy"]["events_UNDEFINED"]}\n'
+                f'     INIT: {events["INIT"]}\n'
+                f'    DEBUG: {events["DEBUG"]}\n'
+                f'     INFO: {events["INFO"]}\n'
+                f'  WARNING: {events["WARNING"]}\n'
+                f'   DENIED: {events["DENIED"]}\n'
+                f'    ERROR: {events["ERROR"]}\n'
+                f' CRITICAL: {events["CRITICAL"]}\n'
+                f'     EXIT: {events["EXIT"]}\n'
+                f'UNDEFINED: {events["UNDEFINED"]}\n'
                 f'{18 * "-"}\n'
-                f'{spaces_total * " "}{app_dict["loc"]["morpy"]["exit_msg_total"]}: {app_dict["morpy"]["events_total"]}')
+                f'{spaces_total * " "}{app_dict["loc"]["morpy"]["exit_msg_total"]}: {events["total"]}')
+
+    # Insert the log rows left into the logging database.
+    from lib.msg import log_sink_close
+    log_sink_close()
 
     sys.exit(0)
\ No newline at end of file
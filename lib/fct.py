@@ -81,16 +81,18 @@ def datetime_now() -> dict:
     }
 
 
-def hashify(string: str) -> str:
+def hashify(string: str | bytes) -> str:
     """
-    Returns the SHA‑256 hexadecimal hash of a given input string.
+    Returns the SHA‑256 hexadecimal hash of a given input string or bytes.
 
-    :param string: The input string to hash.
+    :param string: The input string or bytes to hash.
 
     :return str: SHA-256 hash of the string as a hexadecimal string.
     """
     import hashlib
-    return hashlib.sha256(string.encode('utf-8')).hexdigest()
+    if isinstance(string, str):
+        string = string.encode('utf-8')
+    return hashlib.sha256(string).hexdigest()
 
 
 def runtime(in_ref_time) -> dict:
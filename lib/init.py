@@ -11,7 +11,7 @@ import config
 from morPy import log
 from lib.decorators import core_wrap
 from lib.common import textfile_write
-from lib.mp import MorPyOrchestrator
+from lib.mp import MorPyOrchestrator, core_atomics_init, core_store
 
 import importlib
 import sys
@@ -62,16 +62,28 @@ def init(trace) -> (dict | UltraDict, MorPyOrchestrator):
     # Build the app_dict
     init_dict, init_datetime = build_app_dict(trace, create=True)
 
-    init_dict["morpy"].update({"tasks_created" : trace["task_id"]})
-    init_dict["morpy"]["proc_joined"] = True
+    # Keep the hot flags and counters in atomics instead of behind the lock of init_dict["morpy"]
+    if init_dict["morpy"]["processes_max"] > 1:
+        core_atomics_init(init_dict)
+
+    # Set up the counters of the app
+    from lib.counters import counters_init
+    counters_init(init_dict)
+
+    core_store(init_dict, "tasks_created", trace["task_id"])
+    core_store(init_dict, "tasks_async", 0)
+    core_store(init_dict, "proc_joined", True)
     init_dict["morpy"].update({"proc_master" : trace['process_id']})
 
     # Initialize the global interrupt flag and exit flag
-    init_dict["morpy"]["interrupt"] = False
-    init_dict["morpy"]["exit"] = False
+    core_store(init_dict, "interrupt", False)
+    core_store(init_dict, "exit", False)
 
     # Set an initialization complete flag
-    init_dict["morpy"]["init_complete"] = False
+    core_store(init_dict, "init_complete", False)
+
+    # Phase of the app ("init", "run" or "exit")
+    init_dict["morpy"]["app_phase"] = "init"
 
     # Store the start time and timestamps in the dictionary
     for time_key in init_datetime:
@@ -101,16 +113,9 @@ def init(trace) -> (dict | UltraDict, MorPyOrchestrator):
             init_dict["morpy"]["logs_generate"][log_level] = False
 
     # Prepare log levels
-    init_dict["morpy"]["events_total"] = 0
-    init_dict["morpy"]["events_DEBUG"] = 0
-    init_dict["morpy"]["events_INFO"] = 0
-    init_dict["morpy"]["events_WARNING"] = 0
-    init_dict["morpy"]["events_DENIED"] = 0
-    init_dict["morpy"]["events_ERROR"] = 0
-    init_dict["morpy"]["events_CRITICAL"] = 0
-    init_dict["morpy"]["events_UNDEFINED"] = 0
-    init_dict["morpy"]["events_INIT"] = 0
-    init_dict["morpy"]["events_EXIT"] = 0
+    for event_key in ("events_total", "events_DEBUG", "events_INFO", "events_WARNING", "events_DENIED",
+                      "events_ERROR", "events_CRITICAL", "events_UNDEFINED", "events_INIT", "events_EXIT"):
+        core_store(init_dict, event_key, 0)
 
     # Create first log in txt-file including the app header
     if (init_dict["morpy"]["conf"]["log_txt_header_enable"]
@@ -211,6 +216,12 @@ def build_app_dict(trace: dict, create: bool=False) -> (dict | UltraDict, dict):
 
         processes_max = init_max_processes(conf_dict, sysinfo["logical_cpus"])
 
+        # The thread backend runs all tasks within a single process. The count determined is the
+        # count of threads then.
+        threads_max: int = 0
+        if conf_dict["processes_backend"] == "thread":
+            threads_max, processes_max = processes_max, 1
+
         if processes_max > 1:
             from lib.mp import shared_dict
 
@@ -290,6 +301,45 @@ def build_app_dict(trace: dict, create: bool=False) -> (dict | UltraDict, dict):
                 recurse=False
             )
 
+            # app_dict["morpy"]["proc_blocked"]
+            init_dict["morpy"]["proc_blocked"] = shared_dict(
+                name=obscure_shared_name(),
+                create=create,
+                size=memory_dict["app_dict_morpy_proc_blocked_mem"],
+                recurse=False
+            )
+
+            # app_dict["morpy"]["proc_deques"]
+            init_dict["morpy"]["proc_deques"] = shared_dict(
+                name=obscure_shared_name(),
+                create=create,
+                size=memory_dict["app_dict_morpy_proc_deques_mem"],
+                recurse=False
+            )
+
+            # app_dict["morpy"]["tasks_cancelled"] - Sharded, as it is keyed by independent task IDs.
+            from lib.store import ShardedDict
+            init_dict["morpy"]["tasks_cancelled"] = ShardedDict(
+                shards=conf_dict["processes_store_shards"],
+                size=memory_dict["app_dict_morpy_tasks_cancelled_mem"]
+            )
+
+            # app_dict["morpy"]["tasks_guarded"]
+            init_dict["morpy"]["tasks_guarded"] = shared_dict(
+                name=obscure_shared_name(),
+                create=create,
+                size=memory_dict["app_dict_morpy_tasks_guarded_mem"],
+                recurse=False
+            )
+
+            # app_dict["morpy"]["cache"]
+            init_dict["morpy"]["cache"] = shared_dict(
+                name=obscure_shared_name(),
+                create=create,
+                size=memory_dict["app_dict_morpy_cache_mem"],
+                recurse=False
+            )
+
             # app_dict["morpy"]["sys"]
             init_dict["morpy"]["sys"] = shared_dict(
                 name=obscure_shared_name(),
@@ -338,19 +388,24 @@ def build_app_dict(trace: dict, create: bool=False) -> (dict | UltraDict, dict):
                 recurse=False
             )
 
-        # Without GIL, allow for true nesting
+        # Without GIL, allow for true nesting. Threads of the thread backend lock the
+        # dictionaries like UltraDicts.
         else:
-            init_dict = dict()
-            init_dict["morpy"] = {}
-            init_dict["morpy"]["conf"] = {}
-            init_dict["morpy"]["logs_generate"] = {}
-            init_dict["morpy"]["orchestrator"] = {}
-            init_dict["morpy"]["sys"] = {}
-            init_dict["loc"] = {}
-            init_dict["loc"]["morpy"] = {}
-            init_dict["loc"]["morpy_dgb"] = {}
-            init_dict["loc"]["app"] = {}
-            init_dict["loc"]["app_dbg"] = {}
+            from lib.threads import LockedDict
+            nested_dict = LockedDict if threads_max else dict
+
+            init_dict = nested_dict()
+            init_dict["morpy"] = nested_dict()
+            init_dict["morpy"]["conf"] = nested_dict()
+            init_dict["morpy"]["logs_generate"] = nested_dict()
+            init_dict["morpy"]["orchestrator"] = nested_dict()
+            init_dict["morpy"]["cache"] = nested_dict()
+            init_dict["morpy"]["sys"] = nested_dict()
+            init_dict["loc"] = nested_dict()
+            init_dict["loc"]["morpy"] = nested_dict()
+            init_dict["loc"]["morpy_dgb"] = nested_dict()
+            init_dict["loc"]["app"] = nested_dict()
+            init_dict["loc"]["app_dbg"] = nested_dict()
 
         # Store configuration in init_dict
         for key, val in conf_dict.items():
@@ -360,8 +415,9 @@ def build_app_dict(trace: dict, create: bool=False) -> (dict | UltraDict, dict):
         for sys_key, sys_val in sysinfo.items():
             init_dict["morpy"]["sys"][sys_key] = sys_val
 
-        # Store maximum determined processes
+        # Store maximum determined processes and threads of the thread backend
         init_dict["morpy"]["processes_max"] = processes_max
+        init_dict["morpy"]["threads_max"] = threads_max
 
         return init_dict, init_datetime
 
@@ -588,6 +644,11 @@ def nested_memory_sizes(conf_dict: dict, max_processes: int) -> dict:
         app_dict_morpy_proc_available_mem   - Memory for UltraDict: app_dict["morpy"]["proc_available"]
         app_dict_morpy_proc_busy_mem        - Memory for UltraDict: app_dict["morpy"]["proc_busy"]
         app_dict_morpy_proc_waiting_mem     - Memory for UltraDict: app_dict["morpy"]["proc_waiting"]
+        app_dict_morpy_proc_blocked_mem     - Memory for UltraDict: app_dict["morpy"]["proc_blocked"]
+        app_dict_morpy_proc_deques_mem      - Memory for UltraDict: app_dict["morpy"]["proc_deques"]
+        app_dict_morpy_tasks_cancelled_mem  - Memory for ShardedDict: app_dict["morpy"]["tasks_cancelled"]
+        app_dict_morpy_tasks_guarded_mem    - Memory for UltraDict: app_dict["morpy"]["tasks_guarded"]
+        app_dict_morpy_cache_mem            - Memory for UltraDict: app_dict["morpy"]["cache"]
         app_dict_morpy_sys_mem              - Memory for UltraDict: app_dict["morpy"]["sys"]
         app_dict_loc_mem                    - Memory for UltraDict: app_dict["loc"]
         app_dict_loc_morpy_mem              - Memory for UltraDict: app_dict["loc"]["morpy"]
@@ -607,7 +668,13 @@ def nested_memory_sizes(conf_dict: dict, max_processes: int) -> dict:
     app_dict_morpy_proc_available_mem: int  = 1 * 1024 * 1024 * ceil(1 + 0.2 * max_processes)
     app_dict_morpy_proc_busy_mem: int       = 1 * 1024 * 1024 * ceil(1 + 0.2 * max_processes)
     app_dict_morpy_proc_waiting_mem: int    = 1 * 1024 * 1024 * ceil(1 + 0.2 * max_processes)
+    app_dict_morpy_proc_blocked_mem: int    = 1 * 1024 * 1024
+    app_dict_morpy_proc_deques_mem: int     = 1 * 1024 * 1024 * ceil(1 + 0.5 * max_processes)
+    app_dict_morpy_tasks_cancelled_mem: int = 1 * 1024 * 1024
+    app_dict_morpy_tasks_guarded_mem: int   = 5 * 1024 * 1024
     app_dict_morpy_logs_generate_mem: int   = 1 * 1024 * 1024
+    # Headroom for the pickled entries on top of the results cached.
+    app_dict_morpy_cache_mem: int           = ceil(1.25 * conf_dict["cache_memory_mb"] * 1024 * 1024) + 1024 * 1024
 
     app_dict_morpy_conf_mem: int  = 1 * 1024 * 1024
     app_dict_morpy_sys_mem: int   = 2 * 1024 * 1024
@@ -624,6 +691,11 @@ def nested_memory_sizes(conf_dict: dict, max_processes: int) -> dict:
         app_dict_morpy_proc_available_mem,
         app_dict_morpy_proc_busy_mem,
         app_dict_morpy_proc_waiting_mem,
+        app_dict_morpy_proc_blocked_mem,
+        app_dict_morpy_proc_deques_mem,
+        app_dict_morpy_tasks_cancelled_mem,
+        app_dict_morpy_tasks_guarded_mem,
+        app_dict_morpy_cache_mem,
         app_dict_morpy_logs_generate_mem,
         app_dict_morpy_conf_mem,
         app_dict_morpy_sys_mem,
@@ -669,6 +741,11 @@ def nested_memory_sizes(conf_dict: dict, max_processes: int) -> dict:
         "app_dict_morpy_proc_available_mem" : app_dict_morpy_proc_available_mem,
         "app_dict_morpy_proc_busy_mem" : app_dict_morpy_proc_busy_mem,
         "app_dict_morpy_proc_waiting_mem" : app_dict_morpy_proc_waiting_mem,
+        "app_dict_morpy_proc_blocked_mem" : app_dict_morpy_proc_blocked_mem,
+        "app_dict_morpy_proc_deques_mem" : app_dict_morpy_proc_deques_mem,
+        "app_dict_morpy_tasks_cancelled_mem" : app_dict_morpy_tasks_cancelled_mem,
+        "app_dict_morpy_tasks_guarded_mem" : app_dict_morpy_tasks_guarded_mem,
+        "app_dict_morpy_cache_mem" : app_dict_morpy_cache_mem,
         "app_dict_morpy_sys_mem" : app_dict_morpy_sys_mem,
         "app_dict_loc_mem" : app_dict_loc_mem,
         "app_dict_loc_morpy_mem" : app_dict_loc_morpy_mem,
@@ -9,13 +9,23 @@ Descr.:     Multiprocessing functionality for morPy.
 import lib.fct as morpy_fct
 from morPy import log, conditional_lock
 from lib.decorators import core_wrap
+from lib.sched import MorPyScheduler
+from lib.shm import (SharedAtomics, SharedRingBuffer, SHARED_BUFFER_PREFIX, shared_buffer_create,
+                     shared_buffer_attach, shared_buffer_unlink, shared_buffers_reap)
 
+import io
+import os
+import atexit
 import sys
 import time
+import pickle
+import threading
+from array import array
 from UltraDict import UltraDict
-from multiprocessing import Process, active_children
+from multiprocessing import active_children, get_all_start_methods, get_context
+from collections import OrderedDict
+from contextlib import contextmanager
 from functools import partial
-from heapq import heappush, heappop
 from typing import Any, Callable, List
 
 
@@ -27,12 +37,16 @@ class MorPyOrchestrator:
 
     __slots__ = [
         '_mp',
+        'autoscaler',
         'curr_task',
         'heap',
+        'metrics_published',
+        'queue_depth',
         'trace',
         'processes_max',
         'ref_module',
-        'ref_operation'
+        'ref_operation',
+        'watchdog_checked'
     ]
 
 
@@ -53,6 +67,13 @@ class MorPyOrchestrator:
         # If processes were queued, omit a race condition with joining.
         app_dict["morpy"]["orchestrator"]["delayed_join"]   = False
 
+        # Average durations of coalesced tasks per callable, see run_chunk().
+        app_dict["morpy"]["orchestrator"]["task_durations"] = {}
+
+        # Tasks waiting in the heap of the orchestrator and processes held back, see queue_throttle().
+        app_dict["morpy"]["orchestrator"]["queue_depth"]    = 0
+        app_dict["morpy"]["orchestrator"]["queue_held"]     = []
+
         # Determine if multiprocessing is enabled
         self.processes_max: int = app_dict["morpy"]["processes_max"]
         if self.processes_max > 1:
@@ -63,17 +84,58 @@ class MorPyOrchestrator:
 
         # Construct arguments for heap and tasks
         if self._mp:
-            self.heap = list()
+            self.heap = MorPyScheduler(
+                app_dict["morpy"]["conf"]["processes_sched_classes"],
+                aging=app_dict["morpy"]["conf"]["processes_sched_aging"],
+                phase_weights=app_dict["morpy"]["conf"]["processes_sched_phase_weights"]
+            )
+            self.metrics_published: float = 0.0
+            self.watchdog_checked: float = 0.0
+            self.queue_depth: int = 0
             self.curr_task = dict()
             self.curr_task["priority"] = None
             self.curr_task["counter"] = None
             self.curr_task["task_sys_id"] = None
             self.curr_task["task"] = None
             self.curr_task["is_process"] = None
+            self.curr_task["enqueued"] = None
 
             # Build references to available and busy process IDs
             self._init_processes(trace, app_dict)
 
+            # Determine how child processes are started
+            mp_context_init(trace, app_dict)
+
+            # Set up the wakeup primitive shared with child processes
+            wakeup_init(app_dict)
+
+            # Set up the ring buffer carrying shelved tasks to the orchestrator
+            heap_ring_init(app_dict)
+
+            # Write the logs of all processes in a thread of its own, see lib.msg.MorPyLogWriter
+            from lib.msg import log_writer_init
+            log_ring_init(app_dict)
+            log_writer_init(app_dict)
+
+            # Determine the CPUs of the child processes
+            from lib.affinity import affinity_init
+            affinity_init(trace, app_dict)
+
+            # Set up the result inboxes of the child processes
+            from lib.results import inbox_init
+            inbox_init(app_dict)
+
+            # Adjust the processes run at once to the load
+            if app_dict["morpy"]["conf"]["processes_autoscale"]:
+                self.autoscaler = MorPyAutoscaler(app_dict, self.processes_max)
+            else:
+                self.autoscaler = None
+
+        # Start the threads of the thread backend
+        elif app_dict["morpy"]["threads_max"]:
+            from lib.threads import thread_pool_init
+            thread_pool_init(trace, app_dict)
+
         # Set up first tasks
         self._init_run(trace, app_dict)
 
@@ -153,20 +215,128 @@ class MorPyOrchestrator:
             app_task = [app_run, trace, app_dict]
             heap_shelve(trace, app_dict, priority=-90, task=app_task, autocorrect=False, force=self._mp)
 
+            # Spawn the worker pool ahead of the first app tasks
+            if (app_dict["morpy"]["conf"]["processes_pool"]
+                and app_dict["morpy"]["conf"]["processes_pool_prespawn"]):
+                self._init_pool(trace, app_dict)
+
             # Enter the multiprocessing loop
             self._mp_loop(trace, app_dict)
 
+            # Destroy shared buffers of tasks, that were not run due to an early exit.
+            self._release_tasks_left(app_dict)
+
+            # Queue wait times of the priority classes.
+            self._publish_metrics(app_dict)
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["MorPyOrchestrator_sched_metrics"]}\n'
+                        + "\n".join(f'{name}: {metrics}' for name, metrics
+                                    in app_dict["morpy"]["orchestrator"]["sched_metrics"].items()))
+
+            # Write the logs left. Logs of the orchestrator are written directly from now on.
+            from lib.msg import log_writer_release
+            log_writer_release()
+
+            # Destroy the task and log ring buffers, result inboxes and atomics, all child processes have
+            # exited.
+            from lib.results import inbox_release
+            from lib.counters import counters_unlink
+            heap_ring_release(unlink=True)
+            log_ring_release(unlink=True)
+            inbox_release(unlink=True)
+            core_atomics_unlink()
+            counters_unlink()
+            tasks_cancelled_unlink(app_dict)
+
         # Start the app - single process
         else:
             app_run(trace, app_dict)
 
+            # Stop the threads of the thread backend
+            from lib.threads import thread_pool_release
+            thread_pool_release()
+
+            # Destroy the counters of the app, they remain readable by this process.
+            from lib.counters import counters_unlink
+            counters_unlink()
+            tasks_cancelled_unlink(app_dict)
+
+
+    async def run_async(self, trace: dict, app_dict: dict) -> None:
+        r"""
+        Like run(), but to be awaited within an event loop. The orchestrator runs in a thread of the
+        default executor of the loop, which keeps serving other coroutines meanwhile.
+
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+
+        :example:
+            asyncio.run(orchestrator.run_async(trace, app_dict))
+        """
+
+        import asyncio
+        await asyncio.get_running_loop().run_in_executor(None, partial(self.run, trace, app_dict))
+
+
+    def _release_tasks_left(self, app_dict: dict) -> None:
+        r"""
+        Releases the shared buffers of all tasks left in the heap, the ring buffer, the heap shelf,
+        the waiting dictionary and the queues of the processes. To be called once the multiprocessing
+        loop ended.
+
+        :param app_dict: morPy global dictionary containing app configurations
+        """
+
+        tasks_left: list = [task_heap[3] for task_heap in self.heap]
+        self.heap.clear()
+
+        ring = heap_ring(app_dict)
+        if ring:
+            tasks_left.extend(pickle.loads(payload)[3] for payload in ring.get_batch())
+
+        with app_dict["morpy"]["heap_shelf"].lock:
+            tasks_left.extend(task_shelved[3] for task_shelved in app_dict["morpy"]["heap_shelf"].values())
+            app_dict["morpy"]["heap_shelf"].clear()
+
+        with app_dict["morpy"]["proc_waiting"].lock:
+            tasks_left.extend(task for task, _priority, _task_id in app_dict["morpy"]["proc_waiting"].values())
+
+        with app_dict["morpy"]["proc_deques"].lock:
+            for proc_deque in app_dict["morpy"]["proc_deques"].values():
+                tasks_left.extend(task for _priority, _task_id, task in proc_deque)
+            app_dict["morpy"]["proc_deques"].clear()
+
+        release_shared_buffers(tasks_left)
+
+
+    @core_wrap
+    def _init_pool(self, trace: dict, app_dict: dict) -> None:
+        r"""
+        Enqueues one warm-up task per pool worker, except for the process reserved by the app
+        itself. Each warm-up task spawns a child process, which then stays alive as a pool worker
+        (see pool_worker()).
+
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        """
+
+        # The app itself occupies one process.
+        for _ in range(1, self.processes_max):
+            warm_up_task = [pool_warm_up, trace, app_dict]
+            heap_shelve(trace, app_dict, priority=-80, task=warm_up_task, autocorrect=False, force=True)
+
+        # Worker pool enqueued for spawning.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["MorPyOrchestrator_init_pool"]}\n'
+                    f'{app_dict["loc"]["morpy"]["MorPyOrchestrator_init_pool_workers"]}: {self.processes_max - 1}')
+
 
     @core_wrap
     def heap_pull(self, trace: dict, app_dict: dict) -> None:
         r"""
         Transfers any tasks that have been shelved in the shared heap_shelf into the orchestrator’s
-        own heap queue. Then it pops the highest‑priority task and stores its details in the
-        orchestrator’s current task record.
+        own heap queue. Then it pops the next task by the scheduling policy (see lib.sched) and stores
+        its details in the orchestrator’s current task record.
 
         :param trace: Operation credentials and tracing information
         :param app_dict: morPy global dictionary containing app configurations
@@ -174,23 +344,39 @@ class MorPyOrchestrator:
 
         pulled_tasks = set()
 
+        # Drain the ring buffer in a batch and feed the heap
+        ring = heap_ring(app_dict)
+        if ring:
+            for payload in ring.get_batch():
+                self.heap.push(pickle.loads(payload))
+
         # Pull tasks from shelf and feed the heap
         with app_dict["morpy"]["heap_shelf"].lock:
             for pid, task_shelved in app_dict["morpy"]["heap_shelf"].items():
-                heappush(self.heap, task_shelved)
+                self.heap.push(task_shelved)
                 pulled_tasks.add(pid)
 
             # Clean up and remove pulled tasks from shelf
             for key in pulled_tasks:
                 del app_dict["morpy"]["heap_shelf"][key]
 
+        # Tasks pulled are not counted as shelved anymore. Keep the queue depth up to date for processes
+        # held back by backpressure.
+        if app_dict["morpy"]["conf"]["processes_queue_max"]:
+            self._publish_depth(app_dict)
+
         if len(self.heap) > 0:
-            task_pulled = heappop(self.heap)
+            # Weights of the priority classes may differ per app phase.
+            self.heap.phase = app_dict["morpy"]["app_phase"]
+
+            task_popped = self.heap.pop()
+            task_pulled = task_popped["entry"]
             self.curr_task["priority"] = task_pulled[0]
             self.curr_task["counter"] = task_pulled[1]
             self.curr_task["task_sys_id"] = task_pulled[2]
             self.curr_task["task"] = task_pulled[3]
             self.curr_task["is_process"] = task_pulled[4]
+            self.curr_task["enqueued"] = task_popped["enqueued"]
 
             # Pulling task from heap. Priority: INT Counter: INT
             log(trace, app_dict, "debug",
@@ -218,7 +404,7 @@ class MorPyOrchestrator:
 
         terminate: bool         = False
         exit_in_progress: bool  = False
-        heap_len: int           = len(self.heap) + len(app_dict["morpy"]["heap_shelf"].keys())
+        heap_len: int           = self._tasks_pending(app_dict)
 
         while not terminate or heap_len > 0:
             # Check process queue for tasks
@@ -232,18 +418,37 @@ class MorPyOrchestrator:
                     priority = self.curr_task["priority"]
                     # Run a new parallel process
                     if is_process:
-                        with app_dict["morpy"].lock:
-                            exit_flag = app_dict["morpy"]["exit"]
+                        exit_flag = core_load(app_dict, "exit")
 
                         # Only run new processes if not exiting.
                         if not exit_flag:
-                            app_dict["morpy"]["proc_joined"] = False
-                            run_parallel(trace, app_dict, task=task, priority=priority, task_id=task_id)
+                            # Group tiny tasks of the same callable into a chunk run by a single process.
+                            if app_dict["morpy"]["conf"]["processes_coalesce"]:
+                                task_coalesced = self._coalesce(app_dict, task, priority, task_id)
+                                task, task_id = task_coalesced["task"], task_coalesced["task_id"]
+
+                            core_store(app_dict, "proc_joined", False)
+                            dispatched = run_parallel(trace, app_dict, task=task, priority=priority,
+                                                      task_id=task_id, requeue=False)["dispatched"]
+
+                            # Queue the task again, keeping its age.
+                            if dispatched:
+                                self.heap.record(priority, self.curr_task["enqueued"])
+                            else:
+                                self.heap.push((priority, task_id, self.curr_task["task_sys_id"], task,
+                                                is_process), enqueued=self.curr_task["enqueued"])
                             terminate = False
                             with app_dict["morpy"]["orchestrator"].lock:
                                 app_dict["morpy"]["orchestrator"]["terminate"] = terminate
+
+                            # All processes busy. Wait for a process to become available, unless
+                            # there are orchestrator tasks left.
+                            if not dispatched and all(task_heap[4] for task_heap in self.heap):
+                                wait_orchestrator()
                     # Run an orchestrator task directly
                     else:
+                        self.heap.record(priority, self.curr_task["enqueued"])
+
                         # Recreate UltraDict references in task
                         task_recreated = reattach_ultradict_refs(task)
                         execute = task_to_partial(task_recreated)
@@ -253,27 +458,29 @@ class MorPyOrchestrator:
                     del task
 
             else:
+                # Close the shared buffers mapped by their receivers in the meantime.
+                shared_buffers_reap()
+
                 # Repeated check on shelved tasks. Mitigates race condition with joining processes.
                 with app_dict["morpy"]["orchestrator"].lock:
                     delayed_join = app_dict["morpy"]["orchestrator"]["delayed_join"]
                 if delayed_join:
                     for _ in range(0, 3):   # 3x for a maximum total delay of 1.5s
-                        time.sleep(0.5)     # 0.5s = 500 ms
-                        with app_dict["morpy"]["heap_shelf"].lock:
-                            heap_len = len(self.heap) + len(app_dict["morpy"]["heap_shelf"].keys())
+                        wait_orchestrator(timeout=0.5)     # 0.5s = 500 ms
+                        heap_len = self._tasks_pending(app_dict)
                         if heap_len > 0:
                             break
 
                 # Check on child processes: signal join or pass tasks
                 if heap_len == 0:
-                    with app_dict["morpy"].lock:
-                        if not app_dict["morpy"]["proc_joined"] and heap_len == 0:
-                            check_child_processes(trace, app_dict, check_join=True)
+                    if not core_load(app_dict, "proc_joined"):
+                        check_child_processes(trace, app_dict, check_join=True)
+
+                    # Idle until a task is shelved, a process changes state or an exit is requested.
+                    wait_orchestrator()
 
             # Check exit request issued by any process
-            with app_dict["morpy"].lock:
-                # Check for the global exit flag
-                exit_flag = app_dict["morpy"]["exit"]
+            exit_flag = core_load(app_dict, "exit")
 
             # Log the exit routine beginning only once.
             if exit_flag and not exit_in_progress:
@@ -291,7 +498,7 @@ class MorPyOrchestrator:
                         no_children = True if len(app_dict["morpy"]["proc_busy"]) < 2 else False
                     if no_children:
                         terminate = True
-                        self.heap = []
+                        self.heap.clear()
 
                         with app_dict["morpy"]["orchestrator"].lock:
                             app_dict["morpy"]["orchestrator"]["terminate"] = terminate
@@ -300,588 +507,2673 @@ class MorPyOrchestrator:
                         log(trace, app_dict, "debug",
                             lambda: f'{app_dict["loc"]["morpy"]["MorPyOrchestrator_exit_request_complete"]}')
 
-            # Calculate open tasks
-            with app_dict["morpy"]["heap_shelf"].lock:
-                heap_len = len(self.heap) + len(app_dict["morpy"]["heap_shelf"].keys())
-
-
-@core_wrap
-def app_run(trace: dict, app_dict: dict) -> None:
-    r"""
-    Coordinates the sequential execution of the three main phases: app initialization, main run,
-    and exit. In multiprocessing mode, the tasks are enqueued and managed by the orchestrator;
-    in single‑process mode, they are executed directly.
+            # Publish the metrics of the scheduler once a second.
+            if time.monotonic() - self.metrics_published > 1.0:
+                self._publish_metrics(app_dict)
 
-    :param trace: operation credentials and tracing information
-    :param app_dict: morPy global dictionary containing app configurations
-    """
+            # Keep the queue depth up to date for processes held back by backpressure.
+            elif app_dict["morpy"]["conf"]["processes_queue_max"]:
+                self._publish_depth(app_dict)
 
-    from app.init import init
-    from app.run import run
-    from app.exit import finalize
+            # Enforce the timeouts and retries of guarded tasks.
+            if time.monotonic() - self.watchdog_checked > 0.25 and not exit_flag:
+                self.watchdog_checked = time.monotonic()
+                if app_dict["morpy"]["tasks_guarded"]:
+                    tasks_watchdog(trace, app_dict)
 
-    # --- APP INITIALIZATION --- #
+            # Adjust the processes run at once to the load.
+            if self.autoscaler and self.autoscaler.due(app_dict) and not exit_flag:
+                self.autoscaler.step(trace, app_dict, depth=self._tasks_pending(app_dict),
+                                     dispatched=sum(metrics["tasks"] for metrics in self.heap.metrics().values()))
 
-    # Reset "delayed join" condition pre initialization.
-    with app_dict["morpy"]["orchestrator"].lock:
-        app_dict["morpy"]["orchestrator"]["delayed_join"] = False
+            # Calculate open tasks
+            heap_len = self._tasks_pending(app_dict)
 
-    # App initializing.
-    log(trace, app_dict, "info",
-        lambda: f'{app_dict["loc"]["morpy"]["app_run_init"]}')
 
-    # Execute
-    app_dict_n_shared = init(trace, app_dict)["app_dict_n_shared"]
+    def _coalesce(self, app_dict: dict, task: list, priority: int, task_id: int) -> dict:
+        r"""
+        Pops the tasks of the same callable and priority following the task pulled from the heap and
+        packs them into a chunk, which is run by a single process (see run_chunk()). The size of the
+        chunk adapts to the average duration measured for the callable, so that a chunk takes about
+        "processes_coalesce_target" seconds. Tasks of the morPy core (priority < 0) are not coalesced.
 
-    # Join all spawned processes before transitioning into the next phase.
-    join_or_task(trace, app_dict, reset_trace=True, reset_w_prefix=f'{trace["module"]}.{trace["operation"]}')
+        :param app_dict: morPy global dictionary containing app configurations
+        :param task: The pulled task list
+        :param priority: Integer representing task priority (lower is higher priority)
+        :param task_id: Value representing the unique, continuing task ID
 
-    # Set the "initialization complete" flag
-    # TODO Up until this point prints to console are mirrored on splash screen
-    if isinstance(app_dict["morpy"], UltraDict):
-        with app_dict["morpy"].lock:
-            app_dict["morpy"]["init_complete"] = True
-    else:
-        app_dict["morpy"]["init_complete"] = True
+        :return: dict
+            task: Chunk of tasks or the task pulled, if there was nothing to coalesce.
+            task_id: ID of the first task in the chunk
+        """
 
-    # Un-join
-    with conditional_lock(app_dict["morpy"]):
-        app_dict["morpy"]["proc_joined"] = False
+        key = task_key(task)
 
-    # --- APP RUN --- #
+        # Guarded tasks are run on their own, so a process terminated affects a single task only.
+        tasks_guarded = app_dict["morpy"]["tasks_guarded"]
 
-    # App starting.
-    log(trace, app_dict, "info",
-        lambda: f'{app_dict["loc"]["morpy"]["app_run_start"]}')
+        # Nothing to coalesce with.
+        task_next = self.heap.peek()
+        if (priority < 0 or key is None or task_next is None or task_next[0] != priority
+                or not task_next[4] or task_key(task_next[3]) != key or task_id in tasks_guarded):
+            return {
+                "task" : task,
+                "task_id" : task_id,
+            }
 
-    app_dict_n_shared = run(trace, app_dict, app_dict_n_shared)["app_dict_n_shared"]
+        coalesce_max: int = app_dict["morpy"]["conf"]["processes_coalesce_max"]
+        with app_dict["morpy"]["orchestrator"].lock:
+            duration = app_dict["morpy"]["orchestrator"]["task_durations"].get(key, None)
 
-    # Join all spawned processes before transitioning into the next phase.
-    join_or_task(trace, app_dict, reset_trace=True, reset_w_prefix=f'{trace["module"]}.{trace["operation"]}')
+        # Start with small chunks, until the duration of the callable was measured.
+        if duration is None:
+            chunk_size = min(4, coalesce_max)
+        else:
+            chunk_size = int(app_dict["morpy"]["conf"]["processes_coalesce_target"] / max(duration, 1e-6))
+            chunk_size = max(1, min(chunk_size, coalesce_max))
+
+        tasks: list = [task]
+        task_ids: list = [task_id]
+        while len(tasks) < chunk_size:
+            task_next = self.heap.peek()
+            if (task_next is None or task_next[0] != priority or not task_next[4]
+                    or task_key(task_next[3]) != key or task_next[1] in tasks_guarded):
+                break
 
-    # Un-join
-    with conditional_lock(app_dict["morpy"]):
-        app_dict["morpy"]["proc_joined"] = False
+            task_popped = self.heap.pop()
+            self.heap.record(priority, task_popped["enqueued"])
+            tasks.append(task_next[3])
+            task_ids.append(task_next[1])
 
-    # --- APP EXIT --- #
+        if len(tasks) == 1:
+            return {
+                "task" : task,
+                "task_id" : task_id,
+            }
 
-    # App exiting.
-    log(trace, app_dict, "info",
-        lambda: f'{app_dict["loc"]["morpy"]["app_run_exit"]}')
+        return {
+            "task" : [run_chunk, task[1], task[2], {"tasks" : tasks, "task_ids" : task_ids, "key" : key}],
+            "task_id" : task_id,
+        }
 
-    # Exit the app and signal morPy to terminate
-    finalize(trace, app_dict, app_dict_n_shared)
 
-    # Join all spawned processes before transitioning into the next phase.
-    join_or_task(trace, app_dict, reset_trace=True, reset_w_prefix=f'{trace["module"]}.{trace["operation"]}')
+    def _publish_metrics(self, app_dict: dict) -> None:
+        r"""
+        Publishes the metrics of the scheduler in app_dict["morpy"]["orchestrator"]["sched_metrics"],
+        see MorPyScheduler.metrics().
 
-    # Signal morPy orchestrator of app termination
-    if isinstance(app_dict["morpy"], UltraDict):
-        with app_dict["morpy"].lock:
-            app_dict["morpy"]["exit"] = True
-    else:
-        app_dict["morpy"]["exit"] = True
+        :param app_dict: morPy global dictionary containing app configurations
+        """
 
+        with app_dict["morpy"]["orchestrator"].lock:
+            app_dict["morpy"]["orchestrator"]["sched_metrics"] = self.heap.metrics()
 
-@core_wrap
-def heap_shelve(trace: dict, app_dict: dict, priority: int=100, task: Callable | list | tuple=None,
-                    autocorrect: bool=True, is_process: bool=True, force: bool = False, task_id: int=None) -> None:
-    r"""
-    Queues a new task into the shared memory shelf for later execution. The task may be provided in
-    multiple formats; it is normalized into a list, sanitized by substituting UltraDict references,
-    and then stored along with its priority and an incremented task ID. If the caller is not the
-    master process (or if forced), the task is queued; otherwise, it is executed immediately.
+        self._publish_depth(app_dict)
+        self.metrics_published = time.monotonic()
 
-    :param trace: Operation credentials and tracing information
-    :param app_dict: morPy global dictionary containing app configurations
-    :param priority: Integer representing task priority (lower is higher priority)
-    :param task: Callable, list or tuple packing the task. Formats:
-        callable: partial(func, *args, **kwargs)
-        list: [func, *args, {"kwarg1": val1, "kwarg2": val2, ...}]
-        tuple: (func, *args, {"kwarg1": val1, "kwarg2": val2, ...})
-    :param autocorrect: If False, priority can be smaller than zero. Priority
-        smaller zero is reserved for the morPy Core.
-    :param is_process: If True, task is run in a new process (not by morPy orchestrator)
-    :param force: If True, enforces queueing instead of direct execution. Used by morPy
-        orchestrator to spawn the first app process.
-    :param task_id: Value representing a task ID. Here it is only used to recover and re-shelve a task.
 
-    :example:
-        from lib.mp import heap_shelve
-        task = [my_func, trace, app_dict]
-        heap_shelve(trace, app_dict, priority=25, task=task)
-    """
+    def _publish_depth(self, app_dict: dict) -> None:
+        r"""
+        Publishes the number of tasks in the heap of the orchestrator in
+        app_dict["morpy"]["orchestrator"]["queue_depth"], if it changed. If it dropped, the processes
+        held back by queue_throttle() are notified to check on the high-water mark again.
 
-    # Check for Interrupt / exit
-    stop_while_interrupt(trace, app_dict)
+        :param app_dict: morPy global dictionary containing app configurations
+        """
 
-    if task:
-        # Transform task to a list, if possible
-        task = normalize_task(task)
-        proc_master = app_dict["morpy"]["proc_master"]
+        heap_len = len(self.heap)
+        if heap_len == self.queue_depth:
+            return
 
-        # Skip queuing, if in single core mode
-        if not (trace["process_id"] == proc_master) or force:
-            # Signal delayed join, to omit race condition.
-            with app_dict["morpy"]["orchestrator"].lock:
-                app_dict["morpy"]["orchestrator"]["delayed_join"] = True
-            with app_dict["morpy"].lock:
-                with app_dict["morpy"]["heap_shelf"].lock:
-                    morpy_dict = app_dict["morpy"]
+        with app_dict["morpy"]["orchestrator"].lock:
+            app_dict["morpy"]["orchestrator"]["queue_depth"] = heap_len
+            queue_held = app_dict["morpy"]["orchestrator"]["queue_held"]
 
-                    # Substitute UltraDict references in task to avoid recursion issues.
-                    task_sanitized = substitute_ultradict_refs(trace, app_dict, task)["task_sanitized"]
+        if heap_len < self.queue_depth:
+            for process_id in queue_held:
+                notify_process(process_id)
 
-                    # Check and autocorrect process priority
-                    if priority < 0 and autocorrect:
-                        # Invalid argument given to process queue. Autocorrected.
-                        log(trace, app_dict, "debug",
-                            lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_prio_corr"]}\n'
-                                    f'{app_dict["loc"]["morpy"]["heap_shelve_priority"]}: {priority} to 0')
-                        priority = 0
+        self.queue_depth = heap_len
 
-                    # Pushing task to priority queue.
-                    log(trace, app_dict, "debug",
-                        lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_start"]}\n'
-                                f'{app_dict["loc"]["morpy"]["heap_shelve_priority"]}: {priority}')
 
-                    next_task_id = task_id if task_id is not None else app_dict["morpy"]["tasks_created"] + 1
-                    task_sys_id = id(task)
+    def _tasks_pending(self, app_dict: dict) -> int:
+        r"""
+        Counts the tasks in the heap of the orchestrator, on the heap shelf and in the ring buffer.
 
-                    # Push task to heap shelf
-                    task_qed = (priority, next_task_id, task_sys_id, task_sanitized, is_process)
+        :param app_dict: morPy global dictionary containing app configurations
 
-                    morpy_dict["heap_shelf"][next_task_id] = task_qed
+        :return: Number of tasks pending.
+        """
 
-                    # Updating global tasks created last in case an error occurs
-                    if not task_id:
-                        morpy_dict["tasks_created"] += 1
+        with app_dict["morpy"]["heap_shelf"].lock:
+            heap_len = len(self.heap) + len(app_dict["morpy"]["heap_shelf"].keys())
 
-        # If run by morPy orchestrator or in single core mode, execute without queueing.
-        else:
-            # Transform task to a list if possible
-            task = normalize_task(task)
-            execute = task_to_partial(task)
-            execute()
+        ring = heap_ring(app_dict)
+        if ring:
+            heap_len += ring.pending()
 
-    else:
-        # Task can not be None. Skipping enqueue.
-        log(trace, app_dict, "debug",
-            lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_none"]}')
+        return heap_len
 
 
-# Suppress linting for mandatory arguments.
-# noinspection PyUnusedLocal
-@core_wrap
-def substitute_ultradict_refs(trace: dict, app_dict: dict, task: list) -> dict:
+class MorPyAutoscaler:
     r"""
-    Recursively searches through a task (which may be a list, tuple, or dict) and replaces any
-    UltraDict instance with a placeholder tuple (containing its unique name and configuration
-    flags) to prevent serialization recursion errors.
+    Adjusts the number of processes run at once at runtime, between "processes_autoscale_min" (2 at
+    least) and the maximum processes determined at startup (see config.py). Process IDs above the target are
+    parked, that is taken off app_dict["morpy"]["proc_available"], so that the orchestrator does not
+    spawn processes on them. To scale up, parked IDs are made available again. Processes running
+    already are left alone, except for idle pool workers, which are asked to retire.
+
+    Once per "processes_autoscale_interval", the autoscaler decides by these rules, the first one
+    applying wins:
+        - System memory used reached "processes_autoscale_mem_max": One process less.
+        - Tasks are queued, no process is idle and the processes working would take longer than an
+          interval to work them off: More processes, unless the CPU utilization reached
+          "processes_autoscale_cpu_max".
+        - Nothing is queued and processes were idle for "processes_autoscale_idle" seconds: As many
+          processes less as were idle.
+
+    The average runtime of a task is estimated by the processes working divided by the tasks
+    dispatched per second (Little's law).
+    """
 
-        (
-            "__morPy_shared_ref__::{UltraDict.name}",
-            UltraDict.shared_lock,   # (bool) whether a shared lock is used
-            UltraDict.auto_unlink,   # (bool) whether the dict auto-unlinks on close
-            UltraDict.recurse        # (bool) whether recursion (nested UltraDicts) is allowed
-        )
+    __slots__ = [
+        '_dispatched',
+        '_idle_since',
+        '_parked',
+        '_tick',
+        'active',
+        'processes_max',
+    ]
 
-    This substitution preserves the original structure so that later the task can be
-    reconstructed exactly.
 
-    :param trace: Operation credentials and tracing information
-    :param app_dict: morPy global dictionary containing app configurations
-    :param task: List-type task, supposedly with UltraDict references.
+    def __init__(self, app_dict: dict, processes_max: int) -> None:
+        r"""
+        :param app_dict: morPy global dictionary containing app configurations
+        :param processes_max: Maximum processes determined at startup.
+        """
 
-    :return task_sanitized: List-type task with substituted UltraDict references.
-    """
+        import psutil
 
-    # Substitute UltraDict references to mitigate RecursionError
-    def substitute(obj):
-        if isinstance(obj, UltraDict):
-            name_val = obj.name
-            return (f"__morPy_shared_ref__::{name_val}",
-                    obj.shared_lock,
-                    obj.auto_unlink,
-                    obj.recurse)
-        elif isinstance(obj, list):
-            return [substitute(item) for item in obj]
-        elif isinstance(obj, tuple):
-            return tuple(substitute(item) for item in obj)
-        elif isinstance(obj, dict):
-            return {substitute(key): substitute(value) for key, value in obj.items()}
-        else:
-            return obj
+        self.processes_max: int = processes_max
+        self.active: int = processes_max
+        self._parked: set = set()
+        self._dispatched: int = 0
+        self._idle_since: float | None = None
+        self._tick: float = time.monotonic()
 
-    task_sanitized = substitute(task)
+        # The CPU utilization is measured in between two readings. Take the first one.
+        psutil.cpu_percent(interval=None)
 
-    return {
-        "task_sanitized": task_sanitized
-    }
+        with app_dict["morpy"]["orchestrator"].lock:
+            app_dict["morpy"]["orchestrator"]["autoscale"] = {"active" : processes_max}
+            app_dict["morpy"]["orchestrator"]["retire"] = 0
 
 
-def reattach_ultradict_refs(task: list | tuple | dict | UltraDict) -> list:
-    r"""
-    Recursively converts placeholder tuples back into UltraDict instances by re‑creating them
-    from their stored configuration, restoring the original task structure for execution.
+    def due(self, app_dict: dict) -> bool:
+        r"""
+        Returns True, if the next decision of the autoscaler is due.
 
-        ("__morPy_shared_ref__::{name}",
-        UltraDict.shared_lock,
-        UltraDict.auto_unlink,
-        UltraDict.recurse)
+        :param app_dict: morPy global dictionary containing app configurations
+        """
 
-    The UltraDict is reattached by calling its constructor with these parameters and create=False.
+        return time.monotonic() - self._tick >= app_dict["morpy"]["conf"]["processes_autoscale_interval"]
 
-    :param task: Task with sanitized UltraDict references.
 
-    :return task_recreated: Task with recreated UltraDict references.
-    """
+    def step(self, trace: dict, app_dict: dict, depth: int=0, dispatched: int=0) -> None:
+        r"""
+        Takes a decision on the processes run at once and applies it. The readings are published in
+        app_dict["morpy"]["orchestrator"]["autoscale"].
 
-    def reattach(obj):
-        placeholder_prefix = "__morPy_shared_ref__::"
-        if (isinstance(obj, tuple) and len(obj) == 4 and
-                isinstance(obj[0], str) and obj[0].startswith(placeholder_prefix)):
-            name_val = obj[0][len(placeholder_prefix):]
-            shared_lock_val = obj[1]
-            auto_unlink_val = obj[2]
-            recurse_val = obj[3]
-            return UltraDict(
-                name=name_val,
-                create=False,
-                shared_lock=shared_lock_val,
-                auto_unlink=auto_unlink_val,
-                recurse=recurse_val
-            )
-        elif isinstance(obj, list):
-            return [reattach(item) for item in obj]
-        elif isinstance(obj, tuple):
-            return tuple(reattach(item) for item in obj)
-        elif isinstance(obj, dict):
-            return {reattach(key): reattach(value) for key, value in obj.items()}
-        else:
-            return obj
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param depth: Tasks pending in the orchestrator, see MorPyOrchestrator._tasks_pending()
+        :param dispatched: Tasks dispatched by the orchestrator since startup.
+        """
 
-    task_recreated = reattach(task)
-    return task_recreated
+        import psutil
+        from math import ceil
 
+        conf = app_dict["morpy"]["conf"]
+        interval: float = conf["processes_autoscale_interval"]
+        now = time.monotonic()
+        elapsed = max(now - self._tick, 1e-6)
 
-@core_wrap
-def run_parallel(trace: dict, app_dict: dict, task: list=None, priority: int=None, task_id: int=None) -> None:
-    r"""
-    Attempts to reserve an available process ID; if successful, updates the task’s trace with that
-    ID and spawns a new process (using SpawnWrapper) to run the task in parallel. If no process is
-    available, the task is re‑queued.
+        cpu_percent: float = psutil.cpu_percent(interval=None)
+        mem_percent: float = psutil.virtual_memory().percent
 
-    :param trace: operation credentials and tracing information
-    :param app_dict: morPy global dictionary containing app configurations
-    :param task: The pulled task list
-    :param priority: Integer representing task priority (lower is higher priority)
-    :param task_id: Value representing the unique, continuing task ID
+        # Processes running, except for the orchestrator, and those of them waiting for a task.
+        with app_dict["morpy"]["proc_busy"].lock:
+            running = len(app_dict["morpy"]["proc_busy"]) - 1
+        with app_dict["morpy"]["proc_waiting"].lock:
+            idle = sum(1 for task, _priority, _task_id in app_dict["morpy"]["proc_waiting"].values() if task is None)
+        working = max(running - idle, 0)
+
+        # Average runtime of a task. If nothing was dispatched, the tasks running take an interval at least.
+        rate = (dispatched - self._dispatched) / elapsed
+        runtime = working / rate if rate > 0 else elapsed
+        drain = depth * runtime / max(working, 1)
+
+        target: int = self.active
+        if mem_percent >= conf["processes_autoscale_mem_max"]:
+            target = self.active - 1
+            self._idle_since = None
+        elif depth > 0 and idle == 0:
+            if drain > interval and cpu_percent < conf["processes_autoscale_cpu_max"]:
+                target = max(self.active + 1, ceil(depth * runtime / interval))
+            self._idle_since = None
+        elif depth == 0 and idle > 0:
+            if self._idle_since is None:
+                self._idle_since = now
+            elif now - self._idle_since >= conf["processes_autoscale_idle"]:
+                target = min(self.active, running) - idle
+                self._idle_since = now
+        else:
+            self._idle_since = None
 
-    TODO make compatible with forking/free-threading
-    """
+        # Keep a worker besides the app process, which may wait on the tasks queued.
+        target = min(max(conf["processes_autoscale_min"], 2, target), self.processes_max)
 
-    shelved: bool = False
+        if target != self.active:
+            # Autoscaler adjusted the processes run at once.
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["MorPyAutoscaler_step"]}\n'
+                        f'{app_dict["loc"]["morpy"]["MorPyAutoscaler_processes"]}: {self.active} -> {target}\n'
+                        f'{app_dict["loc"]["morpy"]["MorPyAutoscaler_readings"]}: {depth=}, {working=}, {idle=}, '
+                        f'runtime={runtime:.3f}s, cpu={cpu_percent:.1f}%, mem={mem_percent:.1f}%')
+            self.active = target
+
+        self._apply(app_dict, idle)
+
+        with app_dict["morpy"]["orchestrator"].lock:
+            app_dict["morpy"]["orchestrator"]["autoscale"] = {
+                "active" : self.active,
+                "running" : running,
+                "idle" : idle,
+                "depth" : depth,
+                "runtime" : runtime,
+                "cpu_percent" : cpu_percent,
+                "mem_percent" : mem_percent,
+            }
+
+        self._dispatched = dispatched
+        self._tick = now
+
+
+    def _apply(self, app_dict: dict, idle: int) -> None:
+        r"""
+        Parks or makes available process IDs until as many are usable as targeted. If not enough IDs
+        are available to be parked, as processes run on them, idle pool workers are asked to retire
+        (see pool_scale_down_due()). Their IDs are parked by a later step.
 
-    # Start preparing task for spawning process.
+        :param app_dict: morPy global dictionary containing app configurations
+        :param idle: Processes waiting for a task
+        """
+
+        parked_target = self.processes_max - self.active
+
+        with app_dict["morpy"]["proc_available"].lock:
+            proc_available = app_dict["morpy"]["proc_available"]
+
+            # Make parked IDs available again, the lowest first.
+            while len(self._parked) > parked_target:
+                process_id = min(self._parked)
+                self._parked.remove(process_id)
+                proc_available[process_id] = None
+
+            # Park the highest IDs available.
+            for process_id in sorted(proc_available.keys(), reverse=True):
+                if len(self._parked) >= parked_target:
+                    break
+                proc_available.pop(process_id)
+                self._parked.add(process_id)
+
+        retire = 0
+        if app_dict["morpy"]["conf"]["processes_pool"]:
+            retire = min(parked_target - len(self._parked), idle)
+
+        with app_dict["morpy"]["orchestrator"].lock:
+            app_dict["morpy"]["orchestrator"]["retire"] = retire
+
+        if retire:
+            notify_processes()
+
+
+class MorPyWakeup:
+    r"""
+    Wakeup primitive shared by the orchestrator and its child processes. It is built on
+    multiprocessing events (OS semaphores), so that idle processes block until the state they are
+    waiting for has changed, instead of polling the shared app_dict. There is one event for the
+    orchestrator, one event per child process, one event per result inbox (see lib.results), one
+    event for the log writer of the orchestrator (see lib.msg) and one event signalling the release
+    of a global interrupt.
+
+    Waiters always wait, clear the event and then re-check the shared state. Notifiers always change
+    the shared state first and notify afterward. That way a notification can not get lost. Waits
+    time out after "processes_wakeup_timeout" (see config.py) as a fallback.
+    """
+
+    __slots__ = [
+        'inbox',
+        'logs',
+        'orchestrator',
+        'processes',
+        'release',
+        'timeout'
+    ]
+
+
+    def __init__(self, processes_max: int, timeout: float, context) -> None:
+        r"""
+        Creates the events for the orchestrator, every process ID, every result inbox, the log writer
+        and the interrupt release.
+
+        :param processes_max: Maximum amount of processes, determining the process IDs.
+        :param timeout: Fallback time in seconds, after which a waiting process re-checks the
+            shared state, even if it was not notified.
+        :param context: Multiprocessing context child processes are started with, see mp_context().
+        """
+
+        self.orchestrator = context.Event()
+        self.processes = {p: context.Event() for p in range(0, processes_max + 1)}
+        self.inbox = {p: context.Event() for p in range(0, processes_max + 1)}
+        self.logs = context.Event()
+        self.release = context.Event()
+        self.release.set()
+        self.timeout = timeout
+
+
+# Wakeup primitive of the current process. Set up by the orchestrator and handed to child
+# processes by lib.spawn.SpawnWrapper. None in single process mode.
+_wakeup: MorPyWakeup | None = None
+
+# Multiprocessing context of the orchestrator, determining the start method of child processes.
+_mp_context = None
+
+# Modules always preloaded by the fork server.
+FORKSERVER_PRELOAD: tuple = ("morPy", "lib.mp", "lib.spawn", "lib.results")
+
+
+@core_wrap
+def mp_context_init(trace: dict, app_dict: dict) -> None:
+    r"""
+    Sets up the multiprocessing context with the start method configured by processes_start_method
+    in config.py. Falls back to the default start method of the platform, if the method configured is
+    not available. The fork server is preloaded with the morPy core and the modules configured by
+    processes_forkserver_preload. Only to be called by the orchestrator in multiprocessing mode.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    global _mp_context
+
+    start_method = app_dict["morpy"]["conf"]["processes_start_method"]
+
+    if start_method is not None and start_method not in get_all_start_methods():
+        # Start method not available on this platform. Falling back to the default.
+        log(trace, app_dict, "warning",
+            lambda: f'{app_dict["loc"]["morpy"]["mp_context_init_invalid"]}\n'
+                    f'{app_dict["loc"]["morpy"]["mp_context_init_method"]}: {start_method}')
+        start_method = None
+
+    _mp_context = get_context(start_method)
+
+    if _mp_context.get_start_method() == "forkserver":
+        _mp_context.set_forkserver_preload(
+            list(FORKSERVER_PRELOAD) + list(app_dict["morpy"]["conf"]["processes_forkserver_preload"])
+        )
+
+    # Start method of child processes determined.
+    log(trace, app_dict, "debug",
+        lambda: f'{app_dict["loc"]["morpy"]["mp_context_init_done"]}\n'
+                f'{app_dict["loc"]["morpy"]["mp_context_init_method"]}: {_mp_context.get_start_method()}')
+
+
+def mp_context():
+    r"""
+    Returns the multiprocessing context child processes are started with.
+
+    :return: Multiprocessing context
+    """
+
+    return _mp_context if _mp_context else get_context()
+
+
+def wakeup_init(app_dict: dict) -> None:
+    r"""
+    Creates the wakeup primitive of the orchestrator. Only to be called by the orchestrator in
+    multiprocessing mode.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    global _wakeup
+    _wakeup = MorPyWakeup(app_dict["morpy"]["processes_max"],
+                          app_dict["morpy"]["conf"]["processes_wakeup_timeout"],
+                          mp_context())
+
+
+def wakeup_attach(wakeup: MorPyWakeup | None) -> None:
+    r"""
+    Attaches a child process to the wakeup primitive created by the orchestrator.
+
+    :param wakeup: Wakeup primitive handed over by the parent process.
+    """
+
+    global _wakeup
+    _wakeup = wakeup
+
+
+def wakeup_ref() -> MorPyWakeup | None:
+    r"""
+    Returns the wakeup primitive of the current process to be handed over to a child process.
+
+    :return: MorPyWakeup instance or None in single process mode.
+    """
+
+    return _wakeup
+
+
+def notify_orchestrator() -> None:
+    r"""
+    Wakes up the orchestrator, i.e. after a task was shelved or a process became available.
+    """
+
+    if _wakeup:
+        _wakeup.orchestrator.set()
+
+
+def notify_process(process_id: int) -> None:
+    r"""
+    Wakes up a single child process, i.e. after a task was shelved to it in proc_waiting.
+
+    :param process_id: morPy process ID to wake up.
+    """
+
+    if _wakeup:
+        event = _wakeup.processes.get(process_id, None)
+        if event:
+            event.set()
+
+
+def notify_inbox(process_id: int) -> None:
+    r"""
+    Wakes up a process waiting for results in its inbox (see lib.results).
+
+    :param process_id: morPy process ID owning the inbox.
+    """
+
+    if _wakeup:
+        event = _wakeup.inbox.get(process_id, None)
+        if event:
+            event.set()
+
+
+def notify_log_writer() -> None:
+    r"""
+    Wakes up the log writer of the orchestrator, i.e. after a log record was pushed to the log ring
+    buffer.
+    """
+
+    if _wakeup:
+        _wakeup.logs.set()
+
+
+def notify_processes() -> None:
+    r"""
+    Wakes up all child processes, i.e. after all processes were joined.
+    """
+
+    if _wakeup:
+        for event in _wakeup.processes.values():
+            event.set()
+
+
+def notify_exit() -> None:
+    r"""
+    Wakes up every waiting process after the global exit flag was set, including processes
+    waiting for the release of a global interrupt.
+    """
+
+    if _wakeup:
+        notify_processes()
+        _wakeup.orchestrator.set()
+        _wakeup.release.set()
+
+
+def interrupt_hold() -> None:
+    r"""
+    Makes processes block in wait_release() until interrupt_release() is called. Call this
+    before the global interrupt flag is set.
+    """
+
+    if _wakeup:
+        _wakeup.release.clear()
+
+
+def interrupt_release() -> None:
+    r"""
+    Wakes up all processes waiting for a global interrupt to be released. Call this after the
+    global interrupt flag was reset.
+    """
+
+    if _wakeup:
+        _wakeup.release.set()
+
+
+def wait_orchestrator(timeout: float=None) -> None:
+    r"""
+    Blocks the orchestrator until it is notified or the timeout expired. The shared state has to be
+    re-checked afterward.
+
+    :param timeout: Time in seconds to wait at most. If None, "processes_wakeup_timeout" applies.
+    """
+
+    if _wakeup:
+        _wakeup.orchestrator.wait(_wakeup.timeout if timeout is None else timeout)
+        _wakeup.orchestrator.clear()
+    else:
+        time.sleep(0.05)    # 0.05 seconds = 50 milliseconds
+
+
+def wait_process(process_id: int) -> None:
+    r"""
+    Blocks a child process until it is notified or the fallback timeout expired. The shared state
+    has to be re-checked afterward.
+
+    :param process_id: morPy process ID of the waiting process.
+    """
+
+    event = _wakeup.processes.get(process_id, None) if _wakeup else None
+    if event:
+        event.wait(_wakeup.timeout)
+        event.clear()
+    else:
+        time.sleep(0.05)    # 0.05 seconds = 50 milliseconds
+
+
+def wait_inbox(process_id: int) -> None:
+    r"""
+    Blocks a process until a result arrives in its inbox or the fallback timeout expired. The inbox
+    has to be re-checked afterward.
+
+    :param process_id: morPy process ID owning the inbox.
+    """
+
+    event = _wakeup.inbox.get(process_id, None) if _wakeup else None
+    if event:
+        event.wait(_wakeup.timeout)
+        event.clear()
+    else:
+        time.sleep(0.05)    # 0.05 seconds = 50 milliseconds
+
+
+def wait_log_writer() -> None:
+    r"""
+    Blocks the log writer of the orchestrator until it is notified or the fallback timeout expired.
+    The log ring buffer has to be re-checked afterward.
+    """
+
+    if _wakeup:
+        _wakeup.logs.wait(_wakeup.timeout)
+        _wakeup.logs.clear()
+    else:
+        time.sleep(0.05)    # 0.05 seconds = 50 milliseconds
+
+
+def wait_release() -> None:
+    r"""
+    Blocks the calling process while a global interrupt is held or until the fallback timeout
+    expired. The interrupt flag has to be re-checked afterward.
+    """
+
+    # The release event is also set on exit, while the interrupt flag may still be set. Fall
+    # back to polling in that case to avoid a busy wait.
+    if _wakeup and not _wakeup.release.is_set():
+        _wakeup.release.wait(_wakeup.timeout)
+    else:
+        time.sleep(0.05)    # 0.05 seconds = 50 milliseconds
+
+
+@core_wrap
+def app_run(trace: dict, app_dict: dict) -> None:
+    r"""
+    Coordinates the sequential execution of the three main phases: app initialization, main run,
+    and exit. In multiprocessing mode, the tasks are enqueued and managed by the orchestrator;
+    in single‑process mode, they are executed directly.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    from app.init import init
+    from app.run import run
+    from app.exit import finalize
+
+    # Guarded tasks the app process takes on are neither terminated nor retried, see task_guard_start().
+    global _app_process
+    _app_process = True
+
+    # --- APP INITIALIZATION --- #
+
+    # Reset "delayed join" condition pre initialization.
+    with conditional_lock(app_dict["morpy"]["orchestrator"]):
+        app_dict["morpy"]["orchestrator"]["delayed_join"] = False
+
+    # App initializing.
+    log(trace, app_dict, "info",
+        lambda: f'{app_dict["loc"]["morpy"]["app_run_init"]}')
+
+    # Execute
+    app_dict_n_shared = init(trace, app_dict)["app_dict_n_shared"]
+
+    # Join all spawned processes before transitioning into the next phase.
+    join_or_task(trace, app_dict, reset_trace=True, reset_w_prefix=f'{trace["module"]}.{trace["operation"]}')
+
+    # Set the "initialization complete" flag
+    # TODO Up until this point prints to console are mirrored on splash screen
+    core_store(app_dict, "init_complete", True)
+
+    # Un-join
+    core_store(app_dict, "proc_joined", False)
+
+    # --- APP RUN --- #
+
+    with conditional_lock(app_dict["morpy"]):
+        app_dict["morpy"]["app_phase"] = "run"
+
+    # App starting.
+    log(trace, app_dict, "info",
+        lambda: f'{app_dict["loc"]["morpy"]["app_run_start"]}')
+
+    app_dict_n_shared = run(trace, app_dict, app_dict_n_shared)["app_dict_n_shared"]
+
+    # Join all spawned processes before transitioning into the next phase.
+    join_or_task(trace, app_dict, reset_trace=True, reset_w_prefix=f'{trace["module"]}.{trace["operation"]}')
+
+    # Un-join
+    core_store(app_dict, "proc_joined", False)
+
+    # --- APP EXIT --- #
+
+    with conditional_lock(app_dict["morpy"]):
+        app_dict["morpy"]["app_phase"] = "exit"
+
+    # App exiting.
+    log(trace, app_dict, "info",
+        lambda: f'{app_dict["loc"]["morpy"]["app_run_exit"]}')
+
+    # Exit the app and signal morPy to terminate
+    finalize(trace, app_dict, app_dict_n_shared)
+
+    # Join all spawned processes before transitioning into the next phase.
+    join_or_task(trace, app_dict, reset_trace=True, reset_w_prefix=f'{trace["module"]}.{trace["operation"]}')
+
+    # Signal morPy orchestrator of app termination
+    core_store(app_dict, "exit", True)
+    notify_exit()
+
+
+@core_wrap
+def heap_shelve(trace: dict, app_dict: dict, priority: int=100, task: Callable | list | tuple=None,
+                    autocorrect: bool=True, is_process: bool=True, force: bool = False, task_id: int=None,
+                    guard: dict=None) -> dict:
+    r"""
+    Queues a new task into the shared memory shelf for later execution. The task may be provided in
+    multiple formats; it is normalized into a list, sanitized by substituting UltraDict references,
+    and then stored along with its priority and an incremented task ID. If the caller is not the
+    master process (or if forced), the task is queued; otherwise, it is executed immediately.
+
+    :param trace: Operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param priority: Integer representing task priority (lower is higher priority)
+    :param task: Callable, list or tuple packing the task. Formats:
+        callable: partial(func, *args, **kwargs)
+        list: [func, *args, {"kwarg1": val1, "kwarg2": val2, ...}]
+        tuple: (func, *args, {"kwarg1": val1, "kwarg2": val2, ...})
+    :param autocorrect: If False, priority can be smaller than zero. Priority
+        smaller zero is reserved for the morPy Core.
+    :param is_process: If True, task is run in a new process (not by morPy orchestrator)
+    :param force: If True, enforces queueing instead of direct execution. Used by morPy
+        orchestrator to spawn the first app process.
+    :param task_id: Value representing a task ID. Here it is only used to recover and re-shelve a task.
+    :param guard: Timeout and retries of the task, see task_guard(). Ignored, if the task is executed
+        directly.
+
+    :return: dict
+        task_id: ID assigned to the shelved task. None, if the task was executed directly or skipped.
+            With the thread backend, the task is handed to the thread pool instead.
+
+    :example:
+        from lib.mp import heap_shelve
+        task = [my_func, trace, app_dict]
+        task_id = heap_shelve(trace, app_dict, priority=25, task=task)["task_id"]
+    """
+
+    next_task_id: int | None = None
+
+    # Check for Interrupt / exit
+    stop_while_interrupt(trace, app_dict)
+
+    if task:
+        # Transform task to a list, if possible
+        task = normalize_task(task)
+        proc_master = app_dict["morpy"]["proc_master"]
+
+        # Skip queuing, if in single core mode
+        if not (trace["process_id"] == proc_master) or force:
+            # Signal delayed join, to omit race condition.
+            with app_dict["morpy"]["orchestrator"].lock:
+                app_dict["morpy"]["orchestrator"]["delayed_join"] = True
+
+            # Substitute UltraDict references in task to avoid recursion issues. Guarded tasks may be
+            # run again, hence their buffers are not moved to shared memory.
+            task_sanitized = substitute_ultradict_refs(trace, app_dict, task,
+                                                       zero_copy=not guard)["task_sanitized"]
+
+            # Check and autocorrect process priority
+            if priority < 0 and autocorrect:
+                # Invalid argument given to process queue. Autocorrected.
+                log(trace, app_dict, "debug",
+                    lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_prio_corr"]}\n'
+                            f'{app_dict["loc"]["morpy"]["heap_shelve_priority"]}: {priority} to 0')
+                priority = 0
+
+            # Pushing task to priority queue.
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_start"]}\n'
+                        f'{app_dict["loc"]["morpy"]["heap_shelve_priority"]}: {priority}')
+
+            # Reserve a new task ID, unless a task is re-shelved.
+            if task_id is None:
+                next_task_id = core_add(app_dict, "tasks_created", 1)
+            else:
+                next_task_id = task_id
+            task_sys_id = id(task)
+
+            # Push task to the ring buffer or the heap shelf
+            task_qed = (priority, next_task_id, task_sys_id, task_sanitized, is_process)
+            if guard:
+                task_guard_register(app_dict, guard, [task_qed])
+            heap_ring_push(app_dict, task_qed)
+
+            # Wake up the orchestrator, unless it shelved the task itself.
+            if trace["process_id"] != proc_master:
+                notify_orchestrator()
+
+        # If run by morPy orchestrator or in single core mode, execute without queueing.
+        else:
+            from lib.threads import thread_pool
+            pool = thread_pool()
+
+            # Hand the task to the thread backend
+            if pool:
+                next_task_id = pool.submit(trace, app_dict, task=task, priority=priority)["task_id"]
+            else:
+                from lib.aio import run_task
+                run_task(trace, app_dict, task_to_partial(task))
+
+    else:
+        # Task can not be None. Skipping enqueue.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_none"]}')
+
+    return {
+        "task_id" : next_task_id
+    }
+
+
+@core_wrap
+def heap_shelve_batch(trace: dict, app_dict: dict, priority: int=100, tasks: list | tuple=None,
+                      autocorrect: bool=True, is_process: bool=True, force: bool = False,
+                      guard: dict=None) -> None:
+    r"""
+    Queues a batch of tasks at once for later execution, all with the same priority. Works like
+    heap_shelve(), but the interrupt check, the sanitization of UltraDict references and the
+    priority check are done once for the whole batch. A contiguous range of task IDs is reserved
+    in a single locked section.
+
+    :param trace: Operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param priority: Integer representing task priority (lower is higher priority)
+    :param tasks: List or tuple of tasks. Every task may be a callable, list or tuple as described
+        for heap_shelve().
+    :param autocorrect: If False, priority can be smaller than zero. Priority
+        smaller zero is reserved for the morPy Core.
+    :param is_process: If True, tasks are run in a new process (not by morPy orchestrator)
+    :param force: If True, enforces queueing instead of direct execution.
+    :param guard: Timeout and retries applying to every task, see task_guard(). Ignored, if the tasks
+        are executed directly.
+
+    :example:
+        from lib.mp import heap_shelve_batch
+        tasks = [[my_func, trace, app_dict, {"item": item}] for item in items]
+        heap_shelve_batch(trace, app_dict, priority=25, tasks=tasks)
+    """
+
+    # Check for Interrupt / exit
+    stop_while_interrupt(trace, app_dict)
+
+    # Drop empty tasks and transform tasks to lists, if possible
+    tasks = [normalize_task(task) for task in tasks if task] if tasks else []
+
+    if tasks:
+        proc_master = app_dict["morpy"]["proc_master"]
+
+        # Skip queuing, if in single core mode
+        if not (trace["process_id"] == proc_master) or force:
+            # Signal delayed join, to omit race condition.
+            with app_dict["morpy"]["orchestrator"].lock:
+                app_dict["morpy"]["orchestrator"]["delayed_join"] = True
+
+            # Substitute UltraDict references in all tasks to avoid recursion issues.
+            tasks_sanitized = substitute_ultradict_refs(trace, app_dict, tasks, batch=True,
+                                                        zero_copy=not guard)["task_sanitized"]
+
+            # Check and autocorrect process priority
+            if priority < 0 and autocorrect:
+                # Invalid argument given to process queue. Autocorrected.
+                log(trace, app_dict, "debug",
+                    lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_prio_corr"]}\n'
+                            f'{app_dict["loc"]["morpy"]["heap_shelve_priority"]}: {priority} to 0')
+                priority = 0
+
+            # Pushing tasks to heap.
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_batch_start"]}\n'
+                        f'{app_dict["loc"]["morpy"]["heap_shelve_batch_cnt"]}: {len(tasks)}\n'
+                        f'{app_dict["loc"]["morpy"]["heap_shelve_priority"]}: {priority}')
+
+            # Reserve a contiguous range of task IDs
+            first_task_id = core_add(app_dict, "tasks_created", len(tasks)) - len(tasks) + 1
+
+            tasks_qed = [
+                (priority, first_task_id + n, id(task), task_sanitized, is_process)
+                for n, (task, task_sanitized) in enumerate(zip(tasks, tasks_sanitized))
+            ]
+
+            # Push tasks to the ring buffer or the heap shelf
+            if guard:
+                task_guard_register(app_dict, guard, tasks_qed)
+            heap_ring_push_batch(app_dict, tasks_qed)
+
+            # Wake up the orchestrator, unless it shelved the tasks itself.
+            if trace["process_id"] != proc_master:
+                notify_orchestrator()
+
+        # If run by morPy orchestrator or in single core mode, execute without queueing.
+        else:
+            from lib.threads import thread_pool
+            pool = thread_pool()
+
+            for task in tasks:
+                # Hand the task to the thread backend
+                if pool:
+                    pool.submit(trace, app_dict, task=task, priority=priority)
+                else:
+                    from lib.aio import run_task
+                    run_task(trace, app_dict, task_to_partial(task))
+
+    else:
+        # No tasks given. Skipping enqueue.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["heap_shelve_batch_none"]}')
+
+
+# Suppress linting for mandatory arguments.
+# noinspection PyUnusedLocal
+@core_wrap
+def queue_depth(trace: dict, app_dict: dict) -> dict:
+    r"""
+    Counts the tasks waiting to be handed to a process: those in the heap of the orchestrator, as
+    published by the orchestrator, and those shelved, but not pulled by the orchestrator yet. Tasks
+    queued to busy processes (see deque_push()) are not counted, as they are taken on already.
+
+    :param trace: Operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: dict
+        queue_depth: Number of tasks waiting. Always 0 in single process mode and with the thread backend.
+        queue_max: High-water mark of the process queue (see "processes_queue_max" in config.py)
+
+    :example:
+        from lib.mp import queue_depth
+        depth = queue_depth(trace, app_dict)["queue_depth"]
+    """
+
+    # There is no process queue in single process mode and with the thread backend.
+    if app_dict["morpy"]["processes_max"] <= 1:
+        return {
+            "queue_depth" : 0,
+            "queue_max" : app_dict["morpy"]["conf"]["processes_queue_max"],
+        }
+
+    with app_dict["morpy"]["orchestrator"].lock:
+        depth = app_dict["morpy"]["orchestrator"]["queue_depth"]
+
+    ring = heap_ring(app_dict)
+    if ring:
+        depth += ring.pending()
+
+    with app_dict["morpy"]["heap_shelf"].lock:
+        depth += len(app_dict["morpy"]["heap_shelf"].keys())
+
+    return {
+        "queue_depth" : depth,
+        "queue_max" : app_dict["morpy"]["conf"]["processes_queue_max"],
+    }
+
+
+def queue_throttle(trace: dict, app_dict: dict, tasks: int=1) -> None:
+    r"""
+    Applies backpressure to a child process about to enqueue tasks. While the process queue holds
+    "processes_queue_max" tasks or more (see queue_depth()), the process runs queued tasks itself or
+    waits for the orchestrator to take them on. A batch larger than the high-water mark passes, once
+    the process queue is empty. Nothing is held back in single process mode, with the thread backend
+    or in the orchestrator. Applied by morPy.process_q() and morPy.process_q_many() only, so that the
+    morPy core can always queue its tasks, i.e. logs.
+
+    Not wrapped by core_wrap, so that queue.Full reaches the caller.
+
+    :param trace: Operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param tasks: Number of tasks about to be enqueued
+
+    :raises queue.Full: The process queue did not drop below the high-water mark within
+        "processes_queue_timeout" seconds.
+
+    :example:
+        from lib.mp import queue_throttle
+        queue_throttle(trace, app_dict, tasks=len(tasks))
+        heap_shelve_batch(trace, app_dict, tasks=tasks)
+    """
+
+    queue_max: int | None = app_dict["morpy"]["conf"]["processes_queue_max"]
+    my_pid: int = trace["process_id"]
+
+    if not queue_max or my_pid == app_dict["morpy"]["proc_master"]:
+        return
+
+    timeout: float | None = app_dict["morpy"]["conf"]["processes_queue_timeout"]
+    deadline: float | None = None if timeout is None else time.monotonic() + timeout
+    held_back: bool = False
+
+    # Within a running event loop (see process_q_async()), a task claimed could not be completed until
+    # the coroutine waiting here is done. Only wait then.
+    import asyncio
+    try:
+        asyncio.get_running_loop()
+        claim: bool = False
+    except RuntimeError:
+        claim: bool = True
+
+    while True:
+        depth = queue_depth(trace, app_dict)["queue_depth"]
+        if depth == 0 or depth + tasks <= queue_max:
+            break
+
+        # Give up on the high-water mark at exit, the tasks will not be run anyway.
+        if core_load(app_dict, "exit"):
+            break
+
+        if deadline is not None and time.monotonic() >= deadline:
+            if held_back:
+                queue_release(trace, app_dict)
+            import queue
+            raise queue.Full(f'{app_dict["loc"]["morpy"]["queue_throttle_full"]}\n'
+                             f'{app_dict["loc"]["morpy"]["queue_throttle_depth"]}: {depth}/{queue_max}')
+
+        if not held_back:
+            # Process queue is full. Running queued tasks until it dropped below the high-water mark.
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["queue_throttle_start"]}\n'
+                        f'{app_dict["loc"]["morpy"]["queue_throttle_depth"]}: {depth}/{queue_max}')
+            held_back = True
+
+            # Be notified by the orchestrator, once the queue depth drops.
+            with app_dict["morpy"]["orchestrator"].lock:
+                app_dict["morpy"]["orchestrator"]["queue_held"] = (
+                    app_dict["morpy"]["orchestrator"]["queue_held"] + [my_pid])
+
+        # Take on a queued task rather than idling, as all processes may be held back.
+        task_claimed = claim_task(trace, app_dict) if claim else False
+
+        # Complete the async tasks done in the meantime.
+        from lib.aio import collect
+        collect(trace, app_dict)
+
+        if task_claimed:
+            continue
+
+        if claim:
+            subscribe_waiting(trace, app_dict)
+        wait_process(my_pid)
+
+    # Stop waiting for tasks, the process enqueues its own.
+    if held_back:
+        queue_release(trace, app_dict)
+
+
+def queue_release(trace: dict, app_dict: dict) -> None:
+    r"""
+    Ends the backpressure applied to the calling process by queue_throttle(). The process stops waiting
+    for tasks and is no longer notified of a dropping queue depth.
+
+    :param trace: Operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    my_pid: int = trace["process_id"]
+
+    with app_dict["morpy"]["orchestrator"].lock:
+        app_dict["morpy"]["orchestrator"]["queue_held"] = [
+            process_id for process_id in app_dict["morpy"]["orchestrator"]["queue_held"] if process_id != my_pid]
+
+    unsubscribe_waiting(trace, app_dict)
+
+
+# True within the process running the app, see app_run().
+_app_process: bool = False
+
+
+def task_guard(app_dict: dict, timeout: float=None, max_retries: int=None, backoff: float=None,
+               reply: tuple=None) -> dict | None:
+    r"""
+    Resolves the timeout and retries of a task queued by morPy.process_q() or morPy.process_q_many().
+    Arguments not given fall back to "processes_task_timeout", "processes_task_retries" and
+    "processes_task_backoff" in config.py.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param timeout: Time in seconds a child process may run the task, before it is terminated.
+    :param max_retries: Retries of the task, if it timed out or its process terminated unexpectedly.
+    :param backoff: Delay in seconds before the first retry, doubling with every further retry.
+    :param reply: Process ID and reply key of the future of the task, see lib.results.submit(). A task
+        failing for good is replied to with an exception.
+
+    :return: Guard to be handed to heap_shelve() or None, if the task is neither timed nor retried.
+    """
+
+    conf = app_dict["morpy"]["conf"]
+    timeout = conf["processes_task_timeout"] if timeout is None else timeout
+    max_retries = conf["processes_task_retries"] if max_retries is None else max_retries
+
+    if not timeout and not max_retries:
+        return None
+
+    return {
+        "timeout" : timeout or None,
+        "retries" : max_retries or 0,
+        "backoff" : conf["processes_task_backoff"] if backoff is None else backoff,
+        "reply" : reply,
+    }
+
+
+def task_guard_register(app_dict: dict, guard: dict, tasks_qed: list) -> None:
+    r"""
+    Registers tasks about to be queued in app_dict["morpy"]["tasks_guarded"], so the orchestrator
+    enforces their timeout and retries (see tasks_watchdog()). The sanitized task is kept until it is
+    done, in order to queue it again. A task re-shelved keeps its registration.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param guard: Timeout and retries of the tasks, see task_guard()
+    :param tasks_qed: Tasks as pushed to the ring buffer, see heap_ring_push_batch().
+    """
+
+    tasks_guarded = app_dict["morpy"]["tasks_guarded"]
+
+    with tasks_guarded.lock:
+        for priority, task_id, _task_sys_id, task_sanitized, is_process in tasks_qed:
+            # Tasks run by the orchestrator can not be terminated.
+            if is_process and task_id not in tasks_guarded:
+                tasks_guarded[task_id] = {
+                    **guard,
+                    "task" : task_sanitized,
+                    "priority" : priority,
+                    "attempt" : 0,
+                    "process_id" : None,
+                    "deadline" : None,
+                    "due" : None,
+                }
+
+
+def task_guard_start(trace: dict, app_dict: dict) -> bool:
+    r"""
+    Marks a guarded task as run by the calling process and starts its timeout. To be called right
+    before a child process runs a task. Async tasks are only timed until they are scheduled. The app
+    process runs tasks unguarded while it waits for a join, as terminating it would end the app.
+
+    :param trace: Operation credentials and tracing information of the task
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: True, if the task is guarded. task_guard_end() is to be called, once it is done.
+    """
+
+    tasks_guarded = app_dict["morpy"]["tasks_guarded"]
+    task_id = trace.get("task_id", None)
+
+    with tasks_guarded.lock:
+        if _app_process:
+            tasks_guarded.pop(task_id, None)
+            return False
+
+        entry = tasks_guarded.get(task_id, None)
+        if entry is None:
+            return False
+
+        entry["process_id"] = trace["process_id"]
+        entry["deadline"] = time.time() + entry["timeout"] if entry["timeout"] else None
+        tasks_guarded[task_id] = entry
+
+    return True
+
+
+def task_guard_end(trace: dict, app_dict: dict) -> None:
+    r"""
+    Removes a guarded task from app_dict["morpy"]["tasks_guarded"], once it is done. Exceptions raised
+    by the task are not retried.
+
+    :param trace: Operation credentials and tracing information of the task
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    with app_dict["morpy"]["tasks_guarded"].lock:
+        app_dict["morpy"]["tasks_guarded"].pop(trace["task_id"], None)
+
+
+@core_wrap
+def task_guard_lost(trace: dict, app_dict: dict, process_id: int=None, timed_out: bool=False) -> dict:
+    r"""
+    Handles the guarded tasks run by a process, which was terminated. A task is marked as due for a retry
+    after its backoff delay and queued again by tasks_watchdog(). Once its retries are used up, the task
+    fails and its future, if any, raises TimeoutError or ChildProcessError.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param process_id: morPy process ID of the process terminated
+    :param timed_out: If True, the process was terminated due to the timeout of the task.
+
+    :return: dict
+        guarded: True, if the process ran a guarded task.
+    """
+
+    tasks_guarded = app_dict["morpy"]["tasks_guarded"]
+    tasks_retried: list = []
+    tasks_failed: list = []
+
+    with tasks_guarded.lock:
+        for task_id, entry in list(tasks_guarded.items()):
+            if entry["process_id"] != process_id:
+                continue
+
+            if entry["attempt"] < entry["retries"]:
+                entry["attempt"] += 1
+                entry["due"] = time.time() + entry["backoff"] * 2 ** (entry["attempt"] - 1)
+                entry["process_id"] = None
+                entry["deadline"] = None
+                tasks_guarded[task_id] = entry
+                tasks_retried.append((task_id, entry))
+            else:
+                tasks_guarded.pop(task_id)
+                tasks_failed.append((task_id, entry))
+
+    for task_id, entry in tasks_retried:
+        # A task was lost with its process. Retrying.
+        log(trace, app_dict, "warning",
+            lambda: f'{app_dict["loc"]["morpy"]["task_guard_lost_retry"]}\n'
+                    f'{app_dict["loc"]["morpy"]["task_guard_lost_task"]}: {task_id}\n'
+                    f'{app_dict["loc"]["morpy"]["task_guard_lost_attempt"]}: {entry["attempt"]}/{entry["retries"]}\n'
+                    f'{app_dict["loc"]["morpy"]["task_guard_lost_timeout"]}: {timed_out}')
+
+    for task_id, entry in tasks_failed:
+        # A task was lost with its process and no retries are left. With a future, the caller is
+        # informed by the exception raised.
+        log(trace, app_dict, "warning" if entry["reply"] else "error",
+            lambda: f'{app_dict["loc"]["morpy"]["task_guard_lost_failed"]}\n'
+                    f'{app_dict["loc"]["morpy"]["task_guard_lost_task"]}: {task_id}\n'
+                    f'{app_dict["loc"]["morpy"]["task_guard_lost_attempt"]}: {entry["attempt"]}/{entry["retries"]}\n'
+                    f'{app_dict["loc"]["morpy"]["task_guard_lost_timeout"]}: {timed_out}')
+
+        from lib.store import lock_key
+        with lock_key(app_dict["morpy"]["tasks_cancelled"], task_id):
+            app_dict["morpy"]["tasks_cancelled"].pop(task_id, None)
+
+        # Let the future of the task raise instead of waiting forever.
+        if entry["reply"]:
+            from lib.results import reply_send
+            if timed_out:
+                error = TimeoutError(f'{app_dict["loc"]["morpy"]["task_guard_lost_timeout_err"]}: '
+                                     f'{entry["timeout"]} s')
+            else:
+                error = ChildProcessError(f'{app_dict["loc"]["morpy"]["task_guard_lost_process_err"]}: '
+                                          f'{process_id}')
+            reply_pid, reply_key = entry["reply"]
+            reply_send(app_dict, reply_pid, reply_key, False, error)
+
+    return {
+        "guarded" : len(tasks_retried) + len(tasks_failed) > 0
+    }
+
+
+@core_wrap
+def tasks_watchdog(trace: dict, app_dict: dict) -> None:
+    r"""
+    Enforces the timeouts and retries of guarded tasks (see task_guard()). Processes running a task
+    beyond its timeout are terminated. Guarded tasks of terminated processes are handed to
+    task_guard_lost() and the process IDs are released, so the orchestrator spawns processes anew.
+    Tasks due for a retry are queued again with their task ID. Run by the orchestrator.
+
+    A process is terminated at an arbitrary point. Shared locks it held are released by
+    locks_recover() and positions of the ring buffers it claimed, but did not publish, are skipped by
+    rings_recover(). Not recovered are a lock the process acquired, but did not sign with its PID yet,
+    and an UltraDict update it was in the middle of writing. Tasks that must not leave shared state
+    behind half-way should not be given a timeout.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    tasks_guarded = app_dict["morpy"]["tasks_guarded"]
+    child_processes: dict = {}
+    proc_names: dict = {}
+    proc_timed_out: dict = {}
+    proc_lost: set = set()
+    tasks_due: list = []
+    now = time.time()
+
+    with tasks_guarded.lock:
+        processes_running = {entry["process_id"] for entry in tasks_guarded.values() if entry["process_id"]}
+        if processes_running:
+            child_processes = {child.name : child for child in active_children()}
+            with app_dict["morpy"]["proc_busy"].lock:
+                proc_busy = app_dict["morpy"]["proc_busy"]
+                proc_names = {process_id : proc_busy.get(process_id, None) for process_id in processes_running}
+
+        for task_id, entry in tasks_guarded.items():
+            if entry["process_id"]:
+                child = child_processes.get(proc_names[entry["process_id"]], None)
+                if child is None:
+                    proc_lost.add(entry["process_id"])
+                # Terminate while holding the lock, so the task can not be done meanwhile.
+                elif entry["deadline"] is not None and entry["deadline"] < now:
+                    # A task timed out. Terminating its process.
+                    log(trace, app_dict, "warning",
+                        lambda: f'{app_dict["loc"]["morpy"]["tasks_watchdog_timeout"]}\n'
+                                f'{app_dict["loc"]["morpy"]["task_guard_lost_task"]}: {task_id}\n'
+                                f'{app_dict["loc"]["morpy"]["tasks_watchdog_process"]}: {entry["process_id"]}')
+                    child.terminate()
+                    proc_timed_out[entry["process_id"]] = child
+            elif entry["due"] is not None and entry["due"] <= now:
+                tasks_due.append((task_id, entry))
+
+    for child in proc_timed_out.values():
+        child.join(timeout=1.0)
+
+    # A process terminated may have held shared locks or claimed slots of a ring buffer it never
+    # published. Both would block the other processes forever.
+    for child in proc_timed_out.values():
+        if child.exitcode is not None:
+            locks_recover(trace, app_dict, pid=child.pid)
+    if proc_timed_out or proc_lost:
+        rings_recover(trace, app_dict)
+
+    for process_id in proc_timed_out.keys():
+        task_guard_lost(trace, app_dict, process_id=process_id, timed_out=True)
+    for process_id in proc_lost:
+        task_guard_lost(trace, app_dict, process_id=process_id)
+
+    if proc_timed_out or proc_lost:
+        process_refs_release(trace, app_dict, processes=proc_lost | set(proc_timed_out.keys()))
+
+    # Queue the tasks due for a retry again.
+    for task_id, entry in tasks_due:
+        with tasks_guarded.lock:
+            if task_id not in tasks_guarded:
+                continue
+            entry["due"] = None
+            tasks_guarded[task_id] = entry
+
+        heap_shelve(trace, app_dict, priority=entry["priority"], task=entry["task"], force=True,
+                    task_id=task_id)
+
+
+def locks_recover(trace: dict, app_dict: dict, pid: int) -> int:
+    r"""
+    Releases the shared locks of app_dict still held by a terminated process, including the locks of
+    nested dictionaries and of the shards of a ShardedDict. Only to be called once the process is gone.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param pid: Process ID of the operating system of the terminated process.
+
+    :return: Number of locks released
+    """
+
+    from lib.store import ShardedDict
+
+    released = 0
+    visited: set = set()
+    stack: list = [app_dict]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in visited:
+            continue
+        visited.add(id(obj))
+
+        if isinstance(obj, ShardedDict):
+            stack.extend(obj.shards)
+            continue
+
+        lock = getattr(obj, "lock", None)
+        if (hasattr(lock, "steal") and not lock.has_lock and lock.get_remote_lock()
+                and lock.get_remote_pid() == pid):
+            if lock.steal(from_pid=pid, release=True):
+                released += 1
+
+        stack.extend(value for value in obj.values() if isinstance(value, (dict, ShardedDict)))
+
+    if released:
+        # Shared locks of a terminated process released.
+        log(trace, app_dict, "warning",
+            lambda: f'{app_dict["loc"]["morpy"]["locks_recover_released"]}\n'
+                    f'{app_dict["loc"]["morpy"]["locks_recover_pid"]}: {pid}\n'
+                    f'{app_dict["loc"]["morpy"]["locks_recover_count"]}: {released}')
+
+    return released
+
+
+def rings_recover(trace: dict, app_dict: dict) -> int:
+    r"""
+    Skips the positions of the task ring buffer, the log ring buffer and the result inboxes, that were
+    claimed by a terminated process, but never published (see SharedRingBuffer.skip_abandoned()). Only
+    to be called by the orchestrator once the process is gone.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: Number of positions skipped
+    """
+
+    from lib.results import inbox
+
+    rings = [heap_ring(app_dict), log_ring(app_dict)]
+    rings.extend(inbox(app_dict, process_id) for process_id in app_dict["morpy"].get("inbox_rings", {}))
+
+    skipped = sum(ring.skip_abandoned() for ring in rings if ring)
+
+    if skipped:
+        # Ring buffer positions abandoned by a terminated process skipped.
+        log(trace, app_dict, "warning",
+            lambda: f'{app_dict["loc"]["morpy"]["rings_recover_skipped"]}\n'
+                    f'{app_dict["loc"]["morpy"]["rings_recover_count"]}: {skipped}')
+
+    return skipped
+
+
+class MorPyTaskArgs:
+    r"""
+    Arguments of a task encoded by the process queuing it, see substitute_ultradict_refs(). All
+    arguments following app_dict are pickled once with protocol 5 into a single bytes object, which the
+    transports (ring buffer, heap shelf, process deques) pass on as it is. The nested arguments are
+    neither walked nor pickled again on their way to the child process.
+
+    While pickling, UltraDict instances and buffers moved to shared memory are reduced to calls of
+    ultradict_attach() and lib.shm.shared_buffer_attach(). These are the only positions the receiving
+    process patches while unpickling. Buffers supporting pickle protocol 5 out-of-band (i.e. numpy
+    arrays) of at least "processes_zero_copy_min" bytes (see config.py) are handed over in
+    shared memory without being copied into the pickle.
+    """
+
+    __slots__ = [
+        'buffers',
+        'buffers_inband',
+        'data',
+        'task',
+    ]
+
+
+    def __init__(self, data: bytes, buffers: list, buffers_inband: list, task: list | None=None) -> None:
+        r"""
+        :param data: Arguments pickled with protocol 5
+        :param buffers: Placeholders of the out-of-band buffers in the order pickled, see
+            lib.shm.shared_buffer_create()
+        :param buffers_inband: Placeholders of the buffers moved to shared memory, that are referenced
+            within the pickle.
+        :param task: Encoded task wrapped in the keyword argument "task" (i.e. tasks replying to a
+            future), kept apart for the orchestrator to identify it, see task_key().
+        """
+
+        self.data = data
+        self.buffers = buffers
+        self.buffers_inband = buffers_inband
+        self.task = task
+
+
+    def __reduce__(self) -> tuple:
+        return MorPyTaskArgs, (self.data, self.buffers, self.buffers_inband, self.task)
+
+
+    def decode(self) -> list:
+        r"""
+        Unpickles the arguments, attaching the UltraDict instances and shared buffers referenced. May
+        only be called once, as the shared buffers are unlinked on attachment.
+
+        :return: Arguments of the task following app_dict
+        """
+
+        args = pickle.loads(self.data, buffers=[shared_buffer_attach(placeholder) for placeholder in self.buffers])
+
+        if self.task is not None:
+            args[-1]["task"] = reattach_ultradict_refs(self.task)
+
+        return args
+
+
+    def release(self) -> None:
+        r"""
+        Destroys the buffers moved to shared memory for the arguments, that will not be decoded anymore.
+        """
+
+        for placeholder in self.buffers + self.buffers_inband:
+            shared_buffer_unlink(placeholder[0][len(SHARED_BUFFER_PREFIX):])
+
+        if self.task is not None:
+            release_shared_buffers(self.task)
+
+
+class _TaskPickler(pickle.Pickler):
+    r"""
+    Pickler encoding the arguments of a task, see MorPyTaskArgs. The reducer is not called for exact
+    instances of the builtin types (i.e. int, str, bytes, list, dict), so the arguments are walked by
+    the pickler itself.
+    """
+
+    __slots__ = [
+        'buffers',
+        'buffers_inband',
+        'zero_copy_min',
+    ]
+
+
+    def __init__(self, file, zero_copy_min: int | None) -> None:
+        super().__init__(file, protocol=5, buffer_callback=self._buffer_callback if zero_copy_min else None)
+        self.zero_copy_min = zero_copy_min
+        self.buffers: list = []
+        self.buffers_inband: list = []
+
+
+    def reducer_override(self, obj):
+        if isinstance(obj, UltraDict):
+            return ultradict_attach, (ultradict_placeholder(obj),)
+        elif self.zero_copy_min and isinstance(obj, (memoryview, array)):
+            placeholder = shared_buffer_create(obj, self.zero_copy_min)
+            if placeholder:
+                self.buffers_inband.append(placeholder)
+                return shared_buffer_attach, (placeholder,)
+        return NotImplemented
+
+
+    def _buffer_callback(self, buffer: pickle.PickleBuffer) -> bool:
+        # Returning False passes a buffer out-of-band.
+        try:
+            placeholder = shared_buffer_create(buffer.raw(), self.zero_copy_min)
+        except BufferError:
+            placeholder = None
+
+        if placeholder is None:
+            return True
+
+        self.buffers.append(placeholder)
+        return False
+
+
+def ultradict_placeholder(udict: UltraDict) -> tuple:
+    r"""
+    Returns the placeholder tuple of an UltraDict, containing its unique name and configuration flags.
+
+        (
+            "__morPy_shared_ref__::{UltraDict.name}",
+            UltraDict.shared_lock,   # (bool) whether a shared lock is used
+            UltraDict.auto_unlink,   # (bool) whether the dict auto-unlinks on close
+            UltraDict.recurse        # (bool) whether recursion (nested UltraDicts) is allowed
+        )
+
+    :param udict: UltraDict instance
+
+    :return: Placeholder tuple
+    """
+
+    return f"__morPy_shared_ref__::{udict.name}", udict.shared_lock, udict.auto_unlink, udict.recurse
+
+
+# Suppress linting for mandatory arguments.
+# noinspection PyUnusedLocal
+@core_wrap
+def substitute_ultradict_refs(trace: dict, app_dict: dict, task: list, batch: bool=False,
+                              zero_copy: bool=True) -> dict:
+    r"""
+    Sanitizes a task for the transport to a child process. UltraDict instances are replaced with a
+    placeholder tuple (see ultradict_placeholder()) to prevent serialization recursion errors.
+
+    A task following the form [func, trace, app_dict, ...] keeps its first three elements, as these
+    are read and updated by the orchestrator and the child processes. All further arguments are
+    encoded into a single MorPyTaskArgs, which records the positions of UltraDict references and
+    buffers moved to shared memory while being pickled. Other tasks are sanitized by recursively
+    walking them.
+
+    Large buffers (see processes_zero_copy_min in config.py) are moved to shared memory and
+    replaced by a placeholder as well, see lib.shm.shared_buffer_create(). Within encoded arguments,
+    bytes and bytearray are only moved, if passed as an argument directly and not nested within other
+    arguments. Tasks already sanitized are returned as they are.
+
+    :param trace: Operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param task: List-type task, supposedly with UltraDict references.
+    :param batch: If True, task is a list of tasks, each of which is sanitized.
+    :param zero_copy: If False, buffers are pickled regardless of their size. Required for tasks, which
+        may be run more than once, as shared buffers are released once attached.
+
+    :return task_sanitized: List-type task with substituted UltraDict references.
+    """
+
+    zero_copy_min = app_dict["morpy"]["conf"]["processes_zero_copy_min"] if zero_copy else None
+
+    # Substitute UltraDict references to mitigate RecursionError
+    def substitute(obj):
+        if isinstance(obj, UltraDict):
+            return ultradict_placeholder(obj)
+        elif zero_copy_min and isinstance(obj, (bytes, bytearray, memoryview, array)):
+            return shared_buffer_create(obj, zero_copy_min) or obj
+        elif zero_copy_min and type(obj).__name__ == "ndarray":
+            return shared_buffer_create(obj, zero_copy_min) or obj
+        elif isinstance(obj, list):
+            return [substitute(item) for item in obj]
+        elif isinstance(obj, tuple):
+            return tuple(substitute(item) for item in obj)
+        elif isinstance(obj, dict):
+            return {substitute(key): substitute(value) for key, value in obj.items()}
+        else:
+            return obj
+
+    # Bytes and bytearray are not handed to the reducer of the pickler, hence moved to shared memory as
+    # a memoryview.
+    def zero_copy_arg(arg):
+        if zero_copy_min and type(arg) in (bytes, bytearray) and len(arg) >= zero_copy_min:
+            return memoryview(arg)
+        return arg
+
+    def encode(task_raw):
+        if not (isinstance(task_raw, list) and len(task_raw) > 3 and isinstance(task_raw[1], dict)
+                and "process_id" in task_raw[1]):
+            return substitute(task_raw)
+
+        # Re-shelved tasks are encoded already.
+        if isinstance(task_raw[-1], MorPyTaskArgs):
+            return task_raw
+
+        args = [zero_copy_arg(arg) for arg in task_raw[3:]]
+        task_inner = None
+        if isinstance(args[-1], dict):
+            args[-1] = {key: zero_copy_arg(value) for key, value in args[-1].items()}
+            if isinstance(args[-1].get("task", None), list):
+                task_inner = encode(args[-1]["task"])
+                args[-1]["task"] = None
+
+        stream = io.BytesIO()
+        pickler = _TaskPickler(stream, zero_copy_min)
+        pickler.dump(args)
+
+        return substitute(task_raw[:3]) + [
+            MorPyTaskArgs(stream.getvalue(), pickler.buffers, pickler.buffers_inband, task_inner)]
+
+    if batch:
+        task_sanitized = [encode(task_raw) for task_raw in task]
+    else:
+        task_sanitized = encode(task)
+
+    return {
+        "task_sanitized": task_sanitized
+    }
+
+
+def reattach_ultradict_refs(task: list | tuple | dict | UltraDict) -> list:
+    r"""
+    Recursively converts placeholder tuples back into UltraDict instances by re‑creating them
+    from their stored configuration, restoring the original task structure for execution.
+
+        ("__morPy_shared_ref__::{name}",
+        UltraDict.shared_lock,
+        UltraDict.auto_unlink,
+        UltraDict.recurse)
+
+    The UltraDict is taken from the attachments of the calling process, see ultradict_attach().
+    Buffers moved to shared memory are mapped read-only, see lib.shm.shared_buffer_attach().
+    Arguments encoded by substitute_ultradict_refs() are decoded without walking them, see
+    MorPyTaskArgs.decode().
+
+    :param task: Task with sanitized UltraDict references.
+
+    :return task_recreated: Task with recreated UltraDict references.
+    """
+
+    def reattach(obj):
+        placeholder_prefix = "__morPy_shared_ref__::"
+        if (isinstance(obj, tuple) and len(obj) == 4 and
+                isinstance(obj[0], str) and obj[0].startswith(placeholder_prefix)):
+            return ultradict_attach(obj)
+        elif (isinstance(obj, tuple) and len(obj) == 4 and
+                isinstance(obj[0], str) and obj[0].startswith(SHARED_BUFFER_PREFIX)):
+            return shared_buffer_attach(obj)
+        elif isinstance(obj, list) and obj and isinstance(obj[-1], MorPyTaskArgs):
+            return [reattach(item) for item in obj[:-1]] + obj[-1].decode()
+        elif isinstance(obj, list):
+            return [reattach(item) for item in obj]
+        elif isinstance(obj, tuple):
+            return tuple(reattach(item) for item in obj)
+        elif isinstance(obj, dict):
+            return {reattach(key): reattach(value) for key, value in obj.items()}
+        else:
+            return obj
+
+    task_recreated = reattach(task)
+    return task_recreated
+
+
+# UltraDict instances attached by the calling process, keyed by their placeholder and ordered from the
+# least to the most recently used. A forked child process starts over, as it must not share the
+# attachments of its parent (see lib.spawn).
+_attached: OrderedDict = OrderedDict()
+_attached_pid: int | None = None
+_ATTACHED_MAX: int = 64
+
+# Directory, in which shared memory is visible as files, used to detect stale attachments.
+_SHM_DIR: str | None = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def ultradict_attach(placeholder: tuple) -> UltraDict:
+    r"""
+    Returns the UltraDict of a placeholder (see substitute_ultradict_refs()). Every UltraDict is
+    attached once per process by calling its constructor with create=False and reused by the tasks
+    to come, instead of mapping its shared memory again for every task. An attachment is dropped,
+    once its shared memory was unlinked or recreated under the same name, or once it is the least
+    recently used of more than _ATTACHED_MAX attachments.
+
+    :param placeholder: Tuple ("__morPy_shared_ref__::{name}", shared_lock, auto_unlink, recurse)
+
+    :return: Attached UltraDict instance
+    """
+
+    global _attached_pid
+    if _attached_pid != os.getpid():
+        _attached.clear()
+        _attached_pid = os.getpid()
+
+    udict = _attached.get(placeholder, None)
+
+    if udict is not None and not ultradict_stale(udict):
+        _attached.move_to_end(placeholder)
+        return udict
+
+    name_val = placeholder[0][len("__morPy_shared_ref__::"):]
+    udict = UltraDict(
+        name=name_val,
+        create=False,
+        shared_lock=placeholder[1],
+        auto_unlink=placeholder[2],
+        recurse=placeholder[3]
+    )
+
+    _attached[placeholder] = udict
+    _attached.move_to_end(placeholder)
+    while len(_attached) > _ATTACHED_MAX:
+        _attached.popitem(last=False)
+
+    return udict
+
+
+def ultradict_stale(udict: UltraDict) -> bool:
+    r"""
+    Checks, whether the shared memory an UltraDict is attached to was unlinked or recreated under the
+    same name in the meantime. Only detected where shared memory is visible in /dev/shm (Linux),
+    otherwise attachments are never considered stale.
+
+    :param udict: Attached UltraDict instance
+
+    :return: True, if the attachment is stale.
+    """
+
+    if not _SHM_DIR:
+        return False
+
+    try:
+        memory = udict.control
+        return os.fstat(memory._fd).st_ino != os.stat(os.path.join(_SHM_DIR, memory.name)).st_ino
+    except FileNotFoundError:
+        return True
+    except (AttributeError, OSError):
+        return False
+
+
+def release_shared_buffers(task: Any) -> None:
+    r"""
+    Destroys the buffers moved to shared memory for a task, that will not be run anymore (i.e.
+    cancelled or left over at exit).
+
+    :param task: Task with sanitized references, see substitute_ultradict_refs().
+    """
+
+    if (isinstance(task, tuple) and len(task) == 4 and
+            isinstance(task[0], str) and task[0].startswith(SHARED_BUFFER_PREFIX)):
+        shared_buffer_unlink(task[0][len(SHARED_BUFFER_PREFIX):])
+    elif isinstance(task, MorPyTaskArgs):
+        task.release()
+    elif isinstance(task, (list, tuple)):
+        for item in task:
+            release_shared_buffers(item)
+    elif isinstance(task, dict) and not isinstance(task, UltraDict):
+        for value in task.values():
+            release_shared_buffers(value)
+
+
+@core_wrap
+def run_parallel(trace: dict, app_dict: dict, task: list=None, priority: int=None, task_id: int=None,
+                 requeue: bool=True) -> dict:
+    r"""
+    Attempts to reserve an available process ID; if successful, updates the task’s trace with that
+    ID and spawns a new process (using SpawnWrapper) to run the task in parallel. If no process is
+    available, the task is queued to a busy process (see deque_push()) or re‑queued.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param task: The pulled task list
+    :param priority: Integer representing task priority (lower is higher priority)
+    :param task_id: Value representing the unique, continuing task ID
+    :param requeue: If False, a task, that could not be dispatched, is not re-queued. The caller takes
+        care of it instead.
+
+    :return: dict
+        dispatched: If False, all processes and their queues were busy and the task was re-queued.
+
+    TODO make compatible with free-threading
+    """
+
+    shelved: bool = False
+    dispatched: bool = True
+    process_shelved: int | None = None
+
+    # Start preparing task for spawning process.
     log(trace, app_dict, "debug",
         lambda: f'{app_dict["loc"]["morpy"]["run_parallel_start_prep"]}')
 
-    # See, if processes are waiting with an empty shelf.
+    # See, if processes are waiting with an empty shelf.
+    with app_dict["morpy"]["proc_waiting"].lock:
+        proc_waiting = app_dict["morpy"]["proc_waiting"]
+        for process in proc_waiting.keys():
+            # Only unpack the task to check, if it is Nine
+            task_shelved = proc_waiting[process][0]
+            # Put the task on the shelf and return.
+            if task_shelved is None:
+                proc_waiting[process] = (task, priority, task_id)
+                shelved = True
+                process_shelved = process
+                break
+
+    # Exit, if task has been shelved
+    if shelved:
+        # Wake up the process the task was shelved to.
+        notify_process(process_shelved)
+
+        # A task was shelved to a running process.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["run_parallel_shelved"]}')
+        return {
+            "dispatched" : dispatched
+        }
+
+    with app_dict["morpy"]["proc_available"].lock:
+        with app_dict["morpy"]["proc_busy"].lock:
+            proc_available_keys = app_dict["morpy"]["proc_available"].keys()
+            processes_busy = app_dict["morpy"]["proc_busy"]
+            process_id = None
+
+            # Look up for an available process ID and create a shell for the new process.
+            if len(proc_available_keys) > 0:
+                process_id = min(proc_available_keys)
+                processes_busy[process_id] = None
+                app_dict["morpy"]["proc_available"].pop(process_id)
+
+    if process_id:
+        # Process ID determined.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["run_parallel_search_iter_end"]}:\n'
+                    f'{process_id=}')
+
+        proc_master = app_dict["morpy"]["proc_master"]
+
+        if not task_id and process_id != proc_master:
+            task_id = core_add(app_dict, "tasks_created", 1)
+
+        # Execute the task
+        if process_id != proc_master:
+
+            # Parallel process starting.
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["run_parallel_start"]}: {process_id}')
+
+            # Tracing update and ID assignment for the new process
+            task[1].update({"process_id" : process_id})
+            task[1].update({"thread_id" : 0})
+            task[1].update({"task_id" : task_id})
+            task[1].update({"tracing" : ""})
+
+            # Run the task. No lock on app_dict may be held here, as a forked child would inherit it.
+            from lib.spawn import SpawnWrapper
+            task_spawn = SpawnWrapper(task)
+            p = mp_context().Process(target=task_spawn)
+            p.start()
+
+            # Store the reference of the process
+            with app_dict["morpy"]["proc_busy"].lock:
+                app_dict["morpy"]["proc_busy"][process_id] = f'{p.name}'
+
+            # Parallel process running.
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["run_parallel_exit"]}: {process_id}')
+
+    # Queue the task to a busy process, which takes it on next or hands it to an idle sibling.
+    elif deque_push(trace, app_dict, task=task, priority=priority, task_id=task_id)["queued"]:
+        pass
+
+    else:
+        # Enqueue the task again to prevent data loss
+        if requeue:
+            existing_id = task[1].get("task_id", None)
+            heap_shelve(
+                trace, app_dict, priority=priority, task=task, force=True, task_id= existing_id
+            )
+        dispatched = False
+
+        # All processes busy, failed to allocate process ID. Re-queueing the task.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["run_parallel_allocate_fail"]}')
+
+    return {
+        "dispatched" : dispatched
+    }
+
+
+@core_wrap
+def check_child_processes(trace: dict, app_dict: dict, check_join: bool = False) -> None:
+    r"""
+    Compares the process IDs of child processes currently active (using multiprocessing.active_children)
+    with those stored in the busy process register. If discrepancies are found (i.e. a process is missing
+    or rogue processes exist), logs appropriate warnings, cleans up the internal registers, and attempts
+    to terminate any stray processes.
+
+    This function compares the list of active child processes with the
+    process references stored in app_dict["morpy"]["proc_busy"]. If a process
+    is referenced but no longer active, it logs an error and removes that reference.
+    It also attempts to terminate any processes that are still running but are not
+    referenced in proc_busy (rogue processes).
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param check_join: If True, the orchestrator will check if all processes are
+        joined. This may end processes, that could otherwise accept a shelved task.
+    """
+
+    child_processes: dict = {}
+    proc_left_over: set = set()
+
+    proc_master = app_dict["morpy"]["proc_master"]
+
+    with app_dict["morpy"]["proc_busy"].lock:
+        proc_busy = app_dict["morpy"]["proc_busy"]
+
+    # Build a set of active child process names
+    for child in active_children():
+        child_processes.update({child.name : child})
+
+    # Compare morPy process references with active_children()
+    for p_id, p_name in proc_busy.items():
+        if p_id != proc_master:
+            try:
+                child_processes.pop(p_name)
+            except KeyError:
+                # Check whether the app needs to exit
+                critical = app_dict["morpy"]["conf"]["processes_are_critical"]
+                severity = "critical" if critical else "warning"
+
+                # A child process was terminated unexpectedly. Process references will be restored,
+                # but the task and data may be lost.
+                log(trace, app_dict, severity,
+                    lambda: f'{app_dict["loc"]["morpy"]["check_child_processes_term_err"]}\n'
+                            f'{app_dict["loc"]["morpy"]["check_child_processes_aff"]} "{p_id}: {p_name}"')
+
+                # A guarded task of the process is retried instead.
+                guarded = task_guard_lost(trace, app_dict, process_id=p_id)["guarded"]
+                if critical or not guarded:
+                    core_store(app_dict, "exit", True)
+                    notify_exit()
+
+                # Collect leftover process IDs
+                proc_left_over.add(p_id)
+
+    # Try to terminate roque processes.
+    roque_proc_names = child_processes.keys()
+    if len(roque_proc_names) > 0:
+        # At least one process still running, although considered terminated.
+        # Recovery is not possible, trying to terminate.
+        log(trace, app_dict, "warning",
+            lambda: f'{app_dict["loc"]["morpy"]["check_child_processes_rogues"]}\n'
+                    f'{app_dict["loc"]["morpy"]["check_child_processes_no_rec"]}'
+                    f'{roque_proc_names}')
+
+        for rogue_name, rogue_obj in child_processes.items():
+            try:
+                rogue_obj.terminate()
+            except ProcessLookupError | OSError:
+                pass
+
+    # Sanitize the process references
+    if len(proc_left_over) > 0:
+        process_refs_release(trace, app_dict, processes=proc_left_over)
+
+    if check_join:
+        # No join, if there are tasks on the heap shelf
+        with app_dict["morpy"]["heap_shelf"].lock:
+            if len(app_dict["morpy"]["heap_shelf"]) > 1:
+                return
+
+        # No join, if there are tasks in the ring buffer
+        ring = heap_ring(app_dict)
+        if ring and ring.pending() > 0:
+            return
+
+        # No join, while tasks are queued to child processes
+        with app_dict["morpy"]["proc_deques"].lock:
+            if len(app_dict["morpy"]["proc_deques"]) > 0:
+                return
+
+        # No join, while child processes run async tasks
+        if core_load(app_dict, "tasks_async") > 0:
+            return
+
+        # No join, while guarded tasks wait for a retry
+        with app_dict["morpy"]["tasks_guarded"].lock:
+            if any(entry["due"] is not None for entry in app_dict["morpy"]["tasks_guarded"].values()):
+                return
+
+        # No join, if waiting processes already got a new task assigned
+        with app_dict["morpy"]["proc_waiting"].lock:
+            proc_waiting = app_dict["morpy"]["proc_waiting"]
+        for _p, _t in proc_waiting.items():
+            if _t[0] is not None:
+                return
+
+        # Have in mind, that the orchestrator is never waiting (therefore +1).
+        if len(app_dict["morpy"]["proc_busy"].keys()) == (len(proc_waiting.keys()) + 1):
+            core_store(app_dict, "proc_joined", True)
+
+            # Wake up the processes waiting for the join.
+            notify_processes()
+
+            # Reset delayed join, once joining is complete.
+            with app_dict["morpy"]["orchestrator"].lock:
+                app_dict["morpy"]["orchestrator"]["delayed_join"] = False
+
+            # All child processes are joined.
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["check_child_processes_joined"]}')
+
+
+@core_wrap
+def process_refs_release(trace: dict, app_dict: dict, processes: set=None) -> None:
+    r"""
+    Releases the references of child processes, which were terminated unexpectedly. Their process IDs
+    become available again. A task shelved to such a process is recovered and the tasks queued to it
+    are handed back to the orchestrator.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param processes: morPy process IDs of the processes terminated
+    """
+
+    with app_dict["morpy"]["proc_available"].lock:
+        with app_dict["morpy"]["proc_busy"].lock:
+            for proc_remnant_id in processes:
+                # Remove process from busy
+                app_dict["morpy"]["proc_busy"].pop(proc_remnant_id, None)
+                # Add available process ID
+                app_dict["morpy"]["proc_available"][proc_remnant_id] = None
+
+    # Attempt task recovery
+    with app_dict["morpy"]["proc_waiting"].lock:
+        proc_waiting = app_dict["morpy"]["proc_waiting"]
+
+        for proc_remnant_id in processes:
+            if proc_waiting.get(proc_remnant_id, None):
+                # Proactively Recover a task from shelve
+                task_recovered, priority, task_id = proc_waiting[proc_remnant_id]
+                if task_recovered:
+                    heap_shelve(trace, app_dict, priority=priority, task=task_recovered, force=True,
+                                task_id=task_id)
+                    # A shelved task was recovered from a terminated process.
+                    log(trace, app_dict, "warning",
+                        lambda: f'{app_dict["loc"]["morpy"]["check_child_processes_recovery"]}\n'
+                                f'{app_dict["loc"]["morpy"]["check_child_processes_aff"]} "{proc_remnant_id}"')
+
+                proc_waiting.pop(proc_remnant_id)
+
+    # Recover the tasks queued to the terminated processes
+    for proc_remnant_id in processes:
+        deque_release(trace, app_dict, process_id=proc_remnant_id)
+
+    with app_dict["morpy"]["proc_blocked"].lock:
+        for proc_remnant_id in processes:
+            app_dict["morpy"]["proc_blocked"].pop(proc_remnant_id, None)
+
+
+@core_wrap
+def join_or_task(trace: dict, app_dict: dict, reset_trace: bool = False, reset_w_prefix: str=None) -> None:
+    r"""
+    Waits in a loop until all spawned tasks have completed or a new task appears for the current process.
+    This function is used to synchronize transitions between app phases (e.g. after initialization,
+    before running, or before exiting).
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param reset_trace: If True, the trace will be reset/lost.
+    :param reset_w_prefix: If reset_trace is True, a custom prefix can be set in order to retain
+        a customized trace.
+
+    :example:
+        join_or_task(trace, app_dict)
+
+    TODO add idle_timeout to stop waiting for task shelving
+    """
+
+    module: str = 'lib.mp'
+    operation: str = 'join_or_task(~)'
+    trace: dict = morpy_fct.tracing(module, operation, trace, reset=reset_trace, reset_w_prefix=reset_w_prefix)
+
+    my_pid: int = trace["process_id"]
+
+    # Check for Interrupt / exit
+    stop_while_interrupt(trace, app_dict)
+
+    # With the thread backend, wait for the threads to finish their tasks.
+    from lib.threads import thread_pool
+    pool = thread_pool()
+    if pool:
+        pool.join()
+
+    # Only child processes wait for the join. In single process mode, wait for the async tasks run by
+    # the own event loop.
+    proc_master = app_dict["morpy"]["proc_master"]
+    if my_pid == proc_master:
+        from lib.aio import drain
+        drain(trace, app_dict)
+
+    else:
+        from lib.aio import collect
+
+        # Waiting for processes to finish or task to run.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["join_or_task_start"]}')
+
+        proc_joined = False
+        while not proc_joined:
+
+            # Exit if required
+            if core_load(app_dict, "exit"):
+                child_exit_routine(trace, app_dict)
+                sys.exit()
+
+            # Check for a shelved task and run it
+            task_claimed = claim_task(trace, app_dict)
+
+            # Complete the async tasks done in the meantime.
+            collect(trace, app_dict)
+
+            # Check for Interrupt / exit
+            stop_while_interrupt(trace, app_dict)
+
+            # Go on with the tasks queued to this process before waiting for new ones.
+            if task_claimed:
+                continue
+
+            # Re-/subscribe to waiting dictionary.
+            subscribe_waiting(trace, app_dict)
+
+            # Check, if processes have been joined yet.
+            proc_joined = core_load(app_dict, "proc_joined")
+
+            # Block until a task is shelved, processes are joined or an exit is requested.
+            if not proc_joined:
+                wait_process(my_pid)
+
+        # Stop waiting for tasks, the process continues on its own.
+        unsubscribe_waiting(trace, app_dict)
+
+
+@core_wrap
+def claim_task(trace: dict, app_dict: dict) -> bool:
+    r"""
+    Checks the waiting dictionary for a task shelved to the calling process by the orchestrator. If
+    there is none, takes the next task of the own queue or steals tasks from a busy sibling (see
+    deque_pop()). If a task was found, the process unsubscribes from the waiting dictionary, claims the
+    task by assigning its task ID to the own trace and executes it.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: True, if a task was claimed and executed.
+
+    :example:
+        task_executed = claim_task(trace, app_dict)
+    """
+
+    my_pid: int = trace["process_id"]
+
+    # Check for a shelved task
     with app_dict["morpy"]["proc_waiting"].lock:
         proc_waiting = app_dict["morpy"]["proc_waiting"]
-        for process in proc_waiting.keys():
-            # Only unpack the task to check, if it is Nine
-            task_shelved = proc_waiting[process][0]
-            # Put the task on the shelf and return.
-            if task_shelved is None:
-                proc_waiting[process] = (task, priority, task_id)
-                shelved = True
-                break
+        task, priority, task_id = proc_waiting.get(my_pid, (None, None, None))
 
-    # Exit, if task has been shelved
-    if shelved:
-        # A task was shelved to a running process.
-        log(trace, app_dict, "debug",
-            lambda: f'{app_dict["loc"]["morpy"]["run_parallel_shelved"]}')
-        return
+        # Unsubscribe from waiting dictionary if a task was assigned.
+        if task:
+            proc_waiting.pop(my_pid)
+
+    # Take on a task queued to this process or a sibling.
+    if not task:
+        task_queued = deque_pop(trace, app_dict)
+        task, task_id = task_queued["task"], task_queued["task_id"]
+
+        if not task:
+            return False
+
+        # Stay unsubscribed while busy, unless a task was shelved to the process meanwhile.
+        with app_dict["morpy"]["proc_waiting"].lock:
+            proc_waiting = app_dict["morpy"]["proc_waiting"]
+            if my_pid in proc_waiting.keys() and proc_waiting[my_pid][0] is None:
+                proc_waiting.pop(my_pid)
+
+    # Check for Interrupt / exit
+    stop_while_interrupt(trace, app_dict)
+
+    # Assign task ID to own trace and claim task
+    trace["task_id"] = task_id
+    task[1] = trace
+
+    # Recreate UltraDict references in task and run it. Async tasks go on in the event loop of the process.
+    from lib.aio import run_task
+    task_recreated = reattach_ultradict_refs(task)
+    guarded = task_guard_start(trace, app_dict)
+    try:
+        run_task(trace, app_dict, task_to_partial(task_recreated))
+    finally:
+        if guarded:
+            task_guard_end(trace, app_dict)
+
+    return True
+
+
+# Suppress linting for mandatory arguments.
+# noinspection PyUnusedLocal
+@core_wrap
+def subscribe_waiting(trace: dict, app_dict: dict) -> None:
+    r"""
+    Subscribes the calling process to the waiting dictionary without a shelved task, unless it is
+    already subscribed. The orchestrator may then shelve a task to the process.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :example:
+        subscribe_waiting(trace, app_dict)
+    """
+
+    my_pid: int = trace["process_id"]
+    subscribed: bool = False
+
+    with app_dict["morpy"]["proc_waiting"].lock:
+        proc_waiting = app_dict["morpy"]["proc_waiting"]
+        if not proc_waiting.get(my_pid, None):
+            # Add task to waiting dictionary without a shelved task.
+            proc_waiting.update({my_pid: (None, None, None)})
+            subscribed = True
+
+    # The orchestrator may now shelve a task to this process or join.
+    if subscribed:
+        notify_orchestrator()
+
+
+@core_wrap
+def unsubscribe_waiting(trace: dict, app_dict: dict) -> None:
+    r"""
+    Removes the calling process from the waiting dictionary. A task shelved to the process in the
+    meantime is handed back to the orchestrator, so it is not lost while the process is busy otherwise.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :example:
+        unsubscribe_waiting(trace, app_dict)
+    """
+
+    with app_dict["morpy"]["proc_waiting"].lock:
+        task, priority, task_id = app_dict["morpy"]["proc_waiting"].pop(trace["process_id"], (None, None, None))
+
+    # Hand back a task, that was shelved right before unsubscribing.
+    if task:
+        heap_shelve(trace, app_dict, priority=priority, task=task, autocorrect=False, task_id=task_id)
+
+
+@core_wrap
+def deque_push(trace: dict, app_dict: dict, task: list=None, priority: int=None, task_id: int=None) -> dict:
+    r"""
+    Queues a task to the busy child process with the shortest queue, if all processes are busy. The
+    process takes on the task once it is done with its current one, unless an idle sibling steals it
+    earlier (see deque_pop()). Processes waiting for futures or results are skipped, as they would not
+    take on the task before their wait ended (see deque_blocked()). Only to be called by the orchestrator.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param task: The pulled task list
+    :param priority: Integer representing task priority (lower is higher priority)
+    :param task_id: Value representing the unique, continuing task ID
+
+    :return: dict
+        queued: If False, the queues of all processes are full or queueing is disabled (see
+            "processes_deque_max" in config.py).
+    """
+
+    deque_max: int = app_dict["morpy"]["conf"]["processes_deque_max"]
+    process_queued: int | None = None
+
+    if not deque_max:
+        return {
+            "queued" : False
+        }
+
+    proc_master = app_dict["morpy"]["proc_master"]
+
+    with app_dict["morpy"]["proc_deques"].lock:
+        proc_deques = app_dict["morpy"]["proc_deques"]
+
+        # A process blocked or exiting meanwhile hands back its queue, once it marked itself blocked.
+        with app_dict["morpy"]["proc_blocked"].lock:
+            proc_blocked_keys = set(app_dict["morpy"]["proc_blocked"].keys())
 
-    with app_dict["morpy"]["proc_available"].lock:
         with app_dict["morpy"]["proc_busy"].lock:
-            proc_available_keys = app_dict["morpy"]["proc_available"].keys()
-            processes_busy = app_dict["morpy"]["proc_busy"]
-            process_id = None
+            proc_busy_keys = [p_id for p_id in app_dict["morpy"]["proc_busy"].keys()
+                              if p_id != proc_master and p_id not in proc_blocked_keys]
 
-            # Look up for an available process ID and create a shell for the new process.
-            if len(proc_available_keys) > 0:
-                process_id = min(proc_available_keys)
-                processes_busy[process_id] = None
-                app_dict["morpy"]["proc_available"].pop(process_id)
+        # Find the busy process with the shortest queue
+        queue_len: int = deque_max
+        for p_id in proc_busy_keys:
+            p_len = len(proc_deques.get(p_id, ()))
+            if p_len < queue_len:
+                process_queued, queue_len = p_id, p_len
 
-    if process_id:
-        with app_dict["morpy"].lock:
-            # Process ID determined.
-            log(trace, app_dict, "debug",
-                lambda: f'{app_dict["loc"]["morpy"]["run_parallel_search_iter_end"]}:\n'
-                        f'{process_id=}')
+        if process_queued is not None:
+            proc_deques[process_queued] = [*proc_deques.get(process_queued, ()), (priority, task_id, task)]
 
-            proc_master = app_dict["morpy"]["proc_master"]
+    if process_queued is None:
+        return {
+            "queued" : False
+        }
 
-            # Execute the task
-            if process_id != proc_master:
+    # Wake up the process, in case it went idle in the meantime.
+    notify_process(process_queued)
 
-                # Parallel process starting.
-                log(trace, app_dict, "debug",
-                    lambda: f'{app_dict["loc"]["morpy"]["run_parallel_start"]}: {process_id}')
+    # All processes busy. Task queued to a busy process.
+    log(trace, app_dict, "debug",
+        lambda: f'{app_dict["loc"]["morpy"]["deque_push_done"]}\n'
+                f'{app_dict["loc"]["morpy"]["deque_push_process"]}: {process_queued}')
 
-                if not task_id:
-                    app_dict["morpy"]["tasks_created"] += 1
-                    task_id = app_dict["morpy"]["tasks_created"]
+    return {
+        "queued" : True
+    }
 
-                # Tracing update and ID assignment for the new process
-                task[1].update({"process_id" : process_id})
-                task[1].update({"thread_id" : 0})
-                task[1].update({"task_id" : task_id})
-                task[1].update({"tracing" : ""})
 
-                # Run the task
-                from lib.spawn import SpawnWrapper
-                task_spawn = SpawnWrapper(task)
-                p = Process(target=task_spawn)
-                p.start()
+@core_wrap
+def deque_pop(trace: dict, app_dict: dict) -> dict:
+    r"""
+    Takes the next task of the queue of the calling process. If the queue is empty, the process steals
+    half of the tasks queued to the busiest sibling at once. The task taken is returned, the rest is
+    moved to the own queue, so that the process does not need to steal again for a while.
 
-                # Store the reference of the process
-                with app_dict["morpy"]["proc_busy"].lock:
-                    app_dict["morpy"]["proc_busy"][process_id] = f'{p.name}'
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
 
-                # Parallel process running.
-                log(trace, app_dict, "debug",
-                    lambda: f'{app_dict["loc"]["morpy"]["run_parallel_exit"]}: {process_id}')
+    :return: dict
+        task: Task taken or None, if no tasks are queued to any process.
+        priority: Priority of the task
+        task_id: ID of the task
+    """
 
-    else:
-        # Enqueue the task again to prevent data loss
-        existing_id = task[1].get("task_id", None)
-        heap_shelve(
-            trace, app_dict, priority=priority, task=task, force=True, task_id= existing_id
-        )
+    my_pid: int = trace["process_id"]
+    tasks_taken: list = []
+    victim: int | None = None
 
-        # All processes busy, failed to allocate process ID. Re-queueing the task.
+    with app_dict["morpy"]["proc_deques"].lock:
+        proc_deques = app_dict["morpy"]["proc_deques"]
+
+        if my_pid in proc_deques.keys():
+            tasks_taken = proc_deques.pop(my_pid)
+
+        else:
+            # Steal from the busiest sibling. The owner keeps the most urgent tasks.
+            victim_len: int = 0
+            for p_id, p_deque in proc_deques.items():
+                if len(p_deque) > victim_len:
+                    victim, victim_len = p_id, len(p_deque)
+
+            if victim is not None:
+                p_deque = proc_deques.pop(victim)
+                keep = victim_len // 2
+                tasks_taken = p_deque[keep:]
+                if keep:
+                    proc_deques[victim] = p_deque[:keep]
+
+        if len(tasks_taken) > 1:
+            proc_deques[my_pid] = tasks_taken[1:]
+
+    if not tasks_taken:
+        return {
+            "task" : None,
+            "priority" : None,
+            "task_id" : None,
+        }
+
+    # There is room in the queues again, the orchestrator may pass on tasks held back.
+    notify_orchestrator()
+
+    if victim is not None:
+        # Tasks stolen from the queue of a busy process.
         log(trace, app_dict, "debug",
-            lambda: f'{app_dict["loc"]["morpy"]["run_parallel_allocate_fail"]}')
+            lambda: f'{app_dict["loc"]["morpy"]["deque_steal"]}\n'
+                    f'{app_dict["loc"]["morpy"]["deque_steal_cnt"]}: {len(tasks_taken)}\n'
+                    f'{app_dict["loc"]["morpy"]["deque_steal_from"]}: {victim}')
+
+    priority, task_id, task = tasks_taken[0]
+
+    return {
+        "task" : task,
+        "priority" : priority,
+        "task_id" : task_id,
+    }
 
 
 @core_wrap
-def check_child_processes(trace: dict, app_dict: dict, check_join: bool = False) -> None:
+def deque_release(trace: dict, app_dict: dict, process_id: int=None) -> None:
     r"""
-    Compares the process IDs of child processes currently active (using multiprocessing.active_children)
-    with those stored in the busy process register. If discrepancies are found (i.e. a process is missing
-    or rogue processes exist), logs appropriate warnings, cleans up the internal registers, and attempts
-    to terminate any stray processes.
+    Hands the tasks queued to a process back to the orchestrator, i.e. when the process retires or was
+    terminated unexpectedly.
 
-    This function compares the list of active child processes with the
-    process references stored in app_dict["morpy"]["proc_busy"]. If a process
-    is referenced but no longer active, it logs an error and removes that reference.
-    It also attempts to terminate any processes that are still running but are not
-    referenced in proc_busy (rogue processes).
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param process_id: morPy process ID of the process
+    """
+
+    with app_dict["morpy"]["proc_deques"].lock:
+        tasks_queued = app_dict["morpy"]["proc_deques"].pop(process_id, [])
+
+    for priority, task_id, task in tasks_queued:
+        heap_shelve(trace, app_dict, priority=priority, task=task, autocorrect=False, force=True,
+                    task_id=task_id)
+
+    if tasks_queued:
+        # Tasks queued to a process were handed back to the orchestrator.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["deque_release"]}\n'
+                    f'{app_dict["loc"]["morpy"]["deque_release_cnt"]}: {len(tasks_queued)}')
+
+
+# Nesting depth of the waits of the calling process, see deque_blocked().
+_deque_blocked: int = 0
+
+
+@contextmanager
+def deque_blocked(trace: dict, app_dict: dict):
+    r"""
+    Marks the calling child process as blocked in app_dict["morpy"]["proc_blocked"] while it waits for
+    futures or results, and hands the tasks queued to it back to the orchestrator. The orchestrator does
+    not queue tasks to blocked processes (see deque_push()), as a waiting process does not take them on.
+    Waits may be nested, the process is unblocked once the outermost wait ends. Does nothing in single
+    process mode, with the thread backend, in the orchestrator and in other threads than the main thread,
+    as UltraDict locks must not be acquired by other threads of the same process.
 
     :param trace: operation credentials and tracing information
     :param app_dict: morPy global dictionary containing app configurations
-    :param check_join: If True, the orchestrator will check if all processes are
-        joined. This may end processes, that could otherwise accept a shelved task.
+
+    :example:
+        with deque_blocked(trace, app_dict):
+            while not future.done():
+                wait_check(trace, app_dict)
     """
 
-    child_processes: dict = {}
-    proc_left_over: set = set()
+    global _deque_blocked
 
-    proc_master = app_dict["morpy"]["proc_master"]
+    my_pid: int = trace["process_id"]
 
-    with app_dict["morpy"]["proc_busy"].lock:
-        proc_busy = app_dict["morpy"]["proc_busy"]
+    if (app_dict["morpy"]["processes_max"] <= 1 or my_pid == app_dict["morpy"]["proc_master"]
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
 
-    # Build a set of active child process names
-    for child in active_children():
-        child_processes.update({child.name : child})
+    _deque_blocked += 1
+    try:
+        if _deque_blocked == 1:
+            with app_dict["morpy"]["proc_blocked"].lock:
+                app_dict["morpy"]["proc_blocked"][my_pid] = None
 
-    # Compare morPy process references with active_children()
-    for p_id, p_name in proc_busy.items():
-        if p_id != proc_master:
-            try:
-                child_processes.pop(p_name)
-            except KeyError:
-                # Check whether the app needs to exit
-                severity = "critical" if app_dict["morpy"]["conf"]["processes_are_critical"] else "warning"
+            # Tasks queued before the process was marked blocked.
+            deque_release(trace, app_dict, process_id=my_pid)
 
-                # A child process was terminated unexpectedly. Process references will be restored,
-                # but the task and data may be lost.
-                log(trace, app_dict, severity,
-                    lambda: f'{app_dict["loc"]["morpy"]["check_child_processes_term_err"]}\n'
-                            f'{app_dict["loc"]["morpy"]["check_child_processes_aff"]} "{p_id}: {p_name}"')
+        yield
 
-                with app_dict["morpy"].lock:
-                    app_dict["morpy"]["exit"] = True
+    finally:
+        _deque_blocked -= 1
+        if _deque_blocked == 0:
+            with app_dict["morpy"]["proc_blocked"].lock:
+                app_dict["morpy"]["proc_blocked"].pop(my_pid, None)
 
-                # Collect leftover process IDs
-                proc_left_over.add(p_id)
 
-    # Try to terminate roque processes.
-    roque_proc_names = child_processes.keys()
-    if len(roque_proc_names) > 0:
-        # At least one process still running, although considered terminated.
-        # Recovery is not possible, trying to terminate.
-        log(trace, app_dict, "warning",
-            lambda: f'{app_dict["loc"]["morpy"]["check_child_processes_rogues"]}\n'
-                    f'{app_dict["loc"]["morpy"]["check_child_processes_no_rec"]}'
-                    f'{roque_proc_names}')
+@core_wrap
+def pool_worker(trace: dict, app_dict: dict, tasks_done: int=0) -> None:
+    r"""
+    Keeps a child process alive as a persistent worker of the process pool. Unlike join_or_task(),
+    the worker does not terminate once all processes are joined. It continuously takes on tasks
+    shelved by the orchestrator until the app exits or the worker is due for recycling (see
+    "processes_pool_max_tasks" and "processes_pool_max_rss_mb" in config.py).
 
-        for rogue_name, rogue_obj in child_processes.items():
-            try:
-                rogue_obj.terminate()
-            except ProcessLookupError | OSError:
-                pass
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param tasks_done: Number of tasks the worker executed before entering the pool.
 
-    # Sanitize the process references
-    if len(proc_left_over) > 0:
-        with app_dict["morpy"]["proc_available"].lock:
-            with app_dict["morpy"]["proc_busy"].lock:
-                for proc_remnant_id in proc_left_over:
-                    # Remove process from busy
-                    app_dict["morpy"]["proc_busy"].pop(proc_remnant_id)
-                    # Add available process ID
-                    app_dict["morpy"]["proc_available"][proc_remnant_id] = None
+    :example:
+        pool_worker(trace, app_dict, tasks_done=1)
+    """
 
-        # Attempt task recovery
-        with app_dict["morpy"]["proc_waiting"].lock:
-            proc_waiting = app_dict["morpy"]["proc_waiting"]
+    from lib.aio import collect
 
-            for proc_remnant_id in proc_left_over:
-                if proc_waiting.get(proc_remnant_id, None):
-                    # Proactively Recover a task from shelve
-                    task_recovered, priority, task_id = proc_waiting[proc_remnant_id]
-                    if task_recovered:
-                        heap_shelve(trace, app_dict, priority=priority, task=task_recovered,
-                                    task_id=task_id)
-                        # A shelved task was recovered from a terminated process.
-                        log(trace, app_dict, "warning",
-                            lambda: f'{app_dict["loc"]["morpy"]["check_child_processes_recovery"]}'
-                                    f'{roque_proc_names}')
+    autoscale: bool = app_dict["morpy"]["conf"]["processes_autoscale"]
 
-                    proc_waiting.pop(proc_remnant_id)
+    # Process is waiting for tasks as a pool worker.
+    log(trace, app_dict, "debug",
+        lambda: f'{app_dict["loc"]["morpy"]["pool_worker_start"]}')
 
-    if check_join:
-        # No join, if there are tasks on the heap shelf
-        with app_dict["morpy"]["heap_shelf"].lock:
-            if len(app_dict["morpy"]["heap_shelf"]) > 1:
-                return
+    while True:
+        # Exit if required
+        if core_load(app_dict, "exit"):
+            child_exit_routine(trace, app_dict)
 
-        # No join, if waiting processes already got a new task assigned
-        with app_dict["morpy"]["proc_waiting"].lock:
-            proc_waiting = app_dict["morpy"]["proc_waiting"]
-        for _p, _t in proc_waiting.items():
-            if _t[0] is not None:
-                return
+        # Retire the worker to free its memory, a fresh process will take its place.
+        if pool_recycle_due(trace, app_dict, tasks_done)["recycle"]:
+            pool_retire(trace, app_dict)
 
-        # Have in mind, that the orchestrator is never waiting (therefore +1).
-        if len(app_dict["morpy"]["proc_busy"].keys()) == (len(proc_waiting.keys()) + 1):
-            app_dict["morpy"]["proc_joined"] = True
+        # Retire the worker, as the autoscaler scales down.
+        if autoscale and pool_scale_down_due(trace, app_dict)["retire"]:
+            pool_retire(trace, app_dict)
+
+        # Check for a shelved task and run it
+        task_claimed = claim_task(trace, app_dict)
+        if task_claimed:
+            tasks_done += 1
+
+        # Complete the async tasks done in the meantime.
+        collect(trace, app_dict)
+
+        # Check for Interrupt / exit
+        stop_while_interrupt(trace, app_dict)
+
+        # Go on with the tasks queued to this process before waiting for new ones.
+        if task_claimed:
+            continue
+
+        # Re-/subscribe to waiting dictionary.
+        subscribe_waiting(trace, app_dict)
+
+        # Block until a task is shelved or an exit is requested.
+        wait_process(trace["process_id"])
+
+
+# Suppress linting for mandatory arguments.
+# noinspection PyUnusedLocal
+@core_wrap
+def pool_warm_up(trace: dict, app_dict: dict) -> None:
+    r"""
+    Task enqueued by the orchestrator to spawn the worker pool at startup. The task itself does
+    nothing, the spawned process will enter pool_worker() right after.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    # Pool worker warmed up.
+    log(trace, app_dict, "debug",
+        lambda: f'{app_dict["loc"]["morpy"]["pool_warm_up"]}')
+
+
+@core_wrap
+def pool_warm_imports(trace: dict, app_dict: dict) -> None:
+    r"""
+    Imports the modules configured in "processes_pool_warm_imports" once, when a pool worker starts.
+    Modules that fail to import are logged and skipped, so the task importing them later will raise
+    the actual error in its own context.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
 
-            # Reset delayed join, once joining is complete.
-            with app_dict["morpy"]["orchestrator"].lock:
-                app_dict["morpy"]["orchestrator"]["delayed_join"] = False
+    import importlib
 
-            # All child processes are joined.
-            log(trace, app_dict, "debug",
-                lambda: f'{app_dict["loc"]["morpy"]["check_child_processes_joined"]}')
+    for module_name in app_dict["morpy"]["conf"]["processes_pool_warm_imports"]:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            # Warm import of a module failed.
+            log(trace, app_dict, "warning",
+                lambda: f'{app_dict["loc"]["morpy"]["pool_warm_imports_fail"]}\n'
+                        f'{app_dict["loc"]["morpy"]["pool_warm_imports_module"]}: {module_name}\n{e}')
 
 
 @core_wrap
-def join_or_task(trace: dict, app_dict: dict, reset_trace: bool = False, reset_w_prefix: str=None) -> None:
+def pool_recycle_due(trace: dict, app_dict: dict, tasks_done: int) -> dict:
     r"""
-    Waits in a loop until all spawned tasks have completed or a new task appears for the current process.
-    This function is used to synchronize transitions between app phases (e.g. after initialization,
-    before running, or before exiting).
+    Evaluates whether a pool worker has to be recycled, because it exceeded the maximum amount of
+    tasks or the maximum resident memory configured.
 
     :param trace: operation credentials and tracing information
     :param app_dict: morPy global dictionary containing app configurations
-    :param reset_trace: If True, the trace will be reset/lost.
-    :param reset_w_prefix: If reset_trace is True, a custom prefix can be set in order to retain
-        a customized trace.
+    :param tasks_done: Number of tasks the worker executed so far.
 
-    :example:
-        join_or_task(trace, app_dict)
-
-    TODO add idle_timeout to stop waiting for task shelving
+    :return: dict
+        recycle: If True, the worker is due for recycling.
     """
 
-    import time
+    recycle: bool = False
+    max_tasks: int | None = app_dict["morpy"]["conf"]["processes_pool_max_tasks"]
+    max_rss_mb: int | None = app_dict["morpy"]["conf"]["processes_pool_max_rss_mb"]
 
-    module: str = 'lib.mp'
-    operation: str = 'join_or_task(~)'
-    trace: dict = morpy_fct.tracing(module, operation, trace, reset=reset_trace, reset_w_prefix=reset_w_prefix)
+    if isinstance(max_tasks, int) and tasks_done >= max_tasks:
+        recycle = True
 
-    my_pid: int = trace["process_id"]
+        # Pool worker recycled.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["pool_worker_recycle"]}\n'
+                    f'{app_dict["loc"]["morpy"]["pool_worker_recycle_tasks"]}: {tasks_done}')
 
-    # Check for Interrupt / exit
-    stop_while_interrupt(trace, app_dict)
+    elif isinstance(max_rss_mb, int):
+        import psutil
+        rss_mb: float = psutil.Process().memory_info().rss / 1024**2
 
-    # Skip if run by master / single process mode
-    proc_master = app_dict["morpy"]["proc_master"]
-    if my_pid != proc_master:
-        # Waiting for processes to finish or task to run.
-        log(trace, app_dict, "debug",
-            lambda: f'{app_dict["loc"]["morpy"]["join_or_task_start"]}')
+        if rss_mb >= max_rss_mb:
+            recycle = True
 
-        proc_joined = False
-        while not proc_joined:
+            # Pool worker recycled.
+            log(trace, app_dict, "debug",
+                lambda: f'{app_dict["loc"]["morpy"]["pool_worker_recycle"]}\n'
+                        f'{app_dict["loc"]["morpy"]["pool_worker_recycle_rss"]}: {rss_mb:.2f}')
 
-            # Exit if required
-            with app_dict["morpy"].lock:
-                exit_flag = app_dict["morpy"]["exit"]
-            if exit_flag:
-                child_exit_routine(trace, app_dict)
-                sys.exit()
+    return {
+        "recycle" : recycle
+    }
 
-            # Wait time to avoid busy wait
-            time.sleep(0.05)    # 0.05 seconds = 50 milliseconds
 
-            # Check for a shelved task
-            with app_dict["morpy"]["proc_waiting"].lock:
-                proc_waiting = app_dict["morpy"]["proc_waiting"]
-                task, priority, task_id = proc_waiting.get(my_pid, (None, None, None))
+# Suppress linting for mandatory arguments.
+# noinspection PyUnusedLocal
+@core_wrap
+def pool_scale_down_due(trace: dict, app_dict: dict) -> dict:
+    r"""
+    Evaluates whether a pool worker has to retire, because the autoscaler scales down (see
+    MorPyAutoscaler). The first workers to check on it retire, as many as requested.
 
-                # Unsubscribe from waiting dictionary if a task was assigned.
-                if task:
-                    proc_waiting.pop(my_pid)
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
 
-            if task:
-                # Check for Interrupt / exit
-                stop_while_interrupt(trace, app_dict)
+    :return: dict
+        retire: If True, the worker is due for retiring.
+    """
 
-                # Assign task ID to own trace and claim task
-                trace["task_id"] = task_id
-                task[1] = trace
+    retire: bool = False
 
-                # Recreate UltraDict references in task and run it.
-                task_recreated = reattach_ultradict_refs(task)
-                execute = task_to_partial(task_recreated)
-                execute()
+    with app_dict["morpy"]["orchestrator"].lock:
+        if app_dict["morpy"]["orchestrator"].get("retire", 0) > 0:
+            app_dict["morpy"]["orchestrator"]["retire"] -= 1
+            retire = True
 
-                # Clean up
-                del task
-                del task_recreated
+    if retire:
+        # Pool worker retired by the autoscaler.
+        log(trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["pool_scale_down"]}')
 
-            # Check for Interrupt / exit
-            stop_while_interrupt(trace, app_dict)
+    return {
+        "retire" : retire
+    }
 
-            # Re-/subscribe to waiting dictionary.
-            with app_dict["morpy"]["proc_waiting"].lock:
-                proc_waiting = app_dict["morpy"]["proc_waiting"]
-                if not proc_waiting.get(my_pid, None):
-                    # Add task to waiting dictionary without a shelved task.
-                    proc_waiting.update({my_pid: (None, None, None)})
 
-            # Check, if processes have been joined yet.
-            with app_dict["morpy"].lock:
-                proc_joined = app_dict["morpy"]["proc_joined"]
+@core_wrap
+def pool_retire(trace: dict, app_dict: dict) -> None:
+    r"""
+    Retires a pool worker. A task shelved to the worker in the meantime is handed back to the
+    orchestrator before the process references are cleaned up and the process exits.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    # Hand back a task, that was shelved right before retiring.
+    unsubscribe_waiting(trace, app_dict)
+
+    # Finish the async tasks still running.
+    from lib.aio import drain
+    drain(trace, app_dict)
+
+    child_exit_routine(trace, app_dict)
 
 
 @core_wrap
@@ -900,11 +3192,10 @@ def interrupt(trace: dict, app_dict: dict) -> None:
     log(trace, app_dict, "warning",
         lambda: f'{app_dict["loc"]["morpy"]["interrupt_set"]}')
 
-    if isinstance(app_dict, UltraDict):
-        with app_dict["morpy"]:
-            app_dict["morpy"]["interrupt"] = True
-    else:
-        app_dict["morpy"]["interrupt"] = True
+    # Hold waiting processes before raising the flag.
+    interrupt_hold()
+
+    core_store(app_dict, "interrupt", True)
 
 
 @core_wrap
@@ -925,8 +3216,7 @@ def stop_while_interrupt(trace: dict, app_dict: dict) -> None:
     exit_flag: bool = False
 
     if app_dict["morpy"]["processes_max"] > 1:
-        with app_dict["morpy"].lock:
-            interrupt_flag = app_dict["morpy"]["interrupt"]
+        interrupt_flag = core_load(app_dict, "interrupt")
 
         if interrupt_flag:
             # Global interrupt. Process is waiting for release.
@@ -934,10 +3224,9 @@ def stop_while_interrupt(trace: dict, app_dict: dict) -> None:
             lambda: f'{app_dict["loc"]["morpy"]["stop_while_interrupt"]}')
 
         while interrupt_flag and not exit_flag:
-            time.sleep(0.05)
-            with app_dict["morpy"].lock:
-                interrupt_flag = app_dict["morpy"]["interrupt"]
-                exit_flag = app_dict["morpy"]["exit"]
+            wait_release()
+            interrupt_flag = core_load(app_dict, "interrupt")
+            exit_flag = core_load(app_dict, "exit")
 
         if exit_flag:
             with app_dict["morpy"].lock:
@@ -983,17 +3272,338 @@ def shared_dict(name: str = None, create: bool = False, shared_lock: bool = True
     return connect_udict
 
 
+# Ring buffer carrying shelved tasks to the orchestrator. Attached once per process.
+_heap_ring: SharedRingBuffer | None = None
+
+
+def heap_ring_init(app_dict: dict) -> None:
+    r"""
+    Creates the ring buffer carrying shelved tasks from child processes to the orchestrator and
+    publishes its name in app_dict["morpy"]["heap_ring"]. Only to be called by the orchestrator in
+    multiprocessing mode.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    from lib.init import obscure_shared_name
+
+    global _heap_ring
+    _heap_ring = SharedRingBuffer(
+        name=obscure_shared_name(),
+        create=True,
+        slots=app_dict["morpy"]["conf"]["processes_ring_slots"],
+        slot_size=app_dict["morpy"]["conf"]["processes_ring_slot_size"]
+    )
+
+    with app_dict["morpy"].lock:
+        app_dict["morpy"]["heap_ring"] = _heap_ring.name
+
+
+def heap_ring(app_dict: dict) -> SharedRingBuffer | None:
+    r"""
+    Returns the task ring buffer, attaching to it on first use in the calling process.
+
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: SharedRingBuffer instance or None, if there is no ring buffer (single process mode).
+    """
+
+    global _heap_ring
+    if _heap_ring is None:
+        ring_name = app_dict["morpy"].get("heap_ring", None)
+        if ring_name:
+            _heap_ring = SharedRingBuffer(name=ring_name)
+    return _heap_ring
+
+
+def heap_ring_push(app_dict: dict, task_qed: tuple) -> None:
+    r"""
+    Pushes a shelved task to the ring buffer. If the ring buffer is full or the serialized task
+    exceeds its slot size, the task is put on the heap shelf instead.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param task_qed: Shelved task (priority, task_id, task_sys_id, task_sanitized, is_process)
+    """
+
+    heap_ring_push_batch(app_dict, [task_qed])
+
+
+def heap_ring_push_batch(app_dict: dict, tasks_qed: list) -> None:
+    r"""
+    Pushes shelved tasks to the ring buffer. Tasks not fitting into the ring buffer are put on the
+    heap shelf instead, all within a single locked section.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param tasks_qed: List of shelved tasks (priority, task_id, task_sys_id, task_sanitized, is_process)
+    """
+
+    tasks_overflow: dict = {}
+
+    ring = heap_ring(app_dict)
+    for task_qed in tasks_qed:
+        if not (ring and ring.put(pickle.dumps(task_qed, protocol=pickle.HIGHEST_PROTOCOL))):
+            tasks_overflow[task_qed[1]] = task_qed
+
+    if tasks_overflow:
+        with app_dict["morpy"]["heap_shelf"].lock:
+            app_dict["morpy"]["heap_shelf"].update(tasks_overflow)
+
+
+def heap_ring_release(unlink: bool=False) -> None:
+    r"""
+    Detaches the calling process from the task ring buffer.
+
+    :param unlink: If True, the ring buffer is destroyed. Only to be used by the orchestrator.
+    """
+
+    global _heap_ring
+    if _heap_ring:
+        _heap_ring.close()
+        if unlink:
+            _heap_ring.unlink()
+        _heap_ring = None
+
+
+# Ring buffer carrying log records of child processes to the log writer of the orchestrator. Attached
+# once per process.
+_log_ring: SharedRingBuffer | None = None
+
+
+def log_ring_init(app_dict: dict) -> None:
+    r"""
+    Creates the ring buffer carrying log records from child processes to the log writer of the
+    orchestrator and publishes its name in app_dict["morpy"]["log_ring"]. Only to be called by the
+    orchestrator in multiprocessing mode.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    from lib.init import obscure_shared_name
+
+    global _log_ring
+    _log_ring = SharedRingBuffer(
+        name=obscure_shared_name(),
+        create=True,
+        slots=app_dict["morpy"]["conf"]["log_ring_slots"],
+        slot_size=app_dict["morpy"]["conf"]["log_ring_slot_size"]
+    )
+
+    with app_dict["morpy"].lock:
+        app_dict["morpy"]["log_ring"] = _log_ring.name
+
+
+def log_ring(app_dict: dict) -> SharedRingBuffer | None:
+    r"""
+    Returns the log ring buffer, attaching to it on first use in the calling process.
+
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: SharedRingBuffer instance or None, if there is no ring buffer (single process mode).
+    """
+
+    global _log_ring
+    if _log_ring is None:
+        ring_name = app_dict["morpy"].get("log_ring", None)
+        if ring_name:
+            _log_ring = SharedRingBuffer(name=ring_name)
+            atexit.register(_log_ring.close)
+    return _log_ring
+
+
+def log_ring_push(app_dict: dict, record: tuple) -> bool:
+    r"""
+    Pushes a log record to the log ring buffer and wakes up the log writer of the orchestrator.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param record: Log record (trace, log_dict, write_log_txt, write_log_db, print_log)
+
+    :return: False, if the ring buffer is full, the serialized record exceeds its slot size or there
+        is no ring buffer. The record has to be handed to the orchestrator otherwise.
+    """
+
+    ring = log_ring(app_dict)
+    if ring and ring.put(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)):
+        notify_log_writer()
+        return True
+    return False
+
+
+def log_ring_release(unlink: bool=False) -> None:
+    r"""
+    Detaches the calling process from the log ring buffer.
+
+    :param unlink: If True, the ring buffer is destroyed. Only to be used by the orchestrator.
+    """
+
+    global _log_ring
+    if _log_ring:
+        _log_ring.close()
+        if unlink:
+            _log_ring.unlink()
+        _log_ring = None
+
+
+# Hot flags and counters of app_dict["morpy"], kept as atomics in shared memory in multiprocessing mode
+# instead of behind the lock of app_dict["morpy"]. The position of a key is its offset in memory.
+CORE_ATOMICS: tuple = (
+    "interrupt", "exit", "proc_joined", "init_complete", "tasks_async", "tasks_created",
+    "events_total", "events_INIT", "events_DEBUG", "events_INFO", "events_WARNING", "events_DENIED",
+    "events_ERROR", "events_CRITICAL", "events_EXIT", "events_UNDEFINED"
+)
+
+# Atomics of the hot flags and counters. Attached once per process.
+_core_atomics: SharedAtomics | None = None
+
+
+def core_atomics_init(app_dict: dict) -> None:
+    r"""
+    Creates the atomics holding the hot flags and counters of app_dict["morpy"] (see CORE_ATOMICS) and
+    publishes their name in app_dict["morpy"]["core_atomics"]. Only to be called at initialization in
+    multiprocessing mode.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    from lib.init import obscure_shared_name
+
+    global _core_atomics
+    _core_atomics = SharedAtomics(CORE_ATOMICS, name=obscure_shared_name(), create=True)
+    atexit.register(_core_atomics.close)
+
+    with app_dict["morpy"].lock:
+        app_dict["morpy"]["core_atomics"] = _core_atomics.name
+
+
+def core_atomics(app_dict: dict) -> SharedAtomics | None:
+    r"""
+    Returns the atomics of the hot flags and counters, attaching to them on first use in the calling
+    process.
+
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: SharedAtomics instance or None, if the flags are kept in app_dict["morpy"] (single process
+        mode and thread backend).
+    """
+
+    global _core_atomics
+    if _core_atomics is None:
+        atomics_name = app_dict["morpy"].get("core_atomics", None)
+        if atomics_name:
+            _core_atomics = SharedAtomics(CORE_ATOMICS, name=atomics_name)
+            atexit.register(_core_atomics.close)
+    return _core_atomics
+
+
+def core_load(app_dict: dict, key: str) -> int:
+    r"""
+    Reads a hot flag or counter of app_dict["morpy"] (see CORE_ATOMICS) without taking the lock of
+    app_dict["morpy"] in multiprocessing mode.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param key: Key of the flag or counter, i.e. "exit"
+
+    :return: Value of the counter. Flags are returned as 0 or 1 in multiprocessing mode.
+
+    :example:
+        if core_load(app_dict, "exit"):
+            child_exit_routine(trace, app_dict)
+    """
+
+    block = core_atomics(app_dict)
+    if block:
+        return block.load(key)
+
+    with conditional_lock(app_dict["morpy"]):
+        return app_dict["morpy"][key]
+
+
+def core_store(app_dict: dict, key: str, value: int | bool) -> None:
+    r"""
+    Overwrites a hot flag or counter of app_dict["morpy"] (see CORE_ATOMICS).
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param key: Key of the flag or counter, i.e. "exit"
+    :param value: New value
+    """
+
+    block = core_atomics(app_dict)
+    if block:
+        block.store(key, value)
+        return
+
+    with conditional_lock(app_dict["morpy"]):
+        app_dict["morpy"][key] = value
+
+
+def core_add(app_dict: dict, key: str, delta: int=1) -> int:
+    r"""
+    Adds to a hot counter of app_dict["morpy"] (see CORE_ATOMICS) without losing concurrent additions.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param key: Key of the counter, i.e. "tasks_async"
+    :param delta: Value to be added, may be negative.
+
+    :return: Value of the counter after the addition
+    """
+
+    block = core_atomics(app_dict)
+    if block:
+        return block.fetch_add(key, delta) + delta
+
+    with conditional_lock(app_dict["morpy"]):
+        app_dict["morpy"][key] += delta
+        return app_dict["morpy"][key]
+
+
+def tasks_cancelled_unlink(app_dict: dict) -> None:
+    r"""
+    Destroys the shards of app_dict["morpy"]["tasks_cancelled"], if it is a sharded store (see
+    lib.store). Only to be used by the orchestrator, once all child processes exited.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    from lib.store import ShardedDict
+
+    tasks_cancelled = app_dict["morpy"].get("tasks_cancelled", None)
+    if isinstance(tasks_cancelled, ShardedDict):
+        tasks_cancelled.unlink()
+
+
+def core_atomics_unlink() -> None:
+    r"""
+    Requests the atomics of the hot flags and counters to be destroyed, once all child processes
+    exited. The calling process stays attached, so the flags remain readable until the app ends. Only
+    to be used by the orchestrator.
+    """
+
+    if _core_atomics:
+        _core_atomics.unlink()
+
+
 @core_wrap
 def child_exit_routine(trace: dict, app_dict: dict | UltraDict) -> None:
     r"""
     Performs cleanup of a terminating child process by removing its references from busy and waiting
-    process registers. After cleanup, the function terminates the process with sys.exit().
+    process registers. Tasks queued to the process are handed back to the orchestrator. The process
+    leaves the busy processes last, as the orchestrator terminates processes running without being busy
+    (see check_child_processes()). After cleanup, the function terminates the process with sys.exit().
 
     :param trace: Operation credentials and tracing information
     :param app_dict: morPy global dictionary containing app configurations
     """
 
     try:
+        with app_dict["morpy"]["proc_waiting"].lock:
+            proc_waiting = app_dict["morpy"]["proc_waiting"]
+            if proc_waiting.get(trace['process_id'], None):
+                proc_waiting.pop(trace['process_id'])
+
+        # Hand back the tasks queued to the process. Blocked, so that no tasks are queued to it anymore.
+        with app_dict["morpy"]["proc_blocked"].lock:
+            app_dict["morpy"]["proc_blocked"][trace["process_id"]] = None
+        deque_release(trace, app_dict, process_id=trace["process_id"])
+
         # Remove own process references
         with app_dict["morpy"]["proc_available"].lock:
             with app_dict["morpy"]["proc_busy"].lock:
@@ -1002,17 +3612,18 @@ def child_exit_routine(trace: dict, app_dict: dict | UltraDict) -> None:
                 # Add to processes available IDs (hygiene only, no other use at app exit)
                 app_dict["morpy"]["proc_available"][trace["process_id"]] = None
 
-        with app_dict["morpy"]["proc_waiting"].lock:
-            proc_waiting = app_dict["morpy"]["proc_waiting"]
-            if proc_waiting.get(trace['process_id'], None):
-                proc_waiting.pop(trace['process_id'])
-
     # In case of a KeyError, the processes references were already cleaned up. This
     # may happen when an exit is requested and the spawned process still cleans up
     # regularly.
     except KeyError:
         pass
 
+    with app_dict["morpy"]["proc_blocked"].lock:
+        app_dict["morpy"]["proc_blocked"].pop(trace["process_id"], None)
+
+    # Let the orchestrator re-check on joining and exiting.
+    notify_orchestrator()
+
     sys.exit()
 
 
@@ -1033,6 +3644,78 @@ def is_udict(obj) -> bool:
     return check
 
 
+@core_wrap
+def run_chunk(trace: dict, app_dict: dict, tasks: list=None, task_ids: list=None, key: str=None) -> None:
+    r"""
+    Runs a chunk of tasks coalesced by the orchestrator one after another, each with its own task ID.
+    An exception raised by a task is logged and does not affect the other tasks of the chunk. Once
+    done, the average duration of the tasks is reported to the orchestrator to size the next chunks.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param tasks: Tasks of the chunk, see MorPyOrchestrator._coalesce()
+    :param task_ids: IDs of the tasks
+    :param key: Key of the callable of the tasks, see task_key()
+    """
+
+    from lib.aio import run_task
+
+    time_start = time.perf_counter()
+
+    for task, task_id in zip(tasks, task_ids):
+        # Check for Interrupt / exit
+        stop_while_interrupt(trace, app_dict)
+
+        # Run the task with the own trace
+        trace_task = {**trace, "task_id" : task_id}
+        if len(task) > 1 and isinstance(task[1], dict) and "process_id" in task[1]:
+            task[1] = trace_task
+
+        try:
+            run_task(trace_task, app_dict, task_to_partial(task))
+        except Exception as e:
+            # A task of a chunk failed. Continuing with the next one.
+            log(trace_task, app_dict, "error",
+                lambda: f'{app_dict["loc"]["morpy"]["run_chunk_task_failed"]}\n'
+                        f'{type(e).__name__}: {e}')
+
+    duration = (time.perf_counter() - time_start) / len(tasks)
+
+    # Exponentially weighted moving average, smoothing out outliers.
+    with app_dict["morpy"]["orchestrator"].lock:
+        task_durations = app_dict["morpy"]["orchestrator"]["task_durations"]
+        duration_avg = task_durations.get(key, None)
+        task_durations[key] = duration if duration_avg is None else 0.7 * duration_avg + 0.3 * duration
+        app_dict["morpy"]["orchestrator"]["task_durations"] = task_durations
+
+
+def task_key(task: Any) -> str | None:
+    r"""
+    Identifies the callable of a task to decide, whether tasks may be coalesced. A task wrapping another
+    task in its keyword argument "task" (i.e. tasks returning a future) is identified by the task wrapped.
+
+    :param task: Task as a list, see normalize_task()
+
+    :return: Module and qualified name of the callable or None, if the task is not a list.
+
+    :example:
+        task_key([my_func, trace, app_dict]) # "app.run.my_func"
+    """
+
+    if not isinstance(task, list) or not task:
+        return None
+
+    func = task[0]
+    if isinstance(task[-1], MorPyTaskArgs):
+        inner = task[-1].task
+    else:
+        inner = task[-1].get("task", None) if isinstance(task[-1], dict) else None
+    if isinstance(inner, list) and inner:
+        func = inner[0]
+
+    return f'{getattr(func, "__module__", None)}.{getattr(func, "__qualname__", repr(func))}'
+
+
 def normalize_task(task: Any) -> list:
     r"""
     Converts a task given as a callable, list, tuple, or functools.partial into a standard
@@ -11,11 +11,264 @@ Descr.:     This module delivers functions to debug, warn and log any operations
 import lib.fct as morpy_fct
 from lib.common import textfile_write
 from lib.decorators import core_wrap
-from lib.mp import is_udict
+from lib.mp import (heap_ring_push, core_add, core_load, core_store, notify_orchestrator, notify_exit, interrupt_hold,
+                    interrupt_release, wait_release, log_ring, log_ring_push, notify_log_writer, wait_log_writer)
 
+import os
 import sys
 import time
+import atexit
+import pickle
+import threading
+from collections import deque
 from sqlite3 import Connection as sqlite3_Connection
+from UltraDict import UltraDict
+
+# Serializes logs written directly, i.e. by the threads of the thread backend.
+_log_lock = threading.RLock()
+
+
+class MorPyLogWriter:
+    r"""
+    Thread of the orchestrator writing the logs of all processes in multiprocessing mode, so that the
+    orchestrator keeps dispatching tasks while logs are written to file, database and console. Child
+    processes push their log records to the log ring buffer (see lib.mp.log_ring_push()), the
+    orchestrator queues its own records locally.
+
+    UltraDict applies updates of other processes without a lock when read, so it must not be read by
+    two threads of the same process. The writer works on a plain copy of the configuration and the
+    localization instead (see log_view()), which do not change after initialization.
+    """
+
+    __slots__ = [
+        '_queue',
+        '_retry',
+        '_stop',
+        'app_dict',
+        'thread'
+    ]
+
+    # Attempts to write a log record, before it is printed to the standard error stream.
+    _ATTEMPTS: int = 3
+
+
+    def __init__(self, app_dict: dict) -> None:
+        r"""
+        Starts the log writer thread.
+
+        :param app_dict: morPy global dictionary containing app configurations
+        """
+
+        self.app_dict: dict = log_view(app_dict)
+        self._queue: deque = deque()    # (trace, log_dict, write_log_txt, write_log_db, print_log)
+        self._retry: deque = deque()    # (attempt, record)
+        self._stop: bool = False
+
+        self.thread = threading.Thread(target=self._run, name='morPy_log_writer', daemon=True)
+        self.thread.start()
+
+
+    def put(self, record: tuple) -> None:
+        r"""
+        Queues a log record of the orchestrator to be written.
+
+        :param record: Log record (trace, log_dict, write_log_txt, write_log_db, print_log)
+        """
+
+        self._queue.append(record)
+        notify_log_writer()
+
+
+    def _run(self) -> None:
+        r"""
+        Writes the log records queued or pushed to the log ring buffer until stop() is called. The
+        records left are written before the thread ends, including those to be written again.
+        """
+
+        while True:
+            stop = self._stop
+            self._write()
+            if stop and not self._retry:
+                break
+            wait_log_writer()
+
+
+    def _write(self) -> None:
+        r"""
+        Writes all log records available at once.
+        """
+
+        records: list = []
+
+        # Records failed before are written first, keeping the order of the logs.
+        while self._retry:
+            records.append(self._retry.popleft())
+
+        ring = log_ring(self.app_dict)
+        if ring:
+            records.extend((1, pickle.loads(payload)) for payload in ring.get_batch())
+
+        while self._queue:
+            records.append((1, self._queue.popleft()))
+
+        for attempt, record in records:
+            trace, log_dict, write_log_txt, write_log_db, print_log = record
+            try:
+                log_task(trace, self.app_dict, log_dict, write_log_txt, write_log_db, print_log)
+            except Exception as e:
+                # A log that failed to be written must not keep the others from being written.
+                self._failed(attempt, record, e)
+
+        # Rows of the logging database waiting longer than "log_db_batch_interval".
+        log_sink_flush(due=True)
+
+
+    def _failed(self, attempt: int, record: tuple, e: Exception) -> None:
+        r"""
+        Handles a log record that failed to be written. The failure is reported to the standard error
+        stream and the record is queued to be written again with the next batch, to the text log only,
+        as the logging database is the most likely cause. Once the attempts are used up, the log
+        message itself is printed to the standard error stream, so it is not lost.
+
+        :param attempt: Number of the failed attempt, starting at 1.
+        :param record: Log record (trace, log_dict, write_log_txt, write_log_db, print_log)
+        :param e: Exception raised by the attempt.
+        """
+
+        trace, log_dict, write_log_txt, write_log_db, print_log = record
+        stream = sys.__stderr__
+
+        try:
+            if stream:
+                stream.write(f'morPy log writer: {type(e).__name__}: {e}\n')
+
+            if attempt < self._ATTEMPTS and (write_log_txt or write_log_db):
+                self._retry.append((attempt + 1, (trace, log_dict, True, False, print_log)))
+            elif stream:
+                stream.write(f'{log_dict.get("log_msg_complete", log_dict)}\n')
+                stream.flush()
+        except Exception:
+            # The standard error stream may be closed already on exit.
+            pass
+
+
+    def stop(self) -> None:
+        r"""
+        Writes the log records left and waits for the thread to end.
+        """
+
+        self._stop = True
+        notify_log_writer()
+        self.thread.join()
+
+
+# Log writer of the orchestrator. None in child processes, single process mode and with the thread
+# backend, as well as once the orchestrator is done.
+_log_writer: MorPyLogWriter | None = None
+
+
+class MorPyLogSink:
+    r"""
+    Logging database of a process. Holds a single connection to the database and buffers the log rows,
+    which are inserted with one executemany() in a single transaction, once "log_db_batch_rows" rows
+    are buffered or the oldest row waited for "log_db_batch_interval" seconds (see config.py). Rows are
+    only checked for being due when a log is written, by the log writer of the orchestrator in addition.
+    Logs raising an interrupt are inserted right away, as well as all rows left on end_runtime().
+
+    The pragmas of the connection are set once. Not thread-safe, calls are serialized by the log lock.
+    """
+
+    __slots__ = [
+        'conn',
+        'flush_interval',
+        'flush_rows',
+        'pid',
+        'rows',
+        'rows_since',
+        'statement'
+    ]
+
+
+    def __init__(self, conn: sqlite3_Connection, table_name: str, flush_rows: int,
+                 flush_interval: float) -> None:
+        r"""
+        Sets up the connection to insert rows into a log table.
+
+        :param conn: SQLite3 connection of the logging database, see log_db_connect()
+        :param table_name: Name of the log table
+        :param flush_rows: Rows buffered at most, before they are inserted.
+        :param flush_interval: Time in seconds a row is buffered at most, before it is inserted.
+        """
+
+        self.conn: sqlite3_Connection = conn
+        self.conn.execute('pragma journal_mode=wal;')
+        self.conn.execute('pragma synchronous=normal;')
+
+        self.statement: str = (f'INSERT INTO {table_name} (\'level\',\'process_id\',\'thread_id\',\'task_id\','
+                               f'\'datetimestamp\',\'module\',\'operation\',\'tracing\',\'message\') '
+                               f'VALUES (?,?,?,?,?,?,?,?,?)')
+        self.flush_rows: int = max(flush_rows, 1)
+        self.flush_interval: float = flush_interval
+        self.pid: int = os.getpid()
+        self.rows: list = []
+        self.rows_since: float | None = None
+
+
+    def add(self, row: tuple) -> None:
+        r"""
+        Buffers a log row.
+
+        :param row: Values of the row in the order of the columns of the log table
+        """
+
+        if not self.rows:
+            self.rows_since = time.monotonic()
+        self.rows.append(row)
+
+
+    def due(self) -> bool:
+        r"""
+        Returns True, if the rows buffered have to be inserted.
+        """
+
+        return bool(self.rows) and (len(self.rows) >= self.flush_rows
+                                    or time.monotonic() - self.rows_since >= self.flush_interval)
+
+
+    def flush(self) -> int:
+        r"""
+        Inserts the rows buffered in a single transaction.
+
+        :return: Number of rows inserted
+        """
+
+        rows = self.rows
+        if not rows:
+            return 0
+
+        self.rows = []
+        self.rows_since = None
+
+        # The transaction is committed once all rows are inserted, or rolled back altogether.
+        with self.conn:
+            self.conn.executemany(self.statement, rows)
+
+        return len(rows)
+
+
+    def close(self) -> None:
+        r"""
+        Inserts the rows left and closes the connection.
+        """
+
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+
+
+# Logging database of the process, see log_db_sink(). Reset in forked child processes.
+_log_sink: MorPyLogSink | None = None
 
 
 def log(trace: dict, app_dict: dict, level: str, message: callable, verbose: bool) -> None:
@@ -42,21 +295,8 @@ def log(trace: dict, app_dict: dict, level: str, message: callable, verbose: boo
 
     try:
         # Wait for an interrupt to end
-        udict_true = is_udict(app_dict["morpy"])
-        if udict_true:
-            with app_dict["morpy"].lock:
-                interrupt = app_dict["morpy"]["interrupt"]
-        else:
-            interrupt = app_dict["morpy"]["interrupt"]
-
-        while interrupt:
-            time.sleep(0.05)
-            if udict_true:
-                with app_dict["morpy"].lock:
-                    interrupt = app_dict["morpy"]["interrupt"]
-            else:
-                interrupt = app_dict["morpy"]["interrupt"]
-
+        while core_load(app_dict, "interrupt"):
+            wait_release()
 
         # Event handling (counting and formatting)
         log_event_dict = log_event_handler(level)
@@ -64,7 +304,8 @@ def log(trace: dict, app_dict: dict, level: str, message: callable, verbose: boo
         # The log level will be evaluated as long as logging or prints to console are enabled. The
         # trace may be manipulated.
         if app_dict["morpy"]["conf"]["msg_print"] or app_dict["morpy"]["conf"]["log_enable"]:
-            trace_eval = log_eval(trace, app_dict, log_event_dict["level"])
+            with _log_lock:
+                trace_eval = log_eval(trace, app_dict, log_event_dict["level"])
 
         # Retrieve a log specific datetimestamp
         time_lst = morpy_fct.datetime_now()
@@ -101,10 +342,16 @@ def log(trace: dict, app_dict: dict, level: str, message: callable, verbose: boo
         print_log = app_dict["morpy"]["conf"]["msg_print"]
 
         if trace["process_id"] == app_dict["morpy"]["proc_master"]:
-            # Go on with logging directly if calling process is orchestrator.
-            log_task(trace, app_dict, log_dict, write_log_txt, write_log_db, print_log)
-        else:
-            # Enqueue the orchestrator task
+            writer = _log_writer
+            if writer and threading.current_thread() is not writer.thread:
+                # Hand the log to the log writer, so that the orchestrator goes on dispatching tasks.
+                writer.put((dict(trace), log_dict, write_log_txt, write_log_db, print_log))
+            else:
+                # Go on with logging directly if calling process is orchestrator.
+                with _log_lock:
+                    log_task(trace, app_dict, log_dict, write_log_txt, write_log_db, print_log)
+        elif not log_ring_push(app_dict, (dict(trace), log_dict, write_log_txt, write_log_db, print_log)):
+            # Log ring buffer full or log too large. Enqueue the orchestrator task instead.
             task = [log_task, trace, app_dict, log_dict, write_log_txt, write_log_db, print_log]
             log_enqueue(app_dict, task=task)
             # Generate print required for GUIs in the regarding child process.
@@ -124,11 +371,94 @@ def log(trace: dict, app_dict: dict, level: str, message: callable, verbose: boo
         del trace
 
 
+def log_writer_init(app_dict: dict) -> None:
+    r"""
+    Starts the log writer of the orchestrator. Only to be called by the orchestrator in multiprocessing
+    mode, once the log ring buffer was created (see lib.mp.log_ring_init()).
+
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    global _log_writer
+    _log_writer = MorPyLogWriter(app_dict)
+    atexit.register(log_writer_release)
+
+
+def log_writer_release() -> None:
+    r"""
+    Writes the logs left and stops the log writer of the orchestrator. Logs of the orchestrator are
+    written directly afterward.
+    """
+
+    global _log_writer
+    writer = _log_writer
+    if writer:
+        _log_writer = None
+        writer.stop()
+
+
+def log_sink_flush(due: bool=False) -> int:
+    r"""
+    Inserts the rows buffered for the logging database of the calling process.
+
+    :param due: If True, rows are only inserted if they are due, see MorPyLogSink.due().
+
+    :return: Number of rows inserted
+    """
+
+    with _log_lock:
+        sink = _log_sink
+        if sink and sink.pid == os.getpid() and (not due or sink.due()):
+            return sink.flush()
+    return 0
+
+
+def log_sink_close() -> None:
+    r"""
+    Inserts the rows left and closes the connection to the logging database of the calling process. A
+    new connection is opened by the next log written to the database.
+    """
+
+    global _log_sink
+    with _log_lock:
+        sink = _log_sink
+        if sink and sink.pid == os.getpid():
+            _log_sink = None
+            sink.close()
+
+
+def log_view(app_dict: dict) -> dict:
+    r"""
+    Copies the parts of app_dict needed to write logs into plain dictionaries, so that they may be read
+    by another thread than the main thread of a process.
+
+    :param app_dict: morPy global dictionary containing app configurations
+
+    :return: Dictionary shaped like app_dict, holding the configuration and localization of morPy
+    """
+
+    def plain(obj):
+        if isinstance(obj, (dict, UltraDict)):
+            return {key: plain(value) for key, value in obj.items()}
+        return obj
+
+    return {
+        "morpy" : {
+            "conf" : plain(app_dict["morpy"]["conf"]),
+            "init_loggingstamp" : app_dict["morpy"]["init_loggingstamp"],
+            "proc_master" : app_dict["morpy"]["proc_master"],
+        },
+        "loc" : {
+            "morpy" : plain(app_dict["loc"]["morpy"]),
+        },
+    }
+
+
 def log_enqueue(app_dict: dict, priority: int=-100, task: list=None) -> None:
     r"""
     Sanitizes UltraDict references within a logging task and adds the task to the shared heap shelf with
-    a default high priority for logging. This ensures that log messages from child processes are passed
-    to the orchestrator.
+    a default high priority for logging. Used by child processes, if a log does not fit into the log ring
+    buffer, so that it is written by the orchestrator itself.
 
     :param app_dict: morPy global dictionary containing app configurations
     :param priority: Integer representing task priority (lower is higher priority)
@@ -161,18 +491,17 @@ def log_enqueue(app_dict: dict, priority: int=-100, task: list=None) -> None:
         # Substitute UltraDict references in task to avoid recursion issues.
         task_sanitized = substitute(task)
 
-        with app_dict["morpy"].lock:
-            next_task_id = app_dict["morpy"]["tasks_created"] + 1
-
-            with app_dict["morpy"]["heap_shelf"].lock:
-                task_sys_id = id(task)
+        # Reserve a new task ID
+        next_task_id = core_add(app_dict, "tasks_created", 1)
 
-                # Push task to heap shelf
-                task_qed = (priority, next_task_id, task_sys_id, task_sanitized, False)
+        task_sys_id = id(task)
 
-                app_dict["morpy"]["heap_shelf"][next_task_id] = task_qed
+        # Push task to the ring buffer or the heap shelf
+        task_qed = (priority, next_task_id, task_sys_id, task_sanitized, False)
+        heap_ring_push(app_dict, task_qed)
 
-        app_dict["morpy"]["tasks_created"] += 1
+        # Wake up the orchestrator to write the log.
+        notify_orchestrator()
 
 
 def log_task(trace: dict, app_dict: dict, log_dict: dict, write_log_txt: bool, write_log_db: bool,
@@ -192,13 +521,15 @@ def log_task(trace: dict, app_dict: dict, log_dict: dict, write_log_txt: bool, w
         log_task(trace, app_dict, log_dict, write_log_txt, write_log_db, print_log)
     """
 
-    if write_log_txt:
-        # Write to text file - Fallback if SQLite functionality is broken
-        log_txt_write(log_dict, app_dict, log_dict)
+    # Logs may be written by the orchestrator and its log writer at once.
+    with _log_lock:
+        if write_log_txt:
+            # Write to text file - Fallback if SQLite functionality is broken
+            log_txt_write(log_dict, app_dict, log_dict)
 
-    if write_log_db:
-        # Write to logging database
-        log_db_write(log_dict, app_dict, log_dict)
+        if write_log_db:
+            # Write to logging database
+            log_db_write(log_dict, app_dict, log_dict)
 
     if print_log:
         # Print the events according to their log level
@@ -253,8 +584,8 @@ def log_eval(trace: dict, app_dict: dict, level: str) -> dict:
     # Count occurrences per log level. Count only if relevant regarding app parameters.
     # (see mpy_param.py to alter behaviour)
     if log_enable or pnt_enable:
-        app_dict["morpy"]["events_total"] += 1
-        app_dict["morpy"][f'events_{level.upper()}'] += 1
+        core_add(app_dict, "events_total", 1)
+        core_add(app_dict, f'events_{level.upper()}', 1)
 
     return trace_eval
 
@@ -310,14 +641,11 @@ def log_interrupt(trace: dict, app_dict: dict) -> None:
     trace: dict = morpy_fct.tracing(trace["module"], trace["operation"], trace)
     trace["log_enable"] = False
 
-    udict_true = is_udict(app_dict["morpy"])
+    # Hold waiting processes before raising the flag.
+    interrupt_hold()
 
     # Set the global interrupt flag
-    if udict_true:
-        with app_dict["morpy"].lock:
-            app_dict["morpy"]["interrupt"] = True
-    else:
-        app_dict["morpy"]["interrupt"] = True
+    core_store(app_dict, "interrupt", True)
 
     # INTERRUPT <<< Type [y]es to quit or anything else to try continuing.
     input_str_long: str = app_dict["loc"]["morpy"]["log_interrupt_yes"]
@@ -342,19 +670,15 @@ def log_interrupt(trace: dict, app_dict: dict) -> None:
     print('\n')
 
     if usr_input.strip().lower() in {input_str_short_1.lower(), input_str_long.lower()}:
-        # Reset the global interrupt flag
-        if udict_true:
-            with app_dict["morpy"].lock:
-                app_dict["morpy"]["exit"] = True
-        else:
-            app_dict["morpy"]["exit"] = False
+        # Set the global exit flag
+        core_store(app_dict, "exit", True)
+        notify_exit()
 
     # Reset the global interrupt flag
-    if udict_true:
-        with app_dict["morpy"].lock:
-            app_dict["morpy"]["interrupt"] = False
-    else:
-        app_dict["morpy"]["interrupt"] = False
+    core_store(app_dict, "interrupt", False)
+
+    # Wake up processes waiting for the release.
+    interrupt_release()
 
 
 def log_msg_builder(app_dict: dict, log_dict: dict) -> str:
@@ -508,7 +832,9 @@ def log_db_connect(trace: dict, app_dict: dict, db_path: str) -> sqlite3_Connect
     import sqlite3
 
     trace["log_enable"] = False
-    return sqlite3.connect(db_path)
+
+    # The connection may be used by the log writer of the orchestrator as well.
+    return sqlite3.connect(db_path, check_same_thread=False)
 
 
 @core_wrap
@@ -536,6 +862,7 @@ def log_db_table_create(trace: dict, app_dict: dict, db_path: str, table_name: s
     conn.execute(exec_statement)
     # Commit changes to the database
     conn.commit()
+    conn.close()
 
 
 @core_wrap
@@ -569,12 +896,44 @@ def log_db_table_add_column(trace: dict, app_dict: dict, db_path: str, table_nam
         # Commit changes to the database and close the cursor
         conn.commit()
 
+    conn.close()
+
+
+@core_wrap
+def log_db_sink(trace: dict, app_dict: dict, db_path: str, table_name: str) -> MorPyLogSink:
+    r"""
+    Returns the logging database of the calling process, connecting to it on first use. The
+    connection is kept until log_sink_close() is called, at the latest on exit.
+
+    :param trace: operation credentials and tracing
+    :param app_dict: morPy global dictionary
+    :param db_path: Path to the db to be addressed or altered
+    :param table_name: Name of the log table
+
+    :return: MorPyLogSink instance
+    """
+
+    global _log_sink
+
+    trace["log_enable"] = False
+
+    # A forked child process must not use the connection of its parent.
+    if _log_sink is None or _log_sink.pid != os.getpid():
+        conn = log_db_connect(trace, app_dict, db_path)
+        _log_sink = MorPyLogSink(conn, table_name,
+                                 app_dict["morpy"]["conf"]["log_db_batch_rows"],
+                                 app_dict["morpy"]["conf"]["log_db_batch_interval"])
+        atexit.register(log_sink_close)
+
+    return _log_sink
+
 
 @core_wrap
 def log_db_row_insert(trace: dict, app_dict: dict, db_path: str, table_name: str, log_dict: dict) -> dict[str, int | bool | None] | None:
     r"""
-    Inserts a new row (a log entry) into the designated log table. After execution, it returns the
-    newly inserted row’s ID.
+    Buffers a new row (a log entry) for the designated log table. The rows buffered are inserted at
+    once, as soon as they are due (see MorPyLogSink). Logs raising an interrupt are inserted right
+    away.
 
     :param trace: operation credentials and tracing
     :param app_dict: morPy global dictionary
@@ -583,44 +942,28 @@ def log_db_row_insert(trace: dict, app_dict: dict, db_path: str, table_name: str
     :param log_dict: Passthrough dictionary for logging operations
 
     :return: dict
-        check - If TRUE, the function was successful
-        row_id - ID of the row inserted
+        rows_inserted - Number of rows inserted, 0 if the row was buffered only
     """
 
     trace["log_enable"] = False
-    table_name = f'{table_name}'
 
-    # Define the execution statement
-    exec_statement = f'INSERT INTO {table_name} (\'level\',\'process_id\',\'thread_id\',\'task_id\',\'datetimestamp\',\'module\',\'operation\',\'tracing\',\'message\') VALUES (?,?,?,?,?,?,?,?,?)'
-
-    # Connect the database
-    conn = log_db_connect(trace, app_dict, db_path)
+    sink = log_db_sink(trace, app_dict, db_path, table_name)
 
-    # Activate WAL mode to access the database
-    conn.execute('pragma journal_mode=wal;')
+    sink.add((
+        log_dict["level"].upper(),
+        log_dict["process_id"],
+        log_dict["thread_id"],
+        log_dict["task_id"],
+        log_dict["datetime_value"],
+        log_dict["module"],
+        log_dict["operation"],
+        log_dict["tracing"],
+        log_dict["message"],
+    ))
 
-    c = conn.cursor()
-
-    # Insert a new row and write to cell(s)
-    c.execute(exec_statement, (
-              log_dict["level"].upper(),
-              log_dict["process_id"],
-              log_dict["thread_id"],
-              log_dict["task_id"],
-              log_dict["datetime_value"],
-              log_dict["module"],
-              log_dict["operation"],
-              log_dict["tracing"],
-              log_dict["message"]),
-              )
-
-    # Check for the last ID
-    row_id = int(c.lastrowid)
-
-    # Commit changes to the database and close the cursor
-    conn.commit()
-    c.close()
+    # Insert the rows buffered in a single transaction, if due.
+    rows_inserted = sink.flush() if log_dict["interrupt_enable"] or sink.due() else 0
 
     return{
-        'row_id' : row_id
-        }
\ No newline at end of file
+        'rows_inserted' : rows_inserted
+        }
@@ -0,0 +1,871 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Result channels of child processes, futures and parallel map functionality for morPy.
+"""
+
+from morPy import log
+from lib.decorators import core_wrap
+from lib.mp import (heap_shelve, heap_shelve_batch, normalize_task, task_to_partial, child_exit_routine,
+                    stop_while_interrupt, notify_inbox, wait_inbox, release_shared_buffers, task_guard,
+                    core_load, deque_blocked)
+from lib.shm import SharedRingBuffer, shared_buffers_reap
+from lib.store import lock_key
+from lib.threads import MorPyThreadPool, thread_pool
+from lib.aio import collect, schedule
+
+import os
+import time
+import pickle
+import struct
+import inspect
+import threading
+from concurrent.futures import CancelledError, Future, InvalidStateError, wait
+from functools import partial
+from itertools import count, islice
+from typing import Any, Callable, Generator, Iterable
+
+# Result inboxes of all processes by process ID, attached once per process.
+_inboxes: dict = {}
+
+# Fragments of messages not received completely yet by message ID.
+_fragments: dict = {}
+
+# Messages received by reply channel, for reply channels currently awaited.
+_mailbox: dict = {}
+
+# Futures awaiting a reply by reply channel.
+_futures: dict = {}
+
+# Guards the mailbox and the futures, notified whenever messages arrived.
+_inbox_cond = threading.Condition()
+
+# Thread receiving the own inbox, started once per process.
+_listener: threading.Thread | None = None
+
+# Counters for unique message IDs and reply channels within the process.
+_message_counter = count(1)
+_channel_counter = count(1)
+
+# Message ID, fragment index and fragment count preceding each fragment in an inbox.
+_FRAGMENT_HEADER = struct.Struct("QII")
+
+
+def inbox_init(app_dict: dict) -> None:
+    r"""
+    Creates a result inbox for every child process ID and publishes their names in
+    app_dict["morpy"]["inbox_rings"]. An inbox is a ring buffer in shared memory, that any process
+    can send replies to, while only the owning process receives them. With CPU affinity configured,
+    an inbox is allocated on the NUMA node of the owning process. Only to be called by the
+    orchestrator in multiprocessing mode.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    from lib.init import obscure_shared_name
+    from lib.affinity import affinity_local
+
+    inbox_names: dict = {}
+    proc_master = app_dict["morpy"]["proc_master"]
+
+    for process_id in range(0, app_dict["morpy"]["processes_max"] + 1):
+        if process_id != proc_master:
+            # The slots are written to once on creation, which places their memory.
+            with affinity_local(app_dict, process_id):
+                inbox_ring = SharedRingBuffer(
+                    name=obscure_shared_name(),
+                    create=True,
+                    slots=app_dict["morpy"]["conf"]["processes_inbox_slots"],
+                    slot_size=app_dict["morpy"]["conf"]["processes_inbox_slot_size"]
+                )
+            _inboxes[process_id] = inbox_ring
+            inbox_names[process_id] = inbox_ring.name
+
+    with app_dict["morpy"].lock:
+        app_dict["morpy"]["inbox_rings"] = inbox_names
+
+
+def inbox(app_dict: dict, process_id: int) -> SharedRingBuffer | None:
+    r"""
+    Returns the result inbox of a process, attaching to it on first use in the calling process.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param process_id: morPy process ID owning the inbox.
+
+    :return: SharedRingBuffer instance or None, if the process has no inbox.
+    """
+
+    inbox_ring = _inboxes.get(process_id, None)
+    if inbox_ring is None:
+        inbox_name = app_dict["morpy"].get("inbox_rings", {}).get(process_id, None)
+        if inbox_name:
+            inbox_ring = SharedRingBuffer(name=inbox_name)
+            _inboxes[process_id] = inbox_ring
+    return inbox_ring
+
+
+def inbox_release(unlink: bool=False) -> None:
+    r"""
+    Detaches the calling process from all result inboxes.
+
+    :param unlink: If True, the inboxes are destroyed. Only to be used by the orchestrator.
+    """
+
+    for inbox_ring in _inboxes.values():
+        inbox_ring.close()
+        if unlink:
+            inbox_ring.unlink()
+    _inboxes.clear()
+
+
+def reply_send(app_dict: dict, process_id: int, reply_key: tuple, success: bool, value: Any) -> bool:
+    r"""
+    Sends a reply to the inbox of a process. Replies larger than a slot of the inbox are split into
+    fragments. If the inbox is full, the sender waits for the receiver to catch up, unless the
+    receiving process terminated or the app exits.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param process_id: morPy process ID of the receiver.
+    :param reply_key: Key identifying the reply, where the first element is the reply channel.
+    :param success: If False, value is an exception to be raised by the receiver.
+    :param value: Return value or exception.
+
+    :return: False, if the reply could not be delivered.
+    """
+
+    inbox_ring = inbox(app_dict, process_id)
+    if inbox_ring is None:
+        return False
+
+    try:
+        data = pickle.dumps((reply_key, success, value), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        # The return value can not be serialized. Reply with the error instead.
+        data = pickle.dumps((reply_key, False, RuntimeError(f'{type(e).__name__}: {e}')),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+
+    message_id = (os.getpid() << 32) | next(_message_counter)
+    fragment_size = inbox_ring.slot_size - 16 - _FRAGMENT_HEADER.size
+    fragment_count = max(1, -(-len(data) // fragment_size))
+
+    for index in range(0, fragment_count):
+        fragment = (_FRAGMENT_HEADER.pack(message_id, index, fragment_count)
+                    + data[index * fragment_size:(index + 1) * fragment_size])
+
+        while not inbox_ring.put(fragment):
+            # Inbox full. Let the receiver catch up.
+            notify_inbox(process_id)
+
+            if core_load(app_dict, "exit") or process_id not in app_dict["morpy"]["proc_busy"]:
+                return False
+
+            time.sleep(0.001)   # 0.001 seconds = 1 millisecond
+
+    notify_inbox(process_id)
+
+    return True
+
+
+def inbox_listen(app_dict: dict, process_id: int) -> None:
+    r"""
+    Starts the thread receiving the inbox of the calling process, unless it is running already. The
+    thread is the only consumer of the inbox. It blocks until replies arrive, hands them to the
+    futures and mailboxes awaiting them and discards replies nobody awaits anymore, so the inbox
+    can not fill up with stale replies.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param process_id: morPy process ID of the calling process.
+    """
+
+    global _listener
+
+    if _listener is None:
+        inbox_ring = inbox(app_dict, process_id)
+        if inbox_ring is not None:
+            _listener = threading.Thread(target=_inbox_listener, args=(inbox_ring, process_id),
+                                         name=f'morPy inbox {process_id}', daemon=True)
+            _listener.start()
+
+
+def _inbox_listener(inbox_ring: SharedRingBuffer, process_id: int) -> None:
+    r"""
+    Body of the inbox thread. Runs until the process exits.
+
+    :param inbox_ring: Inbox of the calling process
+    :param process_id: morPy process ID of the calling process.
+    """
+
+    while True:
+        wait_inbox(process_id)
+        inbox_collect(inbox_ring)
+
+
+def inbox_collect(inbox_ring: SharedRingBuffer) -> None:
+    r"""
+    Receives all messages from the own inbox and puts them in the mailbox of the reply channel
+    awaiting them or completes the future awaiting them. Messages for reply channels not awaited
+    anymore are discarded. Only to be called by the inbox thread.
+
+    :param inbox_ring: Inbox of the calling process
+    """
+
+    futures_done: list = []
+
+    for fragment in inbox_ring.get_batch():
+        message_id, index, fragment_count = _FRAGMENT_HEADER.unpack_from(fragment)
+        data = fragment[_FRAGMENT_HEADER.size:]
+
+        # Reassemble fragmented messages
+        if fragment_count > 1:
+            fragments = _fragments.setdefault(message_id, [])
+            fragments.append(data)
+            if len(fragments) < fragment_count:
+                continue
+            data = b''.join(_fragments.pop(message_id))
+
+        reply_key, success, value = pickle.loads(data)
+        with _inbox_cond:
+            mailbox = _mailbox.get(reply_key[0], None)
+            if mailbox is not None:
+                mailbox.append((reply_key, success, value))
+            else:
+                future = _futures.pop(reply_key[0], None)
+                if future is not None:
+                    futures_done.append((future, success, value))
+
+    with _inbox_cond:
+        _inbox_cond.notify_all()
+
+    # Complete futures outside the lock, as done callbacks run right away.
+    for future, success, value in futures_done:
+        try:
+            if success:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        except InvalidStateError:
+            # Cancelled in the meantime.
+            pass
+
+
+def reply_exception(e: Exception) -> Exception:
+    r"""
+    Prepares an exception raised by a task to be sent to another process. The original error is
+    extracted from a MorPyException and replaced by a RuntimeError, if it can not be serialized.
+
+    :param e: Exception raised by the task.
+
+    :return: Serializable exception.
+    """
+
+    from lib.exceptions import MorPyException
+
+    if isinstance(e, MorPyException) and e.__cause__ is not None:
+        e = e.__cause__
+
+    try:
+        pickle.loads(pickle.dumps(e))
+        return e
+    except Exception:
+        return RuntimeError(f'{type(e).__name__}: {e}')
+
+
+@core_wrap
+def _reply_task(trace: dict, app_dict: dict, task: list=None, reply_pid: int=None, reply_key: tuple=None,
+                cancellable: bool=False) -> None:
+    r"""
+    Wraps a task to send its return value, or the exception it raised, to the inbox of the process
+    awaiting it.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param task: Task packed as a list, see lib.mp.heap_shelve()
+    :param reply_pid: morPy process ID to reply to.
+    :param reply_key: Key identifying the reply, where the first element is the reply channel.
+    :param cancellable: If True, the task is skipped if it was cancelled before it started. Otherwise,
+        it is marked as started in app_dict["morpy"]["tasks_cancelled"] while it runs.
+    """
+
+    task_id = trace["task_id"]
+
+    if cancellable:
+        with lock_key(app_dict["morpy"]["tasks_cancelled"], task_id):
+            # Skip the task, the future was cancelled already.
+            if app_dict["morpy"]["tasks_cancelled"].pop(task_id, False):
+                return
+            app_dict["morpy"]["tasks_cancelled"][task_id] = False
+
+    # Run the task with the own trace
+    if len(task) > 1 and isinstance(task[1], dict) and "process_id" in task[1]:
+        task[1] = trace
+
+    scheduled: bool = False
+
+    try:
+        retval = task_to_partial(task)()
+
+        # Reply once the coroutine of an async task is done.
+        if inspect.isawaitable(retval):
+            schedule(trace, app_dict, retval, on_done=partial(_reply_async, app_dict, reply_pid, reply_key,
+                                                              task_id if cancellable else None))
+            scheduled = True
+        else:
+            reply_send(app_dict, reply_pid, reply_key, True, retval)
+    except Exception as e:
+        reply_send(app_dict, reply_pid, reply_key, False, reply_exception(e))
+    finally:
+        if cancellable and not scheduled:
+            with lock_key(app_dict["morpy"]["tasks_cancelled"], task_id):
+                app_dict["morpy"]["tasks_cancelled"].pop(task_id, None)
+
+
+def _reply_async(app_dict: dict, reply_pid: int, reply_key: tuple, task_id: int | None, future: Future) -> None:
+    r"""
+    Sends the result of an async task wrapped by _reply_task() once its coroutine is done. Called by the
+    main thread of the process, see lib.aio.collect().
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param reply_pid: morPy process ID to reply to.
+    :param reply_key: Key identifying the reply, where the first element is the reply channel.
+    :param task_id: ID of the task to be removed from app_dict["morpy"]["tasks_cancelled"]. None, if the
+        task was not cancellable.
+    :param future: Future of the coroutine
+    """
+
+    if future.cancelled():
+        reply_send(app_dict, reply_pid, reply_key, False, CancelledError())
+    elif future.exception() is not None:
+        reply_send(app_dict, reply_pid, reply_key, False, reply_exception(future.exception()))
+    else:
+        reply_send(app_dict, reply_pid, reply_key, True, future.result())
+
+    if task_id is not None:
+        with lock_key(app_dict["morpy"]["tasks_cancelled"], task_id):
+            app_dict["morpy"]["tasks_cancelled"].pop(task_id, None)
+
+
+def _future_copy(target: Future, source: Future) -> None:
+    r"""
+    Completes a future with the outcome of another one, i.e. the future of a coroutine.
+
+    :param target: Future to be completed
+    :param source: Future done
+    """
+
+    try:
+        if source.cancelled():
+            target.set_exception(CancelledError())
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+    except InvalidStateError:
+        # The target was cancelled in the meantime.
+        pass
+
+
+def wait_check(trace: dict, app_dict: dict) -> None:
+    r"""
+    To be called by a process in between waiting for replies. Terminates the process, if the app
+    exits, and holds it while a global interrupt is active.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    # Exit if required
+    if core_load(app_dict, "exit"):
+        child_exit_routine(trace, app_dict)
+
+    # Complete the async tasks done in the meantime.
+    collect(trace, app_dict)
+
+    # Close the shared buffers mapped by their receivers in the meantime.
+    shared_buffers_reap()
+
+    # Check for Interrupt / exit
+    stop_while_interrupt(trace, app_dict)
+
+
+def _channel() -> int:
+    r"""
+    Returns a new reply channel, unique among all processes. Replies sent to a former process with
+    the same morPy process ID can not be mistaken for own replies.
+
+    :return: Reply channel
+    """
+
+    return (os.getpid() << 32) | next(_channel_counter)
+
+
+class MorPyFuture(Future):
+    r"""
+    Handle of a task queued by morPy.process_q(). It is completed by the inbox thread of the calling
+    process as soon as the task replied, so done callbacks are run by that thread. Waiting for the
+    result blocks on the future, but still reacts to an interrupt or the exit of the app.
+
+    Cancelling removes the task from the heap shelf or the waiting dictionary. A task in transit to
+    the orchestrator or to a process is marked as cancelled and skipped, when it would start. A task
+    that started already can not be cancelled.
+    """
+
+    __slots__ = [
+        'app_dict',
+        'channel',
+        'task_id',
+        'trace'
+    ]
+
+
+    def __init__(self, trace: dict, app_dict: dict, channel: int | None=None) -> None:
+        r"""
+        Creates a pending future.
+
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param channel: Reply channel the task replies to. None, if the task is run directly.
+        """
+
+        super().__init__()
+
+        self.trace = trace
+        self.app_dict = app_dict
+        self.channel = channel
+        self.task_id = None
+
+
+    def _await(self, timeout: float | None) -> None:
+        r"""
+        Blocks until the future is done or the timeout expired. Checks for an interrupt or exit in
+        between.
+
+        :param timeout: Timeout in seconds. If None, wait without a time limit.
+        """
+
+        if self.done():
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        wakeup_timeout = self.app_dict["morpy"]["conf"]["processes_wakeup_timeout"]
+
+        # No tasks are queued to the process while it waits.
+        with deque_blocked(self.trace, self.app_dict):
+            while not self.done():
+                wait_time = wakeup_timeout
+                if deadline is not None:
+                    wait_time = min(wait_time, deadline - time.monotonic())
+                    if wait_time <= 0:
+                        return
+
+                if wait((self,), timeout=wait_time).done:
+                    return
+
+                wait_check(self.trace, self.app_dict)
+
+
+    def result(self, timeout: float | None=None) -> Any:
+        r"""
+        Returns the return value of the task, once it is done. Raises the exception raised by the
+        task, CancelledError if it was cancelled or TimeoutError if the timeout expired.
+
+        :param timeout: Timeout in seconds. If None, wait without a time limit.
+
+        :return: Return value of the task
+        """
+
+        self._await(timeout)
+        return super().result(timeout=0)
+
+
+    def exception(self, timeout: float | None=None) -> BaseException | None:
+        r"""
+        Returns the exception raised by the task, once it is done. Raises CancelledError if it was
+        cancelled or TimeoutError if the timeout expired.
+
+        :param timeout: Timeout in seconds. If None, wait without a time limit.
+
+        :return: Exception raised by the task or None
+        """
+
+        self._await(timeout)
+        return super().exception(timeout=0)
+
+
+    def cancel(self) -> bool:
+        r"""
+        Cancels the task, if it did not start yet.
+
+        :return: True, if the task was cancelled.
+        """
+
+        if self.done():
+            return self.cancelled()
+
+        # A task run directly started already, i.e. an async task awaited by the own event loop.
+        if self.channel is None:
+            return False
+
+        task_id = self.task_id
+        app_dict = self.app_dict
+        removed_from: str = "tasks_cancelled"
+        task_removed = None
+
+        with lock_key(app_dict["morpy"]["tasks_cancelled"], task_id):
+            # The task is running already.
+            if task_id in app_dict["morpy"]["tasks_cancelled"]:
+                return False
+
+            # Remove the task, if it is still on the heap shelf.
+            with app_dict["morpy"]["heap_shelf"].lock:
+                task_qed = app_dict["morpy"]["heap_shelf"].pop(task_id, None)
+
+            if task_qed is not None:
+                removed_from = "heap_shelf"
+                task_removed = task_qed[3]
+            else:
+                # Remove the task, if it was shelved to a waiting process.
+                with app_dict["morpy"]["proc_waiting"].lock:
+                    proc_waiting = app_dict["morpy"]["proc_waiting"]
+                    process_shelved = None
+                    for process_id, (task_waiting, _priority, task_id_waiting) in proc_waiting.items():
+                        if task_id_waiting == task_id:
+                            process_shelved = process_id
+                            task_removed = task_waiting
+                            break
+
+                    # The process keeps waiting for another task.
+                    if process_shelved is not None:
+                        proc_waiting[process_shelved] = (None, None, None)
+                        removed_from = "proc_waiting"
+
+            # Destroy buffers moved to shared memory for the task.
+            release_shared_buffers(task_removed)
+
+            if removed_from == "tasks_cancelled":
+                # The task finished in the meantime.
+                if self.done():
+                    return self.cancelled()
+
+                # The task is in transit. Skip it, when it would start.
+                app_dict["morpy"]["tasks_cancelled"][task_id] = True
+
+        with _inbox_cond:
+            _futures.pop(self.channel, None)
+
+        # Task cancelled.
+        log(self.trace, app_dict, "debug",
+            lambda: f'{app_dict["loc"]["morpy"]["future_cancel"]}\n'
+                    f'{app_dict["loc"]["morpy"]["future_cancel_id"]}: {task_id}\n'
+                    f'{app_dict["loc"]["morpy"]["future_cancel_from"]}: {removed_from}')
+
+        return super().cancel()
+
+
+@core_wrap
+def submit(trace: dict, app_dict: dict, task: Callable | list | tuple=None, priority: int=100,
+           autocorrect: bool=True, timeout: float=None, max_retries: int=None,
+           backoff: float=None) -> MorPyFuture | None:
+    r"""
+    Queues a task like lib.mp.heap_shelve() and returns a future for its result. See
+    morPy.process_q() for details.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param task: Callable, list or tuple packing the task, see lib.mp.heap_shelve()
+    :param priority: Integer representing task priority (lower is higher priority)
+    :param autocorrect: If False, priority can be smaller than zero. Priority
+        smaller zero is reserved for the morPy Core.
+    :param timeout: Time in seconds a child process may run the task, see lib.mp.task_guard()
+    :param max_retries: Retries of the task, if it timed out or its process terminated unexpectedly.
+    :param backoff: Delay in seconds before the first retry, doubling with every further retry.
+
+    :return: MorPyFuture or None, if no task was given. With the thread backend, a
+        lib.threads.MorPyThreadFuture.
+    """
+
+    my_pid: int = trace["process_id"]
+
+    # Task can not be None. Skipping enqueue.
+    if not task:
+        heap_shelve(trace, app_dict, priority=priority, task=task, autocorrect=autocorrect)
+        return None
+
+    # Hand the task to the thread backend.
+    pool = thread_pool()
+    if pool:
+        # Check for Interrupt / exit
+        stop_while_interrupt(trace, app_dict)
+
+        if priority < 0 and autocorrect:
+            priority = 0
+        return pool.submit(trace, app_dict, task=task, priority=priority)["future"]
+
+    # Run directly, if in single process mode or called by the orchestrator.
+    if my_pid == app_dict["morpy"]["proc_master"] or inbox(app_dict, my_pid) is None:
+        future = MorPyFuture(trace, app_dict)
+
+        # Check for Interrupt / exit
+        stop_while_interrupt(trace, app_dict)
+
+        try:
+            retval = task_to_partial(normalize_task(task))()
+
+            # The future of an async task is done, once its coroutine is done.
+            if inspect.isawaitable(retval):
+                schedule(trace, app_dict, retval, on_done=partial(_future_copy, future))
+            else:
+                future.set_result(retval)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    inbox_listen(app_dict, my_pid)
+
+    channel: int = _channel()
+    future = MorPyFuture(trace, app_dict, channel=channel)
+    with _inbox_cond:
+        _futures[channel] = future
+
+    task_reply = [_reply_task, trace, app_dict, {
+        "task": normalize_task(task),
+        "reply_pid": my_pid,
+        "reply_key": (channel, 0),
+        "cancellable": True
+    }]
+
+    guard = task_guard(app_dict, timeout=timeout, max_retries=max_retries, backoff=backoff,
+                       reply=(my_pid, (channel, 0)))
+
+    future.task_id = heap_shelve(trace, app_dict, priority=priority, task=task_reply,
+                                 autocorrect=autocorrect, guard=guard)["task_id"]
+
+    return future
+
+
+# Suppress linting for mandatory arguments.
+# noinspection PyUnusedLocal
+def _run_chunk(trace: dict, app_dict: dict, func: Callable=None, items: list=None) -> list:
+    r"""
+    Applies a function to a chunk of items in a child process.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param func: Function with the signature func(trace, app_dict, item)
+    :param items: Chunk of items
+
+    :return: List of return values in the order of the items.
+    """
+
+    return [func(trace, app_dict, item) for item in items]
+
+
+def _chunks(iterable: Iterable, chunksize: int) -> Generator:
+    r"""
+    Splits an iterable into lists of chunksize items lazily.
+
+    :param iterable: Any iterable
+    :param chunksize: Maximum number of items per chunk
+
+    :return: Generator of lists
+    """
+
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _pmap_chunks(trace: dict, app_dict: dict, func: Callable, iterable: Iterable, chunksize: int=None,
+                 priority: int=100) -> Generator:
+    r"""
+    Dispatches chunks of an iterable to child processes through the orchestrator and yields the
+    results of every chunk as soon as it arrived. Only a limited number of chunks is in flight at a
+    time, so the iterable is consumed as the results come in.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param func: Function with the signature func(trace, app_dict, item), defined at module level.
+    :param iterable: Items to be processed.
+    :param chunksize: Number of items per task. If None, determined by the length of the iterable.
+    :param priority: Integer representing task priority (lower is higher priority)
+
+    :return: Generator of tuples (chunk index, list of results)
+    """
+
+    my_pid: int = trace["process_id"]
+    processes_max: int = app_dict["morpy"]["processes_max"]
+    pool = thread_pool()
+
+    # The orchestrator and the calling process are not available to run chunks. Threads of the
+    # thread backend all are, as a waiting thread runs chunks itself.
+    workers: int = pool.threads_max if pool else processes_max - 2
+
+    if chunksize is None:
+        chunksize = 1
+        if hasattr(iterable, '__len__') and workers > 0:
+            chunksize = max(1, -(-len(iterable) // (4 * workers)))
+
+    if pool:
+        yield from _pmap_chunks_threads(trace, app_dict, pool, func, iterable, chunksize, priority)
+        return
+
+    # Run sequentially, if no other process can run the chunks.
+    if workers < 1 or my_pid == app_dict["morpy"]["proc_master"] or inbox(app_dict, my_pid) is None:
+        for chunk_index, chunk in enumerate(_chunks(iterable, chunksize)):
+            yield chunk_index, _run_chunk(trace, app_dict, func=func, items=chunk)
+        return
+
+    inbox_listen(app_dict, my_pid)
+
+    chunks = enumerate(_chunks(iterable, chunksize))
+    window: int = 2 * workers
+    in_flight: int = 0
+    wakeup_timeout: float = app_dict["morpy"]["conf"]["processes_wakeup_timeout"]
+    channel: int = _channel()
+    with _inbox_cond:
+        _mailbox[channel] = []
+
+    def dispatch(n: int) -> int:
+        tasks = [
+            [_reply_task, trace, app_dict, {
+                "task": [_run_chunk, trace, app_dict, {"func": func, "items": chunk}],
+                "reply_pid": my_pid,
+                "reply_key": (channel, chunk_index)
+            }]
+            for chunk_index, chunk in islice(chunks, n)
+        ]
+        if tasks:
+            heap_shelve_batch(trace, app_dict, priority=priority, tasks=tasks)
+        return len(tasks)
+
+    try:
+        # No tasks are queued to the process while it waits for the results.
+        with deque_blocked(trace, app_dict):
+            in_flight += dispatch(window)
+
+            while in_flight > 0:
+                # Block until results arrive.
+                with _inbox_cond:
+                    if not _mailbox[channel]:
+                        _inbox_cond.wait(wakeup_timeout)
+                    mailbox = _mailbox[channel]
+                    _mailbox[channel] = []
+
+                if not mailbox:
+                    wait_check(trace, app_dict)
+                    continue
+
+                for reply_key, success, value in mailbox:
+                    in_flight -= 1
+                    if not success:
+                        raise value
+                    yield reply_key[1], value
+
+                # Refill the window with the next chunks.
+                in_flight += dispatch(window - in_flight)
+
+    finally:
+        # Discard results still to come.
+        with _inbox_cond:
+            _mailbox.pop(channel, None)
+
+
+def _pmap_chunks_threads(trace: dict, app_dict: dict, pool: MorPyThreadPool, func: Callable,
+                         iterable: Iterable, chunksize: int, priority: int) -> Generator:
+    r"""
+    Like _pmap_chunks(), but runs the chunks in the threads of the thread backend.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param pool: Thread pool of the thread backend
+    :param func: Function with the signature func(trace, app_dict, item).
+    :param iterable: Items to be processed.
+    :param chunksize: Number of items per task.
+    :param priority: Integer representing task priority (lower is higher priority)
+
+    :return: Generator of tuples (chunk index, list of results)
+    """
+
+    chunks = enumerate(_chunks(iterable, chunksize))
+    window: int = 2 * pool.threads_max
+    futures: dict = {}  # {future : chunk index}
+
+    def dispatch(n: int) -> None:
+        for chunk_index, chunk in islice(chunks, n):
+            future = pool.submit(trace, app_dict, task=[_run_chunk, trace, app_dict, {"func": func, "items": chunk}],
+                                 priority=priority)["future"]
+            futures[future] = chunk_index
+
+    try:
+        dispatch(window)
+
+        while futures:
+            # Block until a chunk is done, running chunks meanwhile.
+            pool.wait(futures)
+
+            for future in [future for future in futures if future.done()]:
+                yield futures.pop(future), future.result()
+
+            # Refill the window with the next chunks.
+            dispatch(window - len(futures))
+
+    finally:
+        # Discard chunks not started yet.
+        for future in futures:
+            future.cancel()
+
+
+@core_wrap
+def pmap(trace: dict, app_dict: dict, func: Callable=None, iterable: Iterable=None, chunksize: int=None,
+         priority: int=100) -> list:
+    r"""
+    Applies a function to every item of an iterable in parallel and returns the results in the order
+    of the items. See morPy.pmap() for details.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param func: Function with the signature func(trace, app_dict, item), defined at module level.
+    :param iterable: Items to be processed.
+    :param chunksize: Number of items per task. If None, determined by the length of the iterable.
+    :param priority: Integer representing task priority (lower is higher priority)
+
+    :return: List of results
+    """
+
+    results_chunked: dict = {}
+
+    for chunk_index, results in _pmap_chunks(trace, app_dict, func, iterable, chunksize=chunksize,
+                                             priority=priority):
+        results_chunked[chunk_index] = results
+
+    # Parallel map completed.
+    log(trace, app_dict, "debug",
+        lambda: f'{app_dict["loc"]["morpy"]["pmap_done"]}\n'
+                f'{app_dict["loc"]["morpy"]["pmap_chunks"]}: {len(results_chunked)}')
+
+    return [result for chunk_index in sorted(results_chunked) for result in results_chunked[chunk_index]]
+
+
+def imap_unordered(trace: dict, app_dict: dict, func: Callable=None, iterable: Iterable=None,
+                   chunksize: int=None, priority: int=100) -> Generator:
+    r"""
+    Applies a function to every item of an iterable in parallel and yields the results as soon as
+    they are available, regardless of the order of the items. See morPy.imap_unordered() for details.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    :param func: Function with the signature func(trace, app_dict, item), defined at module level.
+    :param iterable: Items to be processed.
+    :param chunksize: Number of items per task. If None, determined by the length of the iterable.
+    :param priority: Integer representing task priority (lower is higher priority)
+
+    :return: Generator of results
+    """
+
+    for _chunk_index, results in _pmap_chunks(trace, app_dict, func, iterable, chunksize=chunksize,
+                                              priority=priority):
+        yield from results
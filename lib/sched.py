@@ -0,0 +1,214 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Scheduling policy of the morPy orchestrator. Tasks are grouped into priority classes, which
+            share the dispatches by weighted fair queuing. Within a class, tasks age while they wait.
+"""
+
+import time
+from heapq import heappush, heappop
+from itertools import count
+
+
+class MorPyScheduler:
+    r"""
+    Priority queue of the orchestrator, replacing a plain heap. Entries are the tuples pulled from the
+    heap shelf (priority, counter, task_sys_id, task, is_process).
+
+    Every priority class (see "processes_sched_classes" in config.py) has its own heap. The next entry
+    is taken from the class with the lowest virtual time, which advances by 1 / weight per entry taken.
+    That way, a class gets dispatches in proportion to its weight, as long as it has entries queued,
+    and no class starves another one.
+
+    Within a class, an entry gains "processes_sched_aging" priority steps per second it waits. As all
+    entries age at the same rate, the order is kept in a heap keyed by priority + aging * enqueue time.
+    """
+
+    __slots__ = [
+        '_aging',
+        '_classes',
+        '_counter',
+        '_heaps',
+        '_metrics',
+        '_phase_weights',
+        '_vtime',
+        '_weights',
+        'phase',
+    ]
+
+
+    def __init__(self, classes: dict, aging: float=0.0, phase_weights: dict=None) -> None:
+        r"""
+        :param classes: Priority classes {name : {"max_priority" : int | None, "weight" : float}}. A task
+            belongs to the first class, whose "max_priority" is equal to or greater than its priority. The
+            last class should have a "max_priority" of None, catching all remaining tasks.
+        :param aging: Priority steps an entry gains per second waited. If 0, entries do not age.
+        :param phase_weights: Weights overriding those of the classes during an app phase, i.e.
+            {"exit" : {"low" : 4}}.
+        """
+
+        # Classes sorted by their maximum priority, the catch-all class last.
+        self._classes: list = sorted(
+            ((name, spec.get("max_priority", None)) for name, spec in classes.items()),
+            key=lambda item: float("inf") if item[1] is None else item[1]
+        )
+        self._weights: dict = {name: float(spec.get("weight", 1)) for name, spec in classes.items()}
+        self._phase_weights: dict = phase_weights or {}
+        self._aging: float = aging
+        self._counter = count()
+        self._heaps: dict = {name: [] for name, _max_priority in self._classes}
+        self._vtime: dict = {name: 0.0 for name, _max_priority in self._classes}
+        self._metrics: dict = {name: {"tasks" : 0, "wait_sum" : 0.0, "wait_max" : 0.0}
+                               for name, _max_priority in self._classes}
+        self.phase: str | None = None
+
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._heaps.values())
+
+
+    def __iter__(self):
+        r"""
+        Iterates over the entries queued in no particular order.
+        """
+
+        for heap in self._heaps.values():
+            for item in heap:
+                yield item[3]
+
+
+    def class_of(self, priority: int) -> str:
+        r"""
+        Returns the name of the priority class of a priority.
+
+        :param priority: Integer representing task priority (lower is higher priority)
+
+        :return: Name of the class
+        """
+
+        for name, max_priority in self._classes:
+            if max_priority is None or priority <= max_priority:
+                return name
+
+        # Priorities beyond the last class are treated like the last class.
+        return self._classes[-1][0]
+
+
+    def push(self, entry: tuple, enqueued: float=None) -> None:
+        r"""
+        Queues an entry.
+
+        :param entry: Tuple (priority, counter, task_sys_id, task, is_process)
+        :param enqueued: Monotonic time the entry was queued first. Used to keep the age of an entry,
+            that is queued again. If None, the entry is queued now.
+        """
+
+        if enqueued is None:
+            enqueued = time.monotonic()
+
+        name = self.class_of(entry[0])
+        heap = self._heaps[name]
+
+        # A class queueing again after being idle starts at the current virtual time. It can not claim
+        # the dispatches it did not use meanwhile.
+        if not heap:
+            active = [self._vtime[other] for other, other_heap in self._heaps.items() if other_heap]
+            if active:
+                self._vtime[name] = max(self._vtime[name], min(active))
+
+        heappush(heap, (entry[0] + self._aging * enqueued, next(self._counter), enqueued, entry))
+
+
+    def _next_class(self) -> str | None:
+        r"""
+        Returns the name of the class to take the next entry from.
+        """
+
+        name_next = None
+        for name, heap in self._heaps.items():
+            if heap and (name_next is None or self._vtime[name] < self._vtime[name_next]):
+                name_next = name
+        return name_next
+
+
+    def peek(self) -> tuple | None:
+        r"""
+        Returns the entry, that pop() would return next, without removing it.
+
+        :return: Entry or None, if nothing is queued.
+        """
+
+        name = self._next_class()
+        return self._heaps[name][0][3] if name else None
+
+
+    def pop(self) -> dict:
+        r"""
+        Removes and returns the next entry.
+
+        :return: dict
+            entry: Entry or None, if nothing is queued.
+            enqueued: Monotonic time the entry was queued.
+        """
+
+        name = self._next_class()
+        if name is None:
+            return {
+                "entry" : None,
+                "enqueued" : None,
+            }
+
+        weight = self._phase_weights.get(self.phase, {}).get(name, self._weights[name])
+        self._vtime[name] += 1.0 / max(weight, 1e-9)
+
+        _key, _counter, enqueued, entry = heappop(self._heaps[name])
+
+        return {
+            "entry" : entry,
+            "enqueued" : enqueued,
+        }
+
+
+    def record(self, priority: int, enqueued: float) -> None:
+        r"""
+        Records the time an entry waited until it was dispatched.
+
+        :param priority: Integer representing task priority (lower is higher priority)
+        :param enqueued: Monotonic time the entry was queued.
+        """
+
+        waited = time.monotonic() - enqueued
+        metrics = self._metrics[self.class_of(priority)]
+        metrics["tasks"] += 1
+        metrics["wait_sum"] += waited
+        metrics["wait_max"] = max(metrics["wait_max"], waited)
+
+
+    def metrics(self) -> dict:
+        r"""
+        Returns the metrics per priority class.
+
+        :return: dict
+            {class : {"tasks" : dispatched, "queued" : waiting, "wait_avg" : seconds, "wait_max" : seconds}}
+        """
+
+        return {
+            name: {
+                "tasks" : metrics["tasks"],
+                "queued" : len(self._heaps[name]),
+                "wait_avg" : metrics["wait_sum"] / metrics["tasks"] if metrics["tasks"] else 0.0,
+                "wait_max" : metrics["wait_max"],
+            }
+            for name, metrics in self._metrics.items()
+        }
+
+
+    def clear(self) -> None:
+        r"""
+        Removes all entries queued.
+        """
+
+        for heap in self._heaps.values():
+            heap.clear()
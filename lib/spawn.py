@@ -6,9 +6,15 @@ Author:     Bastian Neuwirth
 Descr.:     Enables a spawning child process to unpickle callables.
 """
 
-from lib.mp import reattach_ultradict_refs, join_or_task, child_exit_routine
+from lib.mp import (reattach_ultradict_refs, join_or_task, child_exit_routine, pool_worker, pool_warm_imports,
+                    wakeup_ref, wakeup_attach, task_guard_start, task_guard_end)
+from lib.results import inbox_listen
+from lib.affinity import affinity_apply
+from lib.aio import run_task
 from lib.fct import tracing
 
+from functools import partial
+
 
 class SpawnWrapper:
     r"""
@@ -26,28 +32,45 @@ class SpawnWrapper:
         'module_name',
         'task',
         'trace',
-        'pid'
+        'pid',
+        'wakeup'
     ]
 
 
     def __init__(self, task):
         r"""
-        Extracts the function, arguments, and keyword arguments from the provided task (after
-        reattaching UltraDict references) and resets the trace for the spawned process. Also
-        stores the module and function name for later dynamic import.
+        Extracts the function from the provided task and resets the trace for the spawned process.
+        Also stores the module and function name for later dynamic import. The wakeup primitive of
+        the parent process is handed over to the child.
+
+        The task is kept with sanitized UltraDict references (see lib.mp.substitute_ultradict_refs())
+        until the child process runs it. That way the wrapper can be pickled for any start method and
+        the child attaches to the shared memory on its own, instead of inheriting attachments of the
+        orchestrator.
         """
 
-        self.task       = reattach_ultradict_refs(task)
+        self.task       = task
         self.func       = self.task[0]
         self.trace      = self.task[1]
-        self.app_dict   = self.task[2]
+        self.app_dict   = None
+        self.args       = None
+        self.kwargs     = None
         self.pid        = self.trace["process_id"]
+        self.wakeup     = wakeup_ref()
 
         # Reset 'trace', when a process is spawned.
         module: str         = ''
         operation: str      = ''
         self.trace: dict    = tracing(module, operation, self.trace, reset=True)
 
+        self._set_function(self.func)
+
+
+    def _set_arguments(self):
+        # Recreate UltraDict references in the child process.
+        self.task       = reattach_ultradict_refs(self.task)
+        self.app_dict   = self.task[2]
+
         # If the last element is a dict, treat it as keyword arguments.
         if len(self.task) > 3 and isinstance(self.task[-1], dict):
             self.args   = self.task[1:-1]
@@ -56,8 +79,6 @@ class SpawnWrapper:
             self.args   = self.task[1:]
             self.kwargs = dict()
 
-        self._set_function(self.func)
-
 
     def _set_function(self, func):
         # The callable must be defined at module level.
@@ -71,16 +92,45 @@ class SpawnWrapper:
         r"""
         Dynamically imports the module where the target function is defined, retrieves the function
         by name, and then executes it with the stored arguments. After execution, it synchronizes
-        with the parent via join_or_task and finally invokes the child exit routine.
+        with the parent via join_or_task and finally invokes the child exit routine. In pool mode,
+        the process stays alive as a pool worker instead.
         """
 
-        # Dynamically import the module and retrieve the function.
+        # Connect to the wakeup primitive of the orchestrator.
+        wakeup_attach(self.wakeup)
+
+        self._set_arguments()
+
+        # Pin the process to its CPUs before it allocates memory.
+        affinity_apply(self.trace, self.app_dict)
+
+        # Receive replies to futures and parallel maps of this process.
+        inbox_listen(self.app_dict, self.pid)
+
+        pool_mode: bool = self.app_dict["morpy"]["conf"]["processes_pool"]
+
+        # Import modules ahead of the tasks to come.
+        if pool_mode:
+            pool_warm_imports(self.trace, self.app_dict)
+
+        # Dynamically import the module and retrieve the function. Async tasks go on in the event loop of
+        # the process.
         mod     = __import__(self.module_name, fromlist=[self.func_name])
         func    = getattr(mod, self.func_name)
-        func(*self.args, **self.kwargs)
-
-        # Wait until all child processes are joined or take on a task.
-        join_or_task(self.trace, self.app_dict, reset_trace=True, reset_w_prefix=f'{self.module_name}.{self.func_name}')
+        guarded = task_guard_start(self.trace, self.app_dict)
+        try:
+            run_task(self.trace, self.app_dict, partial(func, *self.args, **self.kwargs))
+        finally:
+            if guarded:
+                task_guard_end(self.trace, self.app_dict)
+
+        if pool_mode:
+            # Take on tasks until the app exits or the worker is recycled.
+            pool_worker(self.trace, self.app_dict, tasks_done=1)
+        else:
+            # Wait until all child processes are joined or take on a task.
+            join_or_task(self.trace, self.app_dict, reset_trace=True,
+                         reset_w_prefix=f'{self.module_name}.{self.func_name}')
 
         child_exit_routine(self.trace, self.app_dict)
 
@@ -0,0 +1,271 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Sharded key/value store in shared memory. Keys are spread over several UltraDicts, each with
+            a lock of its own, so processes working on different keys rarely contend.
+"""
+
+from lib.mp import shared_dict, ultradict_attach, ultradict_placeholder
+
+import os
+import zlib
+import pickle
+from typing import Any, Iterator
+
+
+class ShardedDict:
+    r"""
+    Dictionary shared by processes, spreading its keys over a number of UltraDict shards. Every shard
+    has a shared lock and a memory buffer of its own. Processes reading or writing keys of different
+    shards do not wait for each other, and a write only dumps the shard it changed instead of the
+    whole dictionary.
+
+    A key is mapped to its shard by the CRC32 of its pickled form, which is the same in every process
+    (unlike hash(), which is salted per process). Hence, keys must pickle the same way every time,
+    i.e. strings, integers or tuples of these. Note, that 1 and True are different keys.
+
+    Single keys are read and written atomically. A read-modify-write on a key has to hold the lock of
+    its shard, see lock_key(). Operations on the whole dictionary (len(), iterating, items()) visit
+    the shards one after another and are not atomic.
+
+    An instance is pickled as the names of its shards, so it may be handed to child processes and
+    stored in app_dict. Every process attaches to a store once (see sharded_dict_attach()).
+
+    Shared memory segments are not tracked by the resource tracker in morPy (see UltraDict), so the
+    creating process has to call unlink() once the store is not needed anymore.
+    """
+
+    __slots__ = [
+        'shards',
+    ]
+
+
+    def __init__(self, shards: int | list=16, size: int=1024 * 1024) -> None:
+        r"""
+        Creates a new store or wraps the shards of an existing one.
+
+        :param shards: Number of shards to be created or a list of attached UltraDict shards.
+        :param size: Memory of the whole store in bytes, split evenly across the shards. Only used, if
+            shards are created.
+
+        :example:
+            store = ShardedDict(shards=16, size=4 * 1024 * 1024)
+            store["foo"] = "bar"
+        """
+
+        if isinstance(shards, list):
+            self.shards: list = shards
+        else:
+            if shards < 1:
+                raise ValueError(f'{shards=}')
+
+            from lib.init import obscure_shared_name
+
+            shard_size = max(size // shards, 4096)
+            self.shards: list = [
+                shared_dict(name=obscure_shared_name(), create=True, size=shard_size, recurse=False)
+                for _ in range(0, shards)
+            ]
+
+
+    def __reduce__(self):
+        return sharded_dict_attach, (tuple(ultradict_placeholder(shard) for shard in self.shards),)
+
+
+    def shard(self, key: Any):
+        r"""
+        Returns the shard holding a key.
+
+        :param key: Key of the store
+
+        :return: UltraDict shard
+        """
+
+        return self.shards[zlib.crc32(pickle.dumps(key, protocol=4)) % len(self.shards)]
+
+
+    def lock_key(self, key: Any):
+        r"""
+        Returns the shared lock of the shard holding a key, to be held for a read-modify-write.
+
+        :param key: Key of the store
+
+        :return: Shared lock of the shard
+
+        :example:
+            with store.lock_key("hits"):
+                store["hits"] = store.get("hits", 0) + 1
+        """
+
+        return self.shard(key).lock
+
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.shard(key)[key]
+
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.shard(key)[key] = value
+
+
+    def __delitem__(self, key: Any) -> None:
+        del self.shard(key)[key]
+
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.shard(key)
+
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+
+    def __bool__(self) -> bool:
+        return any(len(shard) for shard in self.shards)
+
+
+    def __iter__(self) -> Iterator:
+        return iter(self.keys())
+
+
+    def get(self, key: Any, default: Any=None) -> Any:
+        return self.shard(key).get(key, default)
+
+
+    def pop(self, key: Any, *default) -> Any:
+        return self.shard(key).pop(key, *default)
+
+
+    def setdefault(self, key: Any, default: Any=None) -> Any:
+        shard = self.shard(key)
+        with shard.lock:
+            if key not in shard:
+                shard[key] = default
+                return default
+            return shard[key]
+
+
+    def update(self, other: dict) -> None:
+        r"""
+        Writes several keys, grouped by shard, so that every shard is locked and dumped once.
+
+        :param other: Dictionary of keys and values
+        """
+
+        by_shard: dict = {}
+        for key, value in other.items():
+            index = zlib.crc32(pickle.dumps(key, protocol=4)) % len(self.shards)
+            by_shard.setdefault(index, {})[key] = value
+
+        for index, items in by_shard.items():
+            shard = self.shards[index]
+            with shard.lock:
+                shard.update(items)
+
+
+    def keys(self) -> list:
+        return [key for shard in self.shards for key in list(shard.keys())]
+
+
+    def values(self) -> list:
+        return [value for shard in self.shards for value in list(shard.values())]
+
+
+    def items(self) -> list:
+        return [item for shard in self.shards for item in list(shard.items())]
+
+
+    def clear(self) -> None:
+        for shard in self.shards:
+            with shard.lock:
+                shard.clear()
+
+
+    def unlink(self) -> None:
+        r"""
+        Requests the shared memory of all shards to be destroyed. To be called once by the creating
+        process.
+        """
+
+        for shard in self.shards:
+            shard.unlink()
+
+
+# Stores attached by the calling process, keyed by the placeholders of their shards. A forked child
+# process starts over, as it must not share the attachments of its parent.
+_attached: dict = {}
+_attached_pid: int | None = None
+
+
+def sharded_dict_attach(placeholders: tuple) -> ShardedDict:
+    r"""
+    Returns the store of a pickled ShardedDict. A store is attached once per process and reused, so
+    that reading it from app_dict does not map the memory of its shards again.
+
+    :param placeholders: Placeholders of the shards, see lib.mp.ultradict_placeholder()
+
+    :return: Attached ShardedDict instance
+    """
+
+    global _attached_pid
+    if _attached_pid != os.getpid():
+        _attached.clear()
+        _attached_pid = os.getpid()
+
+    store = _attached.get(placeholders, None)
+    if store is None:
+        store = ShardedDict(shards=[ultradict_attach(placeholder) for placeholder in placeholders])
+        _attached[placeholders] = store
+
+    return store
+
+
+def sharded_dict(app_dict: dict, shards: int=None, size: int=None) -> ShardedDict | dict:
+    r"""
+    Creates a sharded store to be shared by all processes, i.e. to be put into app_dict. In single
+    process mode and with the thread backend, a dictionary like the ones of app_dict is returned
+    instead.
+
+    :param app_dict: morPy global dictionary containing app configurations
+    :param shards: Number of shards. If None, "processes_store_shards" of config.py is used.
+    :param size: Memory of the whole store in bytes. If None, 1 MB per shard.
+
+    :return: ShardedDict or dictionary
+
+    :example:
+        app_dict["app"]["counts"] = sharded_dict(app_dict)
+    """
+
+    if app_dict["morpy"]["processes_max"] > 1:
+        shards = app_dict["morpy"]["conf"]["processes_store_shards"] if shards is None else shards
+        size = shards * 1024 * 1024 if size is None else size
+        return ShardedDict(shards=shards, size=size)
+    elif app_dict["morpy"]["threads_max"]:
+        from lib.threads import LockedDict
+        return LockedDict()
+    else:
+        return dict()
+
+
+def lock_key(store: ShardedDict | dict, key: Any):
+    r"""
+    Returns the lock to be held for a read-modify-write on a key of a store created by sharded_dict().
+    This is the lock of the shard holding the key or the lock of the whole dictionary otherwise.
+
+    :param store: Store created by sharded_dict()
+    :param key: Key of the store
+
+    :return: Lock context manager
+
+    :example:
+        with lock_key(store, "hits"):
+            store["hits"] = store.get("hits", 0) + 1
+    """
+
+    if isinstance(store, ShardedDict):
+        return store.lock_key(key)
+
+    from morPy import conditional_lock
+    return conditional_lock(store)
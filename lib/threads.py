@@ -0,0 +1,385 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Thread backend of morPy. Tasks are run by a pool of threads within the orchestrator process,
+            sharing a plain nested app_dict instead of dictionaries in shared memory.
+"""
+
+from morPy import log
+from lib.decorators import core_wrap, evaluate_trace
+from lib.mp import core_add, normalize_task, task_to_partial
+from lib.aio import run_blocking
+
+import inspect
+import threading
+import time
+from concurrent.futures import Future
+from heapq import heappush, heappop
+from typing import Any, Callable
+
+# Thread pool of the thread backend. None, if tasks are run in processes.
+_pool = None
+
+# Per thread: ID within the pool (thread_id) and number of tasks currently run by it (depth), including
+# tasks run while it waits for other tasks.
+_local = threading.local()
+
+
+class LockedDict(dict):
+    r"""
+    Plain dictionary carrying a reentrant thread lock. The nested app_dict of the thread backend is built
+    from these, so that code locking app_dict (i.e. 'with app_dict["morpy"].lock:') works the same way as
+    with UltraDict.
+    """
+
+    __slots__ = [
+        'lock',
+    ]
+
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.lock = threading.RLock()
+
+
+class MorPyThreadFuture(Future):
+    r"""
+    Future of a task run by the thread backend. While result() or exception() wait, the calling thread
+    runs queued tasks itself. That way, tasks awaiting other tasks can not leave the pool without threads
+    to run them.
+    """
+
+    __slots__ = [
+        'pool',
+        'task_id',
+    ]
+
+
+    def __init__(self, pool: 'MorPyThreadPool') -> None:
+        r"""
+        :param pool: Thread pool running the task
+        """
+
+        super().__init__()
+        self.pool = pool
+        self.task_id: int | None = None
+
+
+    def result(self, timeout: float | None=None) -> Any:
+        r"""
+        Returns the result of the task, running queued tasks while waiting.
+
+        :param timeout: Seconds to wait. If None, waits until the task is done.
+
+        :return: Return value of the task
+        """
+
+        self.pool.wait((self,), timeout=timeout)
+        return super().result(timeout=0)
+
+
+    def exception(self, timeout: float | None=None) -> BaseException | None:
+        r"""
+        Returns the exception raised by the task, running queued tasks while waiting.
+
+        :param timeout: Seconds to wait. If None, waits until the task is done.
+
+        :return: Exception raised by the task or None
+        """
+
+        self.pool.wait((self,), timeout=timeout)
+        return super().exception(timeout=0)
+
+
+    def cancel(self) -> bool:
+        r"""
+        Cancels the task, if it did not start yet. Threads waiting for the future are woken up.
+
+        :return: True, if the task was cancelled.
+        """
+
+        cancelled = super().cancel()
+        self.pool.notify()
+        return cancelled
+
+
+class MorPyThreadPool:
+    r"""
+    Pool of threads running morPy tasks by priority. Every thread has its own thread ID, which is handed
+    to the tasks in their trace. The app_dict is shared by reference, so tasks are not serialized at all.
+    On free-threaded CPython builds the threads run truly in parallel; otherwise the pool pays off for
+    I/O-bound tasks.
+    """
+
+    __slots__ = [
+        '_blocked',
+        '_cond',
+        '_heap',
+        '_running',
+        '_shutdown',
+        'threads',
+        'threads_max',
+    ]
+
+
+    @core_wrap
+    def __init__(self, trace: dict, app_dict: dict, threads_max: int=1) -> None:
+        r"""
+        Starts the threads of the pool.
+
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param threads_max: Number of threads running tasks
+        """
+
+        self._cond = threading.Condition()
+        self._heap: list = []       # (priority, task_id, future, task)
+        self._running: int = 0      # Tasks popped from the heap and not done yet
+        self._blocked: int = 0      # Tasks of threads waiting in join()
+        self._shutdown: bool = False
+        self.threads_max: int = threads_max
+
+        self.threads: list = [
+            threading.Thread(target=self._worker, args=(thread_id,), name=f'morPy_thread_{thread_id}',
+                             daemon=True)
+            for thread_id in range(1, threads_max + 1)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+        # Thread pool started.
+        log(trace, app_dict, "init",
+            lambda: f'{app_dict["loc"]["morpy"]["MorPyThreadPool_init_done"]}\n'
+                    f'{app_dict["loc"]["morpy"]["MorPyThreadPool_threads"]}: {threads_max}')
+
+
+    def submit(self, trace: dict, app_dict: dict, task: Callable | list | tuple=None,
+               priority: int=100) -> dict:
+        r"""
+        Queues a task to be run by the next free thread.
+
+        :param trace: operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param task: Callable, list or tuple packing the task, see lib.mp.heap_shelve()
+        :param priority: Integer representing task priority (lower is higher priority)
+
+        :return: dict
+            task_id: ID assigned to the task
+            future: MorPyThreadFuture of the task
+        """
+
+        task_id = core_add(app_dict, "tasks_created", 1)
+
+        future = MorPyThreadFuture(self)
+        future.task_id = task_id
+
+        with self._cond:
+            heappush(self._heap, (priority, task_id, future, normalize_task(task)))
+            self._cond.notify()
+
+        return {
+            "task_id" : task_id,
+            "future" : future,
+        }
+
+
+    def _pop(self, timeout: float | None=None) -> tuple | None:
+        r"""
+        Pops the most urgent task from the heap. Waits up to timeout for a task to be queued or any task
+        to be done. To be called while holding the condition.
+
+        :param timeout: Seconds to wait, if the heap is empty.
+
+        :return: Task popped or None
+        """
+
+        if not self._heap:
+            self._cond.wait(timeout)
+        if not self._heap:
+            return None
+
+        self._running += 1
+        return heappop(self._heap)
+
+
+    def _run(self, entry: tuple, thread_id: int) -> None:
+        r"""
+        Runs a task popped from the heap and completes its future.
+
+        :param entry: Task popped from the heap (priority, task_id, future, task)
+        :param thread_id: ID of the thread running the task
+        """
+
+        _priority, task_id, future, task = entry
+
+        try:
+            # Skip tasks cancelled in the meantime.
+            if future.set_running_or_notify_cancel():
+                _local.depth = getattr(_local, "depth", 0) + 1
+
+                # The trace is shared with the caller, so hand a copy with the IDs of this task.
+                if len(task) > 1 and evaluate_trace(task[1]):
+                    task = list(task)
+                    task[1] = {**task[1], "thread_id" : thread_id, "task_id" : task_id}
+
+                try:
+                    retval = task_to_partial(task)()
+
+                    # Async tasks are awaited by the thread, other threads go on meanwhile.
+                    if inspect.isawaitable(retval):
+                        retval = run_blocking(retval)
+
+                    future.set_result(retval)
+                except BaseException as e:
+                    future.set_exception(e)
+                finally:
+                    _local.depth -= 1
+
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+
+
+    def _worker(self, thread_id: int) -> None:
+        r"""
+        Loop of a pool thread, running tasks until the pool is shut down.
+
+        :param thread_id: ID of the thread
+        """
+
+        _local.thread_id = thread_id
+
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                entry = self._pop()
+
+            self._run(entry, thread_id)
+
+
+    def wait(self, futures: tuple | list | set, timeout: float | None=None) -> None:
+        r"""
+        Blocks until at least one of the futures is done or the timeout expired. Without a timeout, the
+        calling thread runs queued tasks in the meantime.
+
+        :param futures: Futures to wait for
+        :param timeout: Seconds to wait. If None, waits until a future is done.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        thread_id = getattr(_local, "thread_id", 0)
+
+        while not any(future.done() for future in futures):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return
+
+            with self._cond:
+                if any(future.done() for future in futures):
+                    return
+
+                # A task run meanwhile could exceed the timeout.
+                if deadline is None:
+                    entry = self._pop()
+                else:
+                    self._cond.wait(remaining)
+                    entry = None
+
+            if entry:
+                self._run(entry, thread_id)
+
+
+    def join(self) -> None:
+        r"""
+        Blocks until all tasks queued are done, running queued tasks in the meantime. Tasks of threads
+        waiting in join() themselves are not waited for, so nested joins do not lock up.
+        """
+
+        thread_id = getattr(_local, "thread_id", 0)
+        depth = getattr(_local, "depth", 0)
+
+        with self._cond:
+            self._blocked += depth
+
+        try:
+            while True:
+                with self._cond:
+                    while not self._heap and self._running > self._blocked:
+                        self._cond.wait()
+                    if not self._heap:
+                        return
+                    entry = self._pop()
+                    self._blocked -= depth
+
+                try:
+                    self._run(entry, thread_id)
+                finally:
+                    with self._cond:
+                        self._blocked += depth
+
+        finally:
+            with self._cond:
+                self._blocked -= depth
+
+
+    def notify(self) -> None:
+        r"""
+        Wakes up all threads waiting in the pool to re-check their futures.
+        """
+
+        with self._cond:
+            self._cond.notify_all()
+
+
+    def shutdown(self) -> None:
+        r"""
+        Lets the threads finish the tasks left and waits for them to end.
+        """
+
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+
+        for thread in self.threads:
+            thread.join()
+
+
+@core_wrap
+def thread_pool_init(trace: dict, app_dict: dict) -> None:
+    r"""
+    Starts the thread pool of the thread backend with app_dict["morpy"]["threads_max"] threads. Only to be
+    called by the orchestrator.
+
+    :param trace: operation credentials and tracing information
+    :param app_dict: morPy global dictionary containing app configurations
+    """
+
+    global _pool
+    _pool = MorPyThreadPool(trace, app_dict, threads_max=app_dict["morpy"]["threads_max"])
+
+
+def thread_pool() -> MorPyThreadPool | None:
+    r"""
+    Returns the thread pool of the thread backend.
+
+    :return: MorPyThreadPool or None, if tasks are run in processes.
+    """
+
+    return _pool
+
+
+def thread_pool_release() -> None:
+    r"""
+    Shuts the thread pool down once the app is done.
+    """
+
+    global _pool
+    if _pool:
+        _pool.shutdown()
+        _pool = None
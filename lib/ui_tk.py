@@ -10,8 +10,9 @@ Descr.:     Provides a set of Tkinter‐based user interface components for cons
 
 import lib.fct as morpy_fct
 import lib.common as common
-from morPy import log, conditional_lock
+from morPy import log
 from lib.decorators import morpy_wrap
+from lib.mp import core_store, interrupt_release
 
 import sys
 import threading, queue
@@ -338,8 +339,8 @@ class FileDirSelectTk:
         self.root.quit()
 
         # Release the global interrupts
-        with conditional_lock(app_dict["morpy"]):
-            app_dict["morpy"]["interrupt"] = False
+        core_store(app_dict, "interrupt", False)
+        interrupt_release()
 
 
     # Suppress linting for mandatory arguments.
@@ -622,8 +623,8 @@ class GridChoiceTk:
         self.root.quit()
 
         # Release the global interrupts
-        with conditional_lock(app_dict["morpy"]):
-            app_dict["morpy"]["interrupt"] = False
+        core_store(app_dict, "interrupt", False)
+        interrupt_release()
 
 
     # Suppress linting for mandatory arguments.
@@ -1585,8 +1586,8 @@ class ProgressTrackerTk:
             self.done = True
 
             # Release the global interrupts
-            with conditional_lock(app_dict["morpy"]):
-                app_dict["morpy"]["interrupt"] = False
+            core_store(app_dict, "interrupt", False)
+            interrupt_release()
 
         # Clear any pending UI update calls.
         while not self.ui_calls.empty():
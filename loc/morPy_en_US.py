@@ -59,6 +59,28 @@ def loc_morpy() -> dict:
         'ValueError' : 'A function got an argument of correct type but improper value.',
         'ZeroDivisionError' : 'The second operand of a division or module operation is zero.',
 
+        # #################
+        # Area: lib.affinity.py
+        # #################
+
+        # lib.affinity.py - affinity_init(~)
+        'affinity_init_done': 'CPUs of the child processes determined.',
+        'affinity_init_invalid': 'Invalid placement policy. Processes are not pinned.',
+        'affinity_init_unsupported': 'CPU affinity is not supported on this platform. Processes are not pinned.',
+        'affinity_init_policy': 'Policy',
+        'affinity_init_nodes': 'NUMA nodes',
+
+        # lib.affinity.py - affinity_apply(~)
+        'affinity_apply_done': 'Process pinned to CPUs.',
+        'affinity_apply_cpus': 'CPUs',
+
+        # #################
+        # Area: lib.aio.py
+        # #################
+
+        # lib.aio.py - _complete(~)
+        'aio_task_failed': 'An async task raised an exception.',
+
         # #################
         # Area: lib.bulk_ops.py
         # #################
@@ -68,6 +90,18 @@ def loc_morpy() -> dict:
         'find_replace_save_as_f_ex_skip': 'File already exists. Operation skipped.',
         'find_replace_save_as_tpl_err': 'Wrong type. Input must be a tuple of tuples.',
 
+        # #################
+        # Area: lib.cache.py
+        # #################
+
+        # lib.cache.py - _disk_connect(~)
+        'cache_disk_fail': 'The on-disk cache could not be accessed. Continuing without it.',
+        'cache_disk_path': 'Path',
+
+        # lib.cache.py - cache_clear(~)
+        'cache_clear_done': 'Cached results removed.',
+        'cache_clear_cnt': 'Results removed from memory',
+
         # #################
         # Area: lib.common.py
         # #################
@@ -206,6 +240,15 @@ def loc_morpy() -> dict:
         "wait_for_select_quit": "quit",
         "wait_for_select_selection_invalid": "Invalid selection. Repeat?",
 
+        # #################
+        # Area: lib.counters.py
+        # #################
+
+        # lib.counters.py - counter_register(~)
+        'counter_register_done': 'Counter registered',
+        'counter_register_full': 'No further counter can be registered. Increase counters_max in config.py.',
+        'counter_register_max': 'Maximum counters',
+
         # #################
         # Area: lib.csv.py
         # #################
@@ -234,6 +277,20 @@ def loc_morpy() -> dict:
         'csv_dict_to_excel_start': 'Writing data to MS Excel file.',
         'csv_dict_to_excel_prog_descr': 'Writing CSV to Excel',
 
+        # #################
+        # Area: lib.dag.py
+        # #################
+
+        # lib.dag.py - TaskGraph.add(~)
+        'TaskGraph_node_dup' : 'Node already exists in the task graph',
+        'TaskGraph_node_unknown' : 'Unknown upstream node. Upstream nodes have to be added first',
+        'TaskGraph_task_none' : 'Task can not be None. Node',
+
+        # lib.dag.py - TaskGraph.run(~)
+        'TaskGraph_run_start' : 'Running task graph',
+        'TaskGraph_nodes' : 'Nodes',
+        'TaskGraph_run_done' : 'Task graph done:',
+
         # #################
         # Area: lib.exit.py
         # #################
@@ -304,10 +361,27 @@ def loc_morpy() -> dict:
         'heap_pull_cnt': 'Counter',
         'heap_pull_void': 'Can not pull from an empty process queue. Skipped...',
 
+        # lib.mp.py - MorPyOrchestrator._init_pool(~)
+        'MorPyOrchestrator_init_pool': 'Worker pool enqueued for spawning.',
+        'MorPyOrchestrator_init_pool_workers': 'Workers',
+
         # lib.mp.py - MorPyOrchestrator._mp_loop(~)
         'MorPyOrchestrator_exit_request': 'Exit request detected. Termination in Progress.',
         'MorPyOrchestrator_exit_request_complete': 'App terminating after exit request. No logs left from child processes.',
 
+        # lib.mp.py - MorPyOrchestrator.run(~)
+        'MorPyOrchestrator_sched_metrics': 'Queue wait times of the priority classes.',
+
+        # lib.mp.py - MorPyAutoscaler.step(~)
+        'MorPyAutoscaler_step': 'Autoscaler adjusted the processes run at once.',
+        'MorPyAutoscaler_processes': 'Processes',
+        'MorPyAutoscaler_readings': 'Readings',
+
+        # lib.mp.py - mp_context_init(~)
+        'mp_context_init_done': 'Start method of child processes determined.',
+        'mp_context_init_invalid': 'Start method not available on this platform. Falling back to the default.',
+        'mp_context_init_method': 'Start method',
+
         # lib.mp.py - run(~)
         'app_run_init': 'App initializing.',
         'app_run_start': 'App starting.',
@@ -321,6 +395,11 @@ def loc_morpy() -> dict:
         'heap_shelve_none': 'Task can not be None. Skipping enqueue.',
         'heap_shelve_task_duplicate' : 'Task is already enqueued. Referencing in queue.',
 
+        # lib.mp.py - heap_shelve_batch(~)
+        'heap_shelve_batch_start': 'Pushing tasks to heap.',
+        'heap_shelve_batch_cnt': 'Tasks',
+        'heap_shelve_batch_none': 'No tasks given. Skipping enqueue.',
+
         # lib.mp.py - check_child_processes(~)
         'check_child_processes_term_err': 'A child process was terminated unexpectedly. Process references will be restored, but the task and data may be lost.',
         'check_child_processes_aff': 'Affected process is',
@@ -351,6 +430,80 @@ def loc_morpy() -> dict:
         # lib.mp.py - interrupt(~)
         'interrupt_set': 'Global interrupt has been set.',
 
+        # lib.mp.py - pool_worker(~)
+        'pool_worker_start': 'Process is waiting for tasks as a pool worker.',
+
+        # lib.mp.py - pool_warm_up(~)
+        'pool_warm_up': 'Pool worker warmed up.',
+
+        # lib.mp.py - pool_warm_imports(~)
+        'pool_warm_imports_fail': 'Warm import of a module failed.',
+        'pool_warm_imports_module': 'Module',
+
+        # lib.mp.py - pool_recycle_due(~)
+        'pool_worker_recycle': 'Pool worker recycled.',
+        'pool_worker_recycle_tasks': 'Tasks executed',
+        'pool_worker_recycle_rss': 'Memory (RSS) in MB',
+
+        # lib.mp.py - pool_scale_down_due(~)
+        'pool_scale_down': 'Pool worker retired, as the autoscaler scales down.',
+
+        # lib.mp.py - deque_push(~)
+        'deque_push_done': 'All processes busy. Task queued to a busy process.',
+        'deque_push_process': 'Process',
+
+        # lib.mp.py - deque_pop(~)
+        'deque_steal': 'Tasks stolen from the queue of a busy process.',
+        'deque_steal_cnt': 'Tasks',
+        'deque_steal_from': 'Process',
+
+        # lib.mp.py - run_chunk(~)
+        'run_chunk_task_failed': 'A task of a chunk failed. Continuing with the next one.',
+
+        # lib.mp.py - deque_release(~)
+        'deque_release': 'Tasks queued to a process were handed back to the orchestrator.',
+        'deque_release_cnt': 'Tasks',
+
+        # lib.mp.py - queue_throttle(~)
+        'queue_throttle_start': 'Process queue is full. Running queued tasks until it dropped below the high-water mark.',
+        'queue_throttle_full': 'Process queue is full. Timed out waiting for it to drop below the high-water mark.',
+        'queue_throttle_depth': 'Tasks queued',
+
+        # lib.mp.py - task_guard_lost(~)
+        'task_guard_lost_retry': 'A task was lost with its process. Retrying.',
+        'task_guard_lost_failed': 'A task was lost with its process and no retries are left.',
+        'task_guard_lost_task': 'Task ID',
+        'task_guard_lost_attempt': 'Retry',
+        'task_guard_lost_timeout': 'Timed out',
+        'task_guard_lost_timeout_err': 'Task timed out after',
+        'task_guard_lost_process_err': 'Task lost, as its process terminated unexpectedly. Process ID',
+
+        # lib.mp.py - tasks_watchdog(~)
+        'tasks_watchdog_timeout': 'A task timed out. Terminating its process.',
+        'tasks_watchdog_process': 'Process ID',
+
+        # lib.mp.py - locks_recover(~)
+        'locks_recover_released': 'Shared locks of a terminated process released.',
+        'locks_recover_pid': 'PID',
+        'locks_recover_count': 'Count',
+
+        # lib.mp.py - rings_recover(~)
+        'rings_recover_skipped': 'Ring buffer positions abandoned by a terminated process skipped.',
+        'rings_recover_count': 'Count',
+
+        # #################
+        # Area: lib.results.py
+        # #################
+
+        # lib.results.py - MorPyFuture.cancel(~)
+        'future_cancel': 'Task cancelled.',
+        'future_cancel_id': 'Task ID',
+        'future_cancel_from': 'Removed from',
+
+        # lib.results.py - pmap(~)
+        'pmap_done': 'Parallel map completed.',
+        'pmap_chunks': 'Chunks',
+
         # #################
         # Area: lib.msg.py
         # #################
@@ -477,6 +630,14 @@ def loc_morpy() -> dict:
         'sqlite3_row_update_where_tbl_nex': 'The table does not exist.',
         'sqlite3_row_update_where_mismatch': 'The number of columns does not match the number of values handed to the function.',
 
+        # #################
+        # Area: lib.threads.py
+        # #################
+
+        # lib.threads.py - MorPyThreadPool.__init__(~)
+        'MorPyThreadPool_init_done': 'Thread pool started.',
+        'MorPyThreadPool_threads': 'Threads',
+
         # #################
         # Area: lib.ui_tk.py
         # #################
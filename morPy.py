@@ -571,6 +571,71 @@ class ProgressTrackerTk:
         return self._impl.end_stage(trace, app_dict)
 
 
+class TaskGraph:
+    r"""
+    Directed acyclic graph of tasks, where every task declares the tasks it depends on. Running the
+    graph queues every task as soon as its dependencies are done, so independent branches run in
+    parallel instead of waiting for each other at a barrier like join_or_task(). Tasks on the critical
+    path are prioritized automatically.
+    """
+
+    def __init__(self, trace: dict, app_dict: dict, name: str=None) -> None:
+        r"""
+        Creates an empty task graph.
+
+        :param trace: Operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param name: Name or description of the instance
+
+        :example:
+            graph = morPy.TaskGraph(trace, app_dict, name="nightly_batch")
+        """
+        import lib.dag
+        self._impl = lib.dag.TaskGraph(trace, app_dict, name=name)
+
+    def add(self, trace: dict, app_dict: dict, node: str=None, task: Callable | list | tuple=None,
+            depends_on: list | tuple=None, cost: float=1.0, upstream_kwarg: str=None) -> None:
+        r"""
+        Adds a task to the graph. The nodes it depends on have to be added first.
+
+        :param trace: Operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param node: Unique name of the node
+        :param task: Callable, list or tuple packing the task, see process_q()
+        :param depends_on: Names of the nodes, that have to be done before the task starts.
+        :param cost: Estimated relative duration of the task. Used to determine the critical path.
+        :param upstream_kwarg: If not None, the results of the nodes depended on are handed to the task
+            as a dictionary {node : result} with this keyword.
+
+        :example:
+            graph = morPy.TaskGraph(trace, app_dict)
+            graph.add(trace, app_dict, node="load_a", task=[load, trace, app_dict, {"src": "a.csv"}])
+            graph.add(trace, app_dict, node="load_b", task=[load, trace, app_dict, {"src": "b.csv"}])
+            graph.add(trace, app_dict, node="merge", task=[merge, trace, app_dict],
+                      depends_on=["load_a", "load_b"], cost=3, upstream_kwarg="inputs")
+        """
+        return self._impl.add(trace, app_dict, node=node, task=task, depends_on=depends_on, cost=cost,
+                              upstream_kwarg=upstream_kwarg)
+
+    def run(self, trace: dict, app_dict: dict, priority: int=100) -> dict:
+        r"""
+        Runs the graph and blocks until all tasks are done. If a task raises an exception, the tasks
+        not started yet are cancelled and the exception is raised.
+
+        :param trace: Operation credentials and tracing information
+        :param app_dict: morPy global dictionary containing app configurations
+        :param priority: Priority of the tasks on the critical path (lower is higher priority)
+
+        :return: dict
+            {node : result} of all nodes
+
+        :example:
+            results = graph.run(trace, app_dict)
+            merged = results["merge"]
+        """
+        return self._impl.run(trace, app_dict, priority=priority)
+
+
 class XlWorkbook:
     r"""
     Instantiates an Excel workbook to edit, read from and write to it.
@@ -871,6 +936,28 @@ def app_dict_to_string(app_dict):
     return lib.fct.app_dict_to_string(app_dict)
 
 
+def cache_clear(trace: dict, app_dict: dict, func: Callable=None, disk: bool=True) -> dict:
+    r"""
+    Removes results cached by functions decorated with @morpy_cached (see lib.cache) from memory and,
+    if enabled, from disk.
+
+    :param trace: Operation credentials and tracing information.
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param func: Decorated function, whose results are removed. If None, all results are removed.
+    :param disk: If True, results are removed from disk as well (see "cache_db_enable" in config.py).
+
+    :return: dict
+        cleared: Results removed from memory
+
+    :example:
+        from morPy import cache_clear
+        cache_clear(trace, app_dict, func=parse)
+    """
+
+    import lib.cache
+    return lib.cache.cache_clear(trace, app_dict, func=func, disk=disk)
+
+
 def conditional_lock(obj):
     r"""
     Returns a no‑op lock context manager if the provided object is a plain dictionary,
@@ -893,6 +980,84 @@ def conditional_lock(obj):
     return getattr(obj, "lock", _NoOpLock())
 
 
+def counter_add(app_dict: dict, name: str, delta: int=1) -> int:
+    r"""
+    Adds to a counter registered with counter_register(). The counter is shared by all processes and
+    updated atomically, no lock is taken and no addition of another process gets lost.
+
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param name: Name of the counter
+    :param delta: Value to be added, may be negative.
+
+    :return: Value of the counter after the addition
+
+    :example:
+        from morPy import counter_add
+        counter_add(app_dict, "rows_parsed", len(rows))
+    """
+
+    import lib.counters
+    return lib.counters.counter_add(app_dict, name, delta=delta)
+
+
+def counter_register(trace: dict, app_dict: dict, name: str=None, value: int=0) -> dict:
+    r"""
+    Registers a counter shared by all processes, which is updated without a lock (see counter_add()).
+    Registering a counter twice keeps its value. Up to "counters_max" counters may be registered (see
+    config.py).
+
+    :param trace: Operation credentials and tracing information.
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param name: Name of the counter
+    :param value: Initial value of the counter
+
+    :return: dict
+        registered: False, if the counter was registered already.
+
+    :example:
+        from morPy import counter_register
+        counter_register(trace, app_dict, name="rows_parsed")
+    """
+
+    import lib.counters
+    return lib.counters.counter_register(trace, app_dict, name=name, value=value)
+
+
+def counter_value(app_dict: dict, name: str) -> int:
+    r"""
+    Reads a counter registered with counter_register().
+
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param name: Name of the counter
+
+    :return: Value of the counter
+
+    :example:
+        from morPy import counter_value
+        rows_parsed = counter_value(app_dict, "rows_parsed")
+    """
+
+    import lib.counters
+    return lib.counters.counter_value(app_dict, name)
+
+
+def counters(app_dict: dict) -> dict:
+    r"""
+    Reads all counters registered with counter_register().
+
+    :param app_dict: The morPy global dictionary containing app configurations.
+
+    :return: Dictionary {name : value}
+
+    :example:
+        from morPy import counters
+        print(counters(app_dict))
+    """
+
+    import lib.counters
+    return lib.counters.counters_snapshot(app_dict)
+
+
 def csv_read(trace: dict, app_dict: dict, src_file_path: str=None, delimiter: str=None,
              print_csv_dict: bool=False, log_progress: bool=False, progress_ticks: float=None, gui=None) -> dict:
     r"""
@@ -1242,6 +1407,39 @@ def fso_walk(trace: dict, app_dict: dict, path: str, depth: int=1) -> dict:
     return lib.common.fso_walk(trace, app_dict, path, depth=depth)
 
 
+def imap_unordered(trace: dict, app_dict: dict, func: Callable=None, iterable=None, chunksize: int=None,
+                   priority: int=100):
+    r"""
+    Applies a function to every item of an iterable in parallel child processes and yields the results
+    as soon as they arrive, in no particular order. The iterable is split into chunks, which are
+    dispatched through the orchestrator. Only a limited number of chunks is in flight at a time, so
+    large or endless iterables are consumed as results come in. If a call of func raises an
+    exception, it is re-raised by the generator. Runs sequentially in single process mode and in the
+    thread pool with the thread backend.
+
+    :param trace: Operation credentials and tracing information.
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param func: Function with the signature func(trace, app_dict, item). Must be defined at module level.
+    :param iterable: Items to be processed.
+    :param chunksize: Number of items per task. If None, determined by the length of the iterable.
+    :param priority: Integer representing task priority (lower is higher priority)
+
+    :return: Generator of results
+
+    :example:
+        import morPy
+        # Defined at module level
+        def square(trace, app_dict, n):
+            return n * n
+        for result in morPy.imap_unordered(trace, app_dict, square, range(0, 10_000), chunksize=100):
+            print(result)
+    """
+
+    import lib.results
+    return lib.results.imap_unordered(trace, app_dict, func=func, iterable=iterable, chunksize=chunksize,
+                                      priority=priority)
+
+
 def interrupt(trace: dict, app_dict: dict):
     r"""
     Sets a global interrupt flag so that running processes or threads will halt at
@@ -1379,14 +1577,64 @@ def perf_info():
     return lib.fct.perf_info()
 
 
+def pmap(trace: dict, app_dict: dict, func: Callable=None, iterable=None, chunksize: int=None,
+         priority: int=100) -> list:
+    r"""
+    Applies a function to every item of an iterable in parallel child processes and returns the results
+    in the order of the items. The iterable is split into chunks, which are dispatched through the
+    orchestrator, while the results are streamed back to the calling process. If a call of func raises
+    an exception, it is re-raised in the calling process. Runs sequentially in single process mode and
+    in the thread pool with the thread backend.
+
+    :param trace: Operation credentials and tracing information.
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param func: Function with the signature func(trace, app_dict, item). Must be defined at module level.
+    :param iterable: Items to be processed.
+    :param chunksize: Number of items per task. If None, determined by the length of the iterable.
+    :param priority: Integer representing task priority (lower is higher priority)
+
+    :return: List of results
+
+    :example:
+        import morPy
+        # Defined at module level
+        def square(trace, app_dict, n):
+            return n * n
+        squares = morPy.pmap(trace, app_dict, square, range(0, 10_000))
+    """
+
+    import lib.results
+    return lib.results.pmap(trace, app_dict, func=func, iterable=iterable, chunksize=chunksize,
+                            priority=priority)
+
+
 def process_q(trace: dict, app_dict: dict, task: Callable | list | tuple=None, priority: int=100,
-              autocorrect: bool=True):
+              autocorrect: bool=True, timeout: float=None, max_retries: int=None, backoff: float=None):
     r"""
     Enqueues a task into the morPy multiprocessing queue at the specified priority (with lower numbers
     indicating higher priority). The task may be provided as a callable, list, or tuple containing the
     function, positional arguments, and an optional dictionary of keyword arguments. An autocorrect flag
     ensures that the priority does not drop below zero unless explicitly allowed.
 
+    Returns a future (see concurrent.futures.Future) of the task. result() and exception() block until
+    the task is done, add_done_callback() registers a callable run as soon as it is done and cancel()
+    removes the task from the queue, if it did not start yet. This way, a task can await the tasks it
+    depends on instead of joining all processes. In single process mode, the task is run right away and
+    the future returned is done already. With the thread backend (see processes_backend in config.py),
+    the task is run by the thread pool instead.
+
+    If "processes_queue_max" is set in config.py, a child process is held back while the process queue
+    is full and runs queued tasks meanwhile (backpressure). If it stays full for longer than
+    "processes_queue_timeout", queue.Full is raised.
+
+    A child process running the task longer than timeout seconds is terminated by the orchestrator. If the
+    task timed out or its process terminated unexpectedly, it is queued again up to max_retries times,
+    waiting backoff seconds before the first retry and twice as long before every further one. Once the
+    retries are used up, the future raises TimeoutError or ChildProcessError. Exceptions raised by the task
+    itself are not retried. Arguments not given fall back to "processes_task_timeout",
+    "processes_task_retries" and "processes_task_backoff" in config.py. Timeouts and retries do not apply
+    in single process mode and with the thread backend.
+
     :param trace: Operation credentials and tracing information.
     :param app_dict: The morPy global dictionary containing app configurations.
     :param task: Callable, list or tuple packing the task. Native is 'list' type. Formats:
@@ -1397,6 +1645,12 @@ def process_q(trace: dict, app_dict: dict, task: Callable | list | tuple=None, p
     :param autocorrect: If False, priority can be smaller than zero. Priority
         smaller zero is reserved for the morPy Core. However, it is a devs choice
         to make.
+    :param timeout: Time in seconds a child process may run the task. Async tasks are only timed until
+        they are scheduled.
+    :param max_retries: Retries of the task, if it timed out or its process terminated unexpectedly.
+    :param backoff: Delay in seconds before the first retry.
+
+    :return: lib.results.MorPyFuture or None, if no task was given.
 
     :example:
         from morPy import process_q
@@ -1406,13 +1660,94 @@ def process_q(trace: dict, app_dict: dict, task: Callable | list | tuple=None, p
             print(message)
             return message
         a_number = partial(gimme_5, trace, app_dict, message) # List of a callable, *args and **kwargs
-        enqueued = process_q(trace, app_dict, task=a_number, priority=20) #
-        if not enqueued:
+        future = process_q(trace, app_dict, task=a_number, priority=20) #
+        if future.result(timeout=10) != message:
             print("No, thank you!")
     """
 
     import lib.mp
-    return lib.mp.heap_shelve(trace, app_dict, priority=priority, task=task, autocorrect=autocorrect)
+    import lib.results
+    lib.mp.queue_throttle(trace, app_dict)
+    return lib.results.submit(trace, app_dict, task=task, priority=priority, autocorrect=autocorrect,
+                              timeout=timeout, max_retries=max_retries, backoff=backoff)
+
+
+async def process_q_async(trace: dict, app_dict: dict, task: Callable | list | tuple=None, priority: int=100,
+                          autocorrect: bool=True, timeout: float=None, max_retries: int=None,
+                          backoff: float=None):
+    r"""
+    Enqueues a task like process_q(), but is awaited within an event loop. Resolves to the return value
+    of the task once it is done or raises the exception raised by the task. The event loop keeps running
+    meanwhile. In single process mode, the task is run right away and blocks the event loop, unless the
+    function of the task is defined with 'async def'.
+
+    Tasks may be defined with 'async def' in general. A process runs those on its own event loop and
+    takes on further tasks, while they await (see processes_async_max in config.py).
+
+    :param trace: Operation credentials and tracing information.
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param task: Callable, list or tuple packing the task, see process_q().
+    :param priority: Integer representing task priority (lower is higher priority)
+    :param autocorrect: If False, priority can be smaller than zero. Priority
+        smaller zero is reserved for the morPy Core.
+    :param timeout: Time in seconds a child process may run the task, see process_q().
+    :param max_retries: Retries of the task, see process_q().
+    :param backoff: Delay in seconds before the first retry, see process_q().
+
+    :return: Return value of the task or None, if no task was given.
+
+    :example:
+        import asyncio
+        from morPy import process_q_async
+        async def fetch(trace, app_dict, url):
+            ...
+        async def fetch_all(trace, app_dict, urls):
+            tasks = [process_q_async(trace, app_dict, [fetch, trace, app_dict, {"url": url}]) for url in urls]
+            return await asyncio.gather(*tasks)
+    """
+
+    import asyncio
+    future = process_q(trace, app_dict, task=task, priority=priority, autocorrect=autocorrect,
+                       timeout=timeout, max_retries=max_retries, backoff=backoff)
+    return await asyncio.wrap_future(future) if future else None
+
+
+def process_q_many(trace: dict, app_dict: dict, tasks: list | tuple=None, priority: int=100,
+                   autocorrect: bool=True, timeout: float=None, max_retries: int=None, backoff: float=None):
+    r"""
+    Enqueues a batch of tasks into the morPy multiprocessing queue, all at the same priority. Compared
+    to calling process_q() in a loop, the whole batch is checked and enqueued at once, which greatly
+    reduces the overhead of fanning out many tasks. Backpressure applies to the whole batch, see
+    process_q(). Timeouts and retries apply to every task of the batch, see process_q(). As there are no
+    futures, a task failing for good is only logged.
+
+    :param trace: Operation credentials and tracing information.
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param tasks: List or tuple of tasks. Every task is a callable, list or tuple. Native is 'list' type. Formats:
+        callable: partial(func, *args, **kwargs)
+        list: [func, *args, {"kwarg1": val1, "kwarg2": val2, ...}]
+        tuple: (func, *args, {"kwarg1": val1, "kwarg2": val2, ...})
+    :param priority: Integer representing task priority (lower is higher priority)
+    :param autocorrect: If False, priority can be smaller than zero. Priority
+        smaller zero is reserved for the morPy Core. However, it is a devs choice
+        to make.
+    :param timeout: Time in seconds a child process may run a task.
+    :param max_retries: Retries of a task, if it timed out or its process terminated unexpectedly.
+    :param backoff: Delay in seconds before the first retry.
+
+    :example:
+        from morPy import process_q_many
+        def gimme_n(trace, app_dict, n):
+            print(n)
+        tasks = [[gimme_n, trace, app_dict, {"n": n}] for n in range(0, 100)]
+        process_q_many(trace, app_dict, tasks=tasks, priority=20)
+    """
+
+    import lib.mp
+    lib.mp.queue_throttle(trace, app_dict, tasks=len(tasks) if tasks else 0)
+    return lib.mp.heap_shelve_batch(trace, app_dict, priority=priority, tasks=tasks, autocorrect=autocorrect,
+                                    guard=lib.mp.task_guard(app_dict, timeout=timeout, max_retries=max_retries,
+                                                            backoff=backoff))
 
 
 def qrcode_generator_wifi(trace: dict, app_dict: dict, ssid: str = None, password: str = None,
@@ -1446,6 +1781,27 @@ def qrcode_generator_wifi(trace: dict, app_dict: dict, ssid: str = None, passwor
     )
 
 
+def queue_depth(trace: dict, app_dict: dict) -> dict:
+    r"""
+    Returns the number of tasks waiting in the morPy multiprocessing queue for a process to take them on,
+    along with its high-water mark. Useful to watch the backpressure applied by process_q().
+
+    :param trace: Operation credentials and tracing information.
+    :param app_dict: The morPy global dictionary containing app configurations.
+
+    :return: dict
+        queue_depth: Number of tasks waiting. Always 0 in single process mode and with the thread backend.
+        queue_max: High-water mark of the process queue (see "processes_queue_max" in config.py)
+
+    :example:
+        from morPy import queue_depth
+        depth = queue_depth(trace, app_dict)["queue_depth"]
+    """
+
+    import lib.mp
+    return lib.mp.queue_depth(trace, app_dict)
+
+
 def regex_findall(trace: dict, app_dict: dict, search_obj: object, pattern: str) -> dict:
     r"""
     Searches the input (converted to a string) for all occurrences of a given regular expression
@@ -1581,6 +1937,31 @@ def runtime(in_ref_time):
     return lib.fct.runtime(in_ref_time)
 
 
+def shared_store(app_dict: dict, shards: int=None, size: int=None):
+    r"""
+    Creates a key/value store shared by all processes, which spreads its keys over shards with a lock of
+    their own (see lib.store.ShardedDict). Processes working on different keys rarely wait for each
+    other, unlike with a nested dictionary of app_dict, which has a single lock. Put it into app_dict to
+    share it. In single process mode and with the thread backend, a plain dictionary is returned.
+
+    :param app_dict: The morPy global dictionary containing app configurations.
+    :param shards: Number of shards. If None, "processes_store_shards" of config.py is used.
+    :param size: Memory of the whole store in bytes. If None, 1 MB per shard.
+
+    :return: ShardedDict or dictionary
+
+    :example:
+        from morPy import shared_store, store_lock
+        app_dict["word_counts"] = shared_store(app_dict)
+        counts = app_dict["word_counts"]
+        with store_lock(counts, word):
+            counts[word] = counts.get(word, 0) + 1
+    """
+
+    import lib.store
+    return lib.store.sharded_dict(app_dict, shards=shards, size=size)
+
+
 def sysinfo():
     r"""
     Returns a dictionary of system information including: operating system name, release and
@@ -1604,6 +1985,26 @@ def sysinfo():
     return lib.fct.sysinfo()
 
 
+def store_lock(store, key):
+    r"""
+    Returns the lock to be held for a read-modify-write on a key of a store created by shared_store().
+    Only the shard holding the key is locked.
+
+    :param store: Store created by shared_store()
+    :param key: Key of the store
+
+    :return: Lock context manager
+
+    :example:
+        from morPy import store_lock
+        with store_lock(counts, word):
+            counts[word] = counts.get(word, 0) + 1
+    """
+
+    import lib.store
+    return lib.store.lock_key(store, key)
+
+
 def textfile_write(trace: dict, app_dict: dict, filepath: str, content: str) -> None:
     r"""
     Appends text content to a specified file. If the file does not exist, it is created.
@@ -0,0 +1,53 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Fixtures of the morPy unit tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+
+@pytest.fixture
+def trace() -> dict:
+    r"""
+    Trace of the orchestrator, see lib.init.init_cred().
+    """
+
+    from lib.init import init_cred
+    return init_cred()
+
+
+@pytest.fixture
+def app_dict() -> dict:
+    r"""
+    Minimal app_dict of a single process with the thread backend. Logs are not generated.
+    """
+
+    from lib.threads import LockedDict
+
+    return {
+        "morpy" : {
+            "conf" : {
+                "metrics_enable" : False,
+                "metrics_perf_mode" : False,
+                "msg_verbose" : False,
+                "processes_queue_max" : None,
+            },
+            "logs_generate" : {},
+            "orchestrator" : LockedDict(),
+            "proc_master" : 0,
+            "processes_max" : 1,
+            "threads_max" : 2,
+            "tasks_guarded" : LockedDict(),
+        },
+        "loc" : {
+            "morpy" : {},
+        },
+    }
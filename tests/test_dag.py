@@ -0,0 +1,30 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Unit tests of lib.dag.
+"""
+
+from lib.dag import TaskGraph
+
+
+def _chain(trace, app_dict, length: int) -> TaskGraph:
+    graph = TaskGraph(trace, app_dict)
+    for n in range(0, length):
+        graph.add(trace, app_dict, node=n, task=[print, n], depends_on=[n - 1] if n else None)
+    return graph
+
+
+def test_priorities_critical_path(trace, app_dict):
+    priorities = _chain(trace, app_dict, 3)._priorities(100, max_priority=149)
+    assert priorities == {0 : 100, 1 : 101, 2 : 102}
+
+
+def test_priorities_kept_within_class(trace, app_dict):
+    # More chain cost levels than priorities left in the class "normal" (see config.py).
+    priorities = _chain(trace, app_dict, 80)._priorities(100, max_priority=149)
+
+    assert priorities[0] == 100
+    assert max(priorities.values()) == 149
+    assert [priorities[n] for n in range(0, 80)] == sorted(priorities.values())
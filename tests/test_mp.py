@@ -0,0 +1,107 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Unit tests of lib.mp.
+"""
+
+from lib.mp import deque_blocked, deque_push, locks_recover, queue_depth, shared_dict, task_guard_lost
+from lib.store import ShardedDict
+
+
+def test_queue_depth_thread_backend(trace, app_dict):
+    # There is neither a heap shelf nor a published depth with the thread backend.
+    assert queue_depth(trace, app_dict) == {"queue_depth" : 0, "queue_max" : None}
+
+
+def test_task_guard_lost_retries_used_up(trace, app_dict):
+    tasks_cancelled = ShardedDict(shards=4, size=4 * 64 * 1024)
+    app_dict["morpy"]["tasks_cancelled"] = tasks_cancelled
+
+    try:
+        task_id, process_id = 7, 3
+        tasks_cancelled[task_id] = False
+        app_dict["morpy"]["tasks_guarded"][task_id] = {
+            "process_id" : process_id,
+            "attempt" : 0,
+            "retries" : 1,
+            "backoff" : 0.0,
+            "deadline" : None,
+            "due" : None,
+            "timeout" : 0.5,
+            "reply" : None,
+        }
+
+        # First loss of the process: The task is due for a retry.
+        assert task_guard_lost(trace, app_dict, process_id=process_id, timed_out=True)["guarded"]
+        entry = app_dict["morpy"]["tasks_guarded"][task_id]
+        assert entry["attempt"] == 1
+        assert entry["process_id"] is None
+
+        # The retry is lost as well: No retries left, the task fails.
+        entry["process_id"] = process_id
+        app_dict["morpy"]["tasks_guarded"][task_id] = entry
+        assert task_guard_lost(trace, app_dict, process_id=process_id, timed_out=True)["guarded"]
+        assert task_id not in app_dict["morpy"]["tasks_guarded"]
+        assert task_id not in tasks_cancelled
+
+    finally:
+        tasks_cancelled.unlink()
+
+
+def test_deque_push_skips_blocked_processes(trace, app_dict):
+    from lib.threads import LockedDict
+
+    app_dict["morpy"]["processes_max"] = 3
+    app_dict["morpy"]["conf"]["processes_deque_max"] = 4
+    app_dict["morpy"]["proc_busy"] = LockedDict({0: None, 1: None, 2: None})
+    app_dict["morpy"]["proc_blocked"] = LockedDict()
+    app_dict["morpy"]["proc_deques"] = LockedDict()
+
+    trace_waiting = dict(trace, process_id=1)
+
+    # Process 1 waits for results, e.g. within MorPyFuture.result().
+    with deque_blocked(trace_waiting, app_dict):
+        assert 1 in app_dict["morpy"]["proc_blocked"]
+
+        for task_id in range(0, 3):
+            assert deque_push(trace, app_dict, task=["task"], priority=100, task_id=task_id)["queued"]
+        assert list(app_dict["morpy"]["proc_deques"].keys()) == [2]
+
+        # Nested waits keep the process blocked.
+        with deque_blocked(trace_waiting, app_dict):
+            pass
+        assert 1 in app_dict["morpy"]["proc_blocked"]
+
+    # Once the wait ended, tasks are queued to the process again.
+    assert 1 not in app_dict["morpy"]["proc_blocked"]
+    assert deque_push(trace, app_dict, task=["task"], priority=100, task_id=3)["queued"]
+    assert len(app_dict["morpy"]["proc_deques"][1]) == 1
+
+
+def test_locks_recover_releases_dead_owner(trace, app_dict):
+    from lib.init import obscure_shared_name
+
+    store = ShardedDict(shards=2, size=2 * 64 * 1024)
+    udict = shared_dict(name=obscure_shared_name(), create=True, size=64 * 1024)
+    app_dict["morpy"]["store"] = store
+    app_dict["morpy"]["nested"] = {"udict" : udict}
+
+    try:
+        # Locks left behind by a process terminated while holding them.
+        pid_dead = 2**31 - 1
+        for lock in (store.shards[1].lock, udict.lock):
+            lock.lock_atomic.store(b"\x01")
+            lock.pid_remote_atomic.store(pid_dead.to_bytes(4, "little"))
+
+        # Locks of other processes are left alone.
+        assert locks_recover(trace, app_dict, pid=pid_dead - 1) == 0
+        assert locks_recover(trace, app_dict, pid=pid_dead) == 2
+
+        with udict.lock(timeout=0.1), store.shards[1].lock(timeout=0.1):
+            pass
+    finally:
+        store.unlink()
+        udict.unlink()
+
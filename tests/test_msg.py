@@ -0,0 +1,32 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Unit tests of lib.msg.
+"""
+
+import io
+import sys
+from collections import deque
+
+from lib.msg import MorPyLogWriter
+
+
+def test_log_writer_failed_record_not_dropped(trace, monkeypatch):
+    stderr = io.StringIO()
+    monkeypatch.setattr(sys, "__stderr__", stderr)
+
+    writer = MorPyLogWriter.__new__(MorPyLogWriter)
+    writer._retry = deque()
+    log_dict = {"log_msg_complete" : "WARNING - log message"}
+
+    # Written again, to the text log only.
+    writer._failed(1, (trace, log_dict, True, True, False), OSError("database is locked"))
+    assert "OSError: database is locked" in stderr.getvalue()
+    assert writer._retry.popleft() == (2, (trace, log_dict, True, False, False))
+
+    # Attempts used up. The message is printed instead.
+    writer._failed(MorPyLogWriter._ATTEMPTS, (trace, log_dict, True, False, False), OSError("disk full"))
+    assert not writer._retry
+    assert "WARNING - log message" in stderr.getvalue()
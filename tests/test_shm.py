@@ -0,0 +1,66 @@
+r"""
+morPy Framework by supermorph.tech
+https://github.com/supermorphDotTech
+
+Author:     Bastian Neuwirth
+Descr.:     Unit tests of lib.shm.
+"""
+
+import os
+from multiprocessing import shared_memory
+
+from lib import shm as morpy_shm
+from lib.shm import (SHARED_BUFFER_PREFIX, SharedRingBuffer, shared_buffer_attach, shared_buffer_create,
+                     shared_buffers_reap)
+
+
+def test_ring_skip_abandoned():
+    ring = SharedRingBuffer(create=True, slots=4, slot_size=64)
+
+    try:
+        # A producer claimed the first position and was terminated before publishing it.
+        ring._head.store(1)
+        assert ring.put(b"published")
+        assert ring.get_batch() == []
+
+        assert ring.skip_abandoned(timeout=0.01) == 1
+        assert ring.get_batch() == [b"published"]
+        assert ring.pending() == 0
+    finally:
+        ring.close()
+        ring.unlink()
+
+
+def test_shared_buffer_roundtrip():
+    data = bytes(range(256)) * 16
+    placeholder = shared_buffer_create(data, 1024)
+
+    view = shared_buffer_attach(placeholder)
+    assert view.readonly
+    assert bytes(view) == data
+
+
+def test_shared_buffers_reap_closes_acknowledged(monkeypatch):
+    # Create the buffer the way Windows does, keeping the handle in the creating process.
+    monkeypatch.setattr(os, "name", "nt")
+    placeholder = shared_buffer_create(b"x" * 4096, 1024)
+    monkeypatch.undo()
+
+    name, size = placeholder[0][len(SHARED_BUFFER_PREFIX):], placeholder[1]
+    assert name in morpy_shm._buffers_created
+
+    try:
+        # Not mapped by the receiver yet.
+        assert shared_buffers_reap() == 0
+        assert name in morpy_shm._buffers_created
+
+        # Acknowledge the mapping like shared_buffer_attach() does on Windows.
+        receiver = shared_memory.SharedMemory(name=name)
+        receiver.buf[size] = 1
+        receiver.close()
+
+        assert shared_buffers_reap() == 1
+        assert name not in morpy_shm._buffers_created
+    finally:
+        morpy_shm._buffers_created.pop(name, None)
+        shared_memory.SharedMemory(name=name).unlink()